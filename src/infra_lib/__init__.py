@@ -7,9 +7,10 @@ from .infra import (
 	BaseInfraProvider,
 )
 from .infra import InfraEnvironment, EnvironmentContext, AWSEnvironmentContext
+from .infra import DeferredEnvValue, LazyEnvValue, SecretRef
 from .utils import run_command, DockerCompose, ComposeSettings
 from .cli import infra_operation
-from .runtime import get_env, get_env_vars, load_env
+from .runtime import get_env, get_env_vars, get_secret, get_secrets_batch, load_env
 
 __all__ = [
 	"AWSInfraProvider",
@@ -22,10 +23,15 @@ __all__ = [
 	"InfraEnvironment",
 	"EnvironmentContext",
 	"AWSEnvironmentContext",
+	"DeferredEnvValue",
+	"LazyEnvValue",
+	"SecretRef",
 	"run_command",
 	"infra_operation",
 	"DockerCompose",
 	"get_env",
 	"get_env_vars",
 	"load_env",
+	"get_secret",
+	"get_secrets_batch",
 ]
@@ -0,0 +1,37 @@
+import asyncio
+from concurrent.futures import Future
+import threading
+from typing import Any, Coroutine, Optional
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def shared_event_loop() -> asyncio.AbstractEventLoop:
+	"""
+	Event loop shared by every async op of the process, running on a daemon thread.
+
+	Keeping one loop alive for the whole run lets async ops share clients, semaphores and
+	other loop-bound state, and lets independent async ops run concurrently.
+	"""
+	global _loop
+
+	if _loop is None:
+		with _loop_lock:
+			if _loop is None:
+				loop = asyncio.new_event_loop()
+				threading.Thread(
+					target=loop.run_forever, name="infra-lib-event-loop", daemon=True
+				).start()
+				_loop = loop
+	return _loop
+
+
+def submit_coroutine(coro: Coroutine) -> Future:
+	"""Schedule `coro` on the shared loop and return a `concurrent.futures.Future`."""
+	return asyncio.run_coroutine_threadsafe(coro, shared_event_loop())
+
+
+def run_coroutine(coro: Coroutine) -> Any:
+	"""Run `coro` on the shared loop and block until it completes."""
+	return submit_coroutine(coro).result()
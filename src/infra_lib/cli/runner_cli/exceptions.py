@@ -1,3 +1,3 @@
-from ...exceptions import CycleError, ConfigError, InfraError, OpError
+from ...exceptions import CycleError, ConfigError, InfraError, OpError, OpTimeoutError
 
-__all__ = ["InfraError", "ConfigError", "OpError", "CycleError"]
+__all__ = ["InfraError", "ConfigError", "OpError", "OpTimeoutError", "CycleError"]
@@ -1,6 +1,6 @@
 from collections.abc import Callable
 import inspect
-from typing import Dict
+from typing import Dict, Optional, Tuple, Type
 
 
 from .infra_op import InfraOp, OpHandler
@@ -15,10 +15,28 @@ def infra_operation(
 	name: str | Callable[[str], str] = None,
 	target_envs: list[InfraEnvironment] = None,
 	depends_on: list[str] = None,
+	retries: int = 0,
+	backoff: float = 1.0,
+	timeout: Optional[float] = None,
+	retry_on: Optional[Tuple[Type[BaseException], ...]] = None,
+	resources: list[str] = None,
 ):
 	"""
 	Decorator to create and register a InfraOperation object.
+
+	`retries` extra attempts are made when the handler raises one of `retry_on` (any
+	`Exception` by default), waiting `backoff` seconds doubled per attempt, with jitter.
+	`timeout` bounds each attempt in seconds.
+
+	`resources` tags what the op consumes (e.g. `["lambda-api", "cpu-build"]`); the
+	parallel scheduler limits how many ops holding each tag run at once.
 	"""
+	if retries < 0:
+		raise ValueError("`retries` must be >= 0")
+	if backoff < 0:
+		raise ValueError("`backoff` must be >= 0")
+	if timeout is not None and timeout <= 0:
+		raise ValueError("`timeout` must be > 0")
 
 	def decorator(func: OpHandler):
 		op_name = _handle_name(name, func)
@@ -28,6 +46,11 @@ def infra_operation(
 			handler=func,
 			target_envs=target_envs.copy() if target_envs else [],
 			depends_on=depends_on.copy() if depends_on else [],
+			retries=retries,
+			backoff=backoff,
+			timeout=timeout,
+			retry_on=tuple(retry_on) if retry_on else (Exception,),
+			resources=resources.copy() if resources else [],
 		)
 
 		if op_name in OP_REGISTRY:
@@ -1,6 +1,6 @@
 from collections.abc import Callable
 from dataclasses import dataclass, field
-from typing import Any, List, TypeVar, Union
+from typing import Any, List, Optional, Tuple, Type, TypeVar, Union
 
 from infra_lib.infra.enums import InfraEnvironment
 
@@ -22,3 +22,8 @@ class InfraOp:
 	handler: OpHandler
 	target_envs: List[InfraEnvironment] = field(default_factory=lambda: None)
 	depends_on: List[str] = field(default_factory=list)
+	retries: int = 0
+	backoff: float = 1.0
+	timeout: Optional[float] = None
+	retry_on: Tuple[Type[BaseException], ...] = (Exception,)
+	resources: List[str] = field(default_factory=list)
@@ -0,0 +1,226 @@
+import asyncio
+from concurrent.futures import Future, wait
+import inspect
+import itertools
+import logging
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Type
+
+from .async_runtime import run_coroutine
+from .exceptions import OpError, OpTimeoutError
+from .infra_op_decorator import InfraOp
+from .run_summary import OpRunRecord
+from ...infra.env_context import EnvironmentContext
+from ...utils.polling import backoff_delays
+
+logger = logging.getLogger(__name__)
+
+MAX_RETRY_DELAY_SECS = 60.0
+
+
+def is_op_targeted(op: InfraOp, context: EnvironmentContext) -> bool:
+	return "all" in op.target_envs or context.env() in op.target_envs
+
+
+def is_async_op(op: InfraOp) -> bool:
+	return inspect.iscoroutinefunction(op.handler)
+
+
+def prepare_handler_args(
+	op: InfraOp, context: EnvironmentContext, instance_cache: Dict[Type, Any]
+) -> List[Any]:
+	"""Arguments for `op.handler`: the ops class instance for methods, then the context."""
+	args_to_pass = []
+	handler = op.handler
+
+	try:
+		is_lambda_or_nested_fn = "<locals>" in handler.__qualname__
+		is_method = (
+			inspect.isfunction(handler)
+			and not is_lambda_or_nested_fn
+			and "." in handler.__qualname__
+		)
+
+		if is_method:
+			module_name = handler.__module__
+			if module_name not in sys.modules:
+				raise OpError(f"Module {module_name} for op {op.name} not found.")
+
+			module = sys.modules[module_name]
+			qualname_parts = handler.__qualname__.split(".")
+
+			if len(qualname_parts) < 2:
+				raise OpError(f"Invalid qualname for op '{op.name}': {handler.__qualname__}")
+
+			class_name = qualname_parts[-2]
+
+			if not hasattr(module, class_name):
+				raise OpError(f"Class {class_name} for op {op.name} not found in {module_name}.")
+
+			ops_class = getattr(module, class_name)
+
+			if not isinstance(ops_class, type):
+				raise OpError(f"{ops_class} is not a class.")
+
+			instance = get_or_create_instance(ops_class, instance_cache)
+			args_to_pass.append(instance)
+
+		args_to_pass.append(context)
+
+	except Exception as e:
+		if not isinstance(e, OpError):
+			raise OpError(f"Error preparing handler for op '{op.name}': {e}") from e
+		raise e
+
+	return args_to_pass
+
+
+def run_op(
+	op: InfraOp,
+	args: List[Any],
+	record: Optional[OpRunRecord] = None,
+	sleep: Callable[[float], None] = time.sleep,
+):
+	"""
+	Run `op.handler` with the op's retry, backoff and timeout policy.
+
+	Async handlers run on the shared event loop. A timed out sync attempt cannot be
+	stopped, so it is never retried; timed out async attempts are cancelled and retried
+	like any other failure in `retry_on`.
+	"""
+	if is_async_op(op):
+		return run_coroutine(run_op_async(op, args, record))
+
+	record = record if record is not None else OpRunRecord(name=op.name)
+	delays = _retry_delays(op)
+	start = time.monotonic()
+	try:
+		for attempt in itertools.count(1):
+			record.attempts = attempt
+			try:
+				return _call_with_timeout(op, args)
+			except OpTimeoutError:
+				raise
+			except op.retry_on as e:
+				if attempt > op.retries:
+					raise
+				delay = next(delays)
+				_log_retry(op, attempt, e, delay)
+				sleep(delay)
+	finally:
+		record.duration_secs = time.monotonic() - start
+
+
+async def run_op_async(op: InfraOp, args: List[Any], record: Optional[OpRunRecord] = None):
+	"""Async counterpart of `run_op` for coroutine handlers, run on the shared loop."""
+	record = record if record is not None else OpRunRecord(name=op.name)
+	delays = _retry_delays(op)
+	start = time.monotonic()
+	try:
+		for attempt in itertools.count(1):
+			record.attempts = attempt
+			try:
+				return await _await_with_timeout(op, args)
+			except OpTimeoutError as e:
+				error = e
+			except op.retry_on as e:
+				error = e
+
+			if attempt > op.retries or not isinstance(error, op.retry_on):
+				raise error
+			delay = next(delays)
+			_log_retry(op, attempt, error, delay)
+			await asyncio.sleep(delay)
+	finally:
+		record.duration_secs = time.monotonic() - start
+
+
+async def _await_with_timeout(op: InfraOp, args: List[Any]) -> Any:
+	"""Await one attempt, raising OpTimeoutError only when `op.timeout` itself expired.
+
+	`asyncio.wait_for` is avoided because its timeout is indistinguishable from a
+	TimeoutError raised by the handler.
+	"""
+	if op.timeout is None:
+		return await op.handler(*args)
+
+	task = asyncio.ensure_future(op.handler(*args))
+	try:
+		done, _ = await asyncio.wait({task}, timeout=op.timeout)
+	except asyncio.CancelledError:
+		task.cancel()
+		raise
+
+	if not done:
+		task.cancel()
+		try:
+			await task
+		except asyncio.CancelledError:
+			pass
+		except Exception:
+			logger.debug(f"Action '{op.name}' failed while being cancelled", exc_info=True)
+		raise OpTimeoutError(f"Action '{op.name}' timed out after {op.timeout}s")
+	return task.result()
+
+
+def _call_with_timeout(op: InfraOp, args: List[Any]) -> Any:
+	if op.timeout is None:
+		return _resolve_awaitable(op.handler(*args))
+
+	future: Future = Future()
+
+	def target():
+		try:
+			future.set_result(_resolve_awaitable(op.handler(*args)))
+		except BaseException as e:
+			future.set_exception(e)
+
+	# A daemon thread, so an attempt that never returns cannot keep the process alive.
+	threading.Thread(target=target, name=f"infra-lib-op-{op.name}", daemon=True).start()
+	# Wait separately from `result()`, so a TimeoutError raised by the handler is not
+	# mistaken for the attempt timing out.
+	done, _ = wait([future], timeout=op.timeout)
+	if not done:
+		raise OpTimeoutError(f"Action '{op.name}' timed out after {op.timeout}s")
+	return future.result()
+
+
+def _resolve_awaitable(result: Any) -> Any:
+	if inspect.isawaitable(result):
+		return run_coroutine(_await(result))
+	return result
+
+
+async def _await(awaitable):
+	return await awaitable
+
+
+def _retry_delays(op: InfraOp) -> Iterator[float]:
+	return backoff_delays(
+		initial_delay=op.backoff, max_delay=max(op.backoff, MAX_RETRY_DELAY_SECS), jitter=0.5
+	)
+
+
+def _log_retry(op: InfraOp, attempt: int, error: BaseException, delay: float):
+	logger.warning(
+		f"Action '{op.name}' failed (attempt {attempt}/{op.retries + 1}): {error}. "
+		f"Retrying in {delay:.1f}s"
+	)
+
+
+def get_or_create_instance(cls: Type, instance_cache: Dict[Type, Any]) -> Any:
+	"""
+	Gets a singleton instance of an operations class, creating it if needed.
+	Assumes the class has a no-argument __init__ method.
+	"""
+	if cls not in instance_cache:
+		try:
+			instance_cache[cls] = cls()
+		except Exception as e:
+			raise OpError(
+				f"Failed to auto-instantiate ops class {cls.__name__}. "
+				"Classes containing infra operations must have a parameterless __init__."
+			) from e
+	return instance_cache[cls]
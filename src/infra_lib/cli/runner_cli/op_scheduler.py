@@ -0,0 +1,192 @@
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Type
+
+from .exceptions import CycleError, OpError
+from .infra_op_decorator import InfraOp
+from .async_runtime import submit_coroutine
+from .op_execution import (
+	is_async_op,
+	is_op_targeted,
+	prepare_handler_args,
+	run_op,
+	run_op_async,
+)
+from .run_summary import OpStatus, RunSummary
+from ...infra.env_context import EnvironmentContext
+
+logger = logging.getLogger(__name__)
+
+
+class OpScheduler:
+	"""
+	Runs ops and their dependencies concurrently, each op as soon as its dependencies
+	completed.
+
+	Sync handlers run on a thread pool of `max_workers` threads. Async handlers run on
+	the shared event loop without holding a worker, so independent async ops always
+	overlap, even with `max_workers=1`. After the first failure no new ops are started;
+	running ops finish and the failure is raised as `OpError`. Each op runs with its
+	retry, backoff and timeout policy and its outcome is recorded in `summary`.
+
+	`resource_limits` caps how many running ops may hold each resource tag. An op starts
+	only when every one of its tags has capacity, and takes all of them at once, so ops
+	sharing tags never deadlock. Tags without a limit are unbounded.
+	"""
+
+	def __init__(
+		self,
+		registry: Dict[str, InfraOp],
+		context: EnvironmentContext,
+		instance_cache: Optional[Dict[Type, Any]] = None,
+		max_workers: int = 4,
+		summary: Optional[RunSummary] = None,
+		resource_limits: Optional[Dict[str, int]] = None,
+	):
+		self.registry = registry
+		self.context = context
+		self.instance_cache = instance_cache if instance_cache is not None else {}
+		self.max_workers = max_workers
+		self.summary = summary if summary is not None else RunSummary()
+		self.resource_limits = dict(resource_limits or {})
+		self._resources_in_use: Counter = Counter()
+
+	def has_async_ops(self, op_names: Iterable[str]) -> bool:
+		"""Whether `op_names` or any of their dependencies has an async handler."""
+		return any(is_async_op(self.registry[name]) for name in self._resolve(op_names))
+
+	def run(self, op_names: Iterable[str]):
+		order = self._resolve(op_names)
+		remaining_deps = {name: set(self.registry[name].depends_on) for name in order}
+		completed: Set[str] = set()
+		scheduled: Set[str] = set()
+		running: Dict[Future, str] = {}
+		failures: List[Tuple[str, BaseException]] = []
+
+		with ThreadPoolExecutor(
+			max_workers=self.max_workers, thread_name_prefix="infra-lib-op"
+		) as executor:
+			while True:
+				if not failures:
+					self._start_ready_ops(
+						order, remaining_deps, completed, scheduled, running, executor, failures
+					)
+				if not running:
+					break
+
+				done, _ = wait(running, return_when=FIRST_COMPLETED)
+				for future in done:
+					name = running.pop(future)
+					self._release_resources(self.registry[name])
+					record = self.summary.record(name)
+					try:
+						future.result()
+					except Exception as e:
+						logger.error(f"Action '{name}' failed: {e}", exc_info=True)
+						record.status = OpStatus.failed
+						record.error = str(e)
+						failures.append((name, e))
+						continue
+					record.status = OpStatus.completed
+					logger.info(f"Completed action '{name}'")
+					self._mark_completed(name, remaining_deps, completed)
+
+		if failures:
+			name, error = failures[0]
+			if isinstance(error, OpError):
+				raise error
+			raise OpError(f"Failed during execution of '{name}'") from error
+
+	def _start_ready_ops(
+		self,
+		order: List[str],
+		remaining_deps: Dict[str, Set[str]],
+		completed: Set[str],
+		scheduled: Set[str],
+		running: Dict[Future, str],
+		executor: ThreadPoolExecutor,
+		failures: List[Tuple[str, BaseException]],
+	):
+		sync_running = sum(not is_async_op(self.registry[name]) for name in running.values())
+		progressed = True
+		while progressed:
+			progressed = False
+			for name in order:
+				if name in scheduled or remaining_deps[name]:
+					continue
+
+				op = self.registry[name]
+				targeted = is_op_targeted(op, self.context)
+				# Only sync ops take a worker thread.
+				if targeted and not is_async_op(op) and sync_running >= self.max_workers:
+					continue
+				if targeted and not self._acquire_resources(op):
+					continue
+
+				scheduled.add(name)
+				record = self.summary.record(name)
+				if not targeted:
+					logger.info(
+						f"Skipping action '{op.name}' for environment '{self.context.env()}'"
+					)
+					record.status = OpStatus.skipped
+					self._mark_completed(name, remaining_deps, completed)
+					progressed = True
+					continue
+
+				try:
+					args = prepare_handler_args(op, self.context, self.instance_cache)
+				except OpError as e:
+					self._release_resources(op)
+					record.status = OpStatus.failed
+					record.error = str(e)
+					failures.append((name, e))
+					return
+
+				logger.info(f"Running action '{op.name}'")
+				if is_async_op(op):
+					running[submit_coroutine(run_op_async(op, args, record))] = name
+				else:
+					running[executor.submit(run_op, op, args, record)] = name
+					sync_running += 1
+
+	def _acquire_resources(self, op: InfraOp) -> bool:
+		for tag in op.resources:
+			limit = self.resource_limits.get(tag)
+			if limit is not None and self._resources_in_use[tag] >= limit:
+				return False
+		self._resources_in_use.update(op.resources)
+		return True
+
+	def _release_resources(self, op: InfraOp):
+		self._resources_in_use.subtract(op.resources)
+
+	@staticmethod
+	def _mark_completed(name: str, remaining_deps: Dict[str, Set[str]], completed: Set[str]):
+		completed.add(name)
+		for deps in remaining_deps.values():
+			deps.discard(name)
+
+	def _resolve(self, op_names: Iterable[str]) -> List[str]:
+		"""Dependencies-first order of `op_names` and everything they depend on."""
+		order: List[str] = []
+		visiting: Set[str] = set()
+
+		def visit(name: str):
+			if name in order:
+				return
+			if name in visiting:
+				raise CycleError(f"Circular dependency detected: {name}")
+			if name not in self.registry:
+				raise OpError(f"Action '{name}' not found in registry.")
+
+			visiting.add(name)
+			for dep_name in self.registry[name].depends_on:
+				visit(dep_name)
+			visiting.remove(name)
+			order.append(name)
+
+		for name in op_names:
+			visit(name)
+		return order
@@ -1,16 +1,20 @@
+from concurrent.futures import ProcessPoolExecutor
 import logging
+import multiprocessing
 import sys
 import os
-import inspect
 from pathlib import Path
-from typing import Set, List, Dict, Any, Type
+from typing import Optional, Set, List, Dict, Any, Type
 import click
-from dotenv import dotenv_values
 
 from .infra_op_decorator import OP_REGISTRY, InfraOp
 from .context_loader import load_env_context_from_arg, discover_ops
+from .op_execution import is_op_targeted, prepare_handler_args, run_op
+from .op_scheduler import OpScheduler
+from .run_summary import EnvRunResult, OpStatus, RunSummary, log_env_results
 from ...infra import InfraEnvironment
 from ...infra.env_context import EnvironmentContext
+from ...infra.env_context.dotenv_cache import read_dotenv
 from .exceptions import ConfigError, OpError, CycleError
 
 logger = logging.getLogger(__name__)
@@ -20,9 +24,16 @@ logger = logging.getLogger(__name__)
 @click.option(
 	"-e",
 	"--environment",
+	"environments",
 	type=click.Choice([env.value for env in InfraEnvironment]),
-	required=True,
-	help="Environment to run against.",
+	multiple=True,
+	help="Environment to run against. Can be specified multiple times to run each "
+	"environment in parallel in its own process.",
+)
+@click.option(
+	"--all-envs",
+	is_flag=True,
+	help="Run against every environment configured in the project.",
 )
 @click.option(
 	"-p",
@@ -44,14 +55,43 @@ logger = logging.getLogger(__name__)
 	type=click.Path(exists=True, file_okay=True, dir_okay=False, path_type=Path),
 	help="Dotenv file with values that override the selected environment .env.",
 )
+@click.option(
+	"-j",
+	"--jobs",
+	type=click.IntRange(min=1),
+	default=1,
+	show_default=True,
+	help=(
+		"Maximum number of independent sync operations to run in parallel. "
+		"Independent async operations always overlap on the shared event loop."
+	),
+)
+@click.option(
+	"--resource-limit",
+	"resource_limits",
+	multiple=True,
+	callback=lambda _ctx, _param, value: _parse_resource_limits(value),
+	metavar="TAG=N",
+	help="Run at most N parallel operations declaring resource TAG. Can be specified multiple times.",
+)
 def run_command(
-	environment: str,
+	environments: tuple[str],
+	all_envs: bool,
 	project_root: Path,
 	operations: tuple[str],
 	env_file: Path | None,
+	jobs: int,
+	resource_limits: Dict[str, int],
 ):
-	"""Run infrastructure operations for a specified environment."""
-	env = InfraEnvironment(environment)
+	"""Run infrastructure operations for one or more environments."""
+	if all_envs:
+		envs = _configured_environments(project_root)
+		if not envs:
+			raise click.UsageError(f"No environments configured in '{project_root}'")
+	elif environments:
+		envs = list(dict.fromkeys(InfraEnvironment(env) for env in environments))
+	else:
+		raise click.UsageError("Missing option '-e' / '--environment' (or '--all-envs').")
 
 	# Allows imports from `infra.`
 	if project_root.parent not in sys.path:
@@ -65,23 +105,83 @@ def run_command(
 			logger.warning("No operations found")
 			return
 
+		if len(envs) > 1:
+			if not operations:
+				for env in envs:
+					click.echo(f"Available operations for '{env}':")
+					for op_name, op in registry.items():
+						if env in op.target_envs:
+							click.echo(f"  - {op_name}")
+				return
+
+			logger.info(f"Running {', '.join(operations)} for {', '.join(map(str, envs))}")
+			results = _run_environments_in_processes(
+				envs, project_root, list(operations), extra_vars, jobs, resource_limits
+			)
+			log_env_results(results)
+			if not all(result.succeeded for result in results):
+				sys.exit(1)
+			return
+
+		env = envs[0]
 		logger.info(f"Loading configuration for '{env}'")
 		env_context = load_env_context_from_arg(env, project_root, extra_vars=extra_vars)
 		logger.info(f"Loaded context for environment: {env_context.env()}")
 
-		ops_to_run: List[str]
-		instance_cache: Dict[Type, Any] = {}
-
 		if not operations:
-			ops_to_run = [op_name for op_name, op in registry.items() if env in op.target_envs]
 			click.echo("Available operations:")
-			for op_name in ops_to_run:
-				click.echo(f"  - {op_name}")
+			for op_name, op in registry.items():
+				if env in op.target_envs:
+					click.echo(f"  - {op_name}")
 			return
-		else:
-			logger.info(f"Running specified operations: {', '.join(operations)}")
-			ops_to_run = list(operations)
 
+		logger.info(f"Running specified operations: {', '.join(operations)}")
+		summary = RunSummary()
+		try:
+			_run_operations(registry, env_context, list(operations), jobs, resource_limits, summary)
+		finally:
+			summary.log()
+
+		logger.info(f"Run completed successfully for environment '{env}'")
+
+	except (ConfigError, OpError, CycleError) as e:
+		logger.error(f"Run failed: {e}")
+		sys.exit(1)
+	except Exception as e:
+		logger.error(f"Unexpected error during run: {e}", exc_info=True)
+		sys.exit(1)
+
+
+def _configured_environments(project_root: Path) -> List[InfraEnvironment]:
+	return [
+		env
+		for env in InfraEnvironment
+		if (project_root / "environments" / env.value / f"{env.value}.py").exists()
+	]
+
+
+def _run_operations(
+	registry: Dict[str, InfraOp],
+	env_context: EnvironmentContext,
+	ops_to_run: List[str],
+	jobs: int,
+	resource_limits: Dict[str, int],
+	summary: RunSummary,
+):
+	instance_cache: Dict[Type, Any] = {}
+	scheduler = OpScheduler(
+		registry=registry,
+		context=env_context,
+		instance_cache=instance_cache,
+		max_workers=jobs,
+		summary=summary,
+		resource_limits=resource_limits,
+	)
+	# Async ops do not take a worker thread, so they go through the scheduler even
+	# with one job and overlap on the shared event loop.
+	if jobs > 1 or scheduler.has_async_ops(ops_to_run):
+		scheduler.run(ops_to_run)
+	else:
 		completed_actions = set()
 		for op_name in ops_to_run:
 			_execute_op_with_deps(
@@ -91,22 +191,101 @@ def run_command(
 				visited=set(),
 				registry=registry,
 				instance_cache=instance_cache,
+				summary=summary,
 			)
 
-		logger.info(f"Run completed successfully for environment '{environment}'")
 
+def _run_environments_in_processes(
+	envs: List[InfraEnvironment],
+	project_root: Path,
+	ops_to_run: List[str],
+	extra_vars: Optional[Dict[str, str]],
+	jobs: int,
+	resource_limits: Dict[str, int],
+) -> List[EnvRunResult]:
+	"""Run the op DAG for each environment in its own spawned process.
+
+	`EnvironmentContext.load` mutates `os.environ`, so environments cannot share a
+	process. Spawned workers start from a clean interpreter and re-import the project.
+	"""
+	log_level = logging.getLogger().getEffectiveLevel()
+	with ProcessPoolExecutor(
+		max_workers=len(envs), mp_context=multiprocessing.get_context("spawn")
+	) as executor:
+		futures = [
+			executor.submit(
+				_run_environment,
+				env,
+				project_root,
+				ops_to_run,
+				extra_vars,
+				jobs,
+				resource_limits,
+				log_level,
+			)
+			for env in envs
+		]
+
+		results = []
+		for env, future in zip(envs, futures):
+			try:
+				results.append(future.result())
+			except Exception as e:
+				results.append(EnvRunResult(environment=env, error=f"Worker process failed: {e}"))
+		return results
+
+
+def _run_environment(
+	env: InfraEnvironment,
+	project_root: Path,
+	ops_to_run: List[str],
+	extra_vars: Optional[Dict[str, str]],
+	jobs: int,
+	resource_limits: Dict[str, int],
+	log_level: int = logging.INFO,
+) -> EnvRunResult:
+	"""Worker process entry point running every requested op for one environment."""
+	root_logger = logging.getLogger()
+	root_logger.handlers.clear()
+	handler = logging.StreamHandler(sys.stdout)
+	handler.setFormatter(logging.Formatter(f"%(levelname)s: [{env}] %(message)s"))
+	root_logger.addHandler(handler)
+	root_logger.setLevel(log_level)
+
+	if str(project_root.parent) not in sys.path:
+		sys.path.insert(0, str(project_root.parent))
+
+	summary = RunSummary()
+	try:
+		registry = discover_ops(project_root / "operations")
+		env_context = load_env_context_from_arg(env, project_root, extra_vars=extra_vars)
+		_run_operations(registry, env_context, ops_to_run, jobs, resource_limits, summary)
 	except (ConfigError, OpError, CycleError) as e:
 		logger.error(f"Run failed: {e}")
-		sys.exit(1)
+		return EnvRunResult(environment=env, error=str(e), report=summary.report_lines())
 	except Exception as e:
 		logger.error(f"Unexpected error during run: {e}", exc_info=True)
-		sys.exit(1)
+		return EnvRunResult(
+			environment=env, error=f"Unexpected error: {e}", report=summary.report_lines()
+		)
+
+	return EnvRunResult(environment=env, report=summary.report_lines())
+
+
+def _parse_resource_limits(values: tuple[str]) -> Dict[str, int]:
+	limits = {}
+	for value in values:
+		tag, sep, limit = value.partition("=")
+		if not sep or not tag or not limit.isdigit() or int(limit) < 1:
+			raise click.BadParameter(f"'{value}' is not TAG=N with N >= 1")
+		limits[tag] = int(limit)
+	return limits
 
 
 def _load_env_file_overrides(env_file: Path) -> Dict[str, str]:
 	return {
 		key: value
-		for key, value in dotenv_values(env_file).items()
+		for key, value in read_dotenv(env_file).items()
 		if value is not None and key != "TARGET_ENV"
 	}
 
@@ -118,6 +297,7 @@ def _execute_op_with_deps(
 	visited: Set[str],
 	registry: Dict[str, InfraOp] | None = None,
 	instance_cache: Dict[Type, Any] | None = None,
+	summary: RunSummary | None = None,
 ):
 	"""
 	Recursively executes an action and its dependencies (DAG runner).
@@ -144,58 +324,25 @@ def _execute_op_with_deps(
 			visited,
 			registry=registry,
 			instance_cache=instance_cache,
+			summary=summary,
 		)
 
-	args_to_pass = []
-	handler = op.handler
-
-	try:
-		is_lambda_or_nested_fn = "<locals>" in handler.__qualname__
-		is_method = (
-			inspect.isfunction(handler)
-			and not is_lambda_or_nested_fn
-			and "." in handler.__qualname__
-		)
-
-		if is_method:
-			module_name = handler.__module__
-			if module_name not in sys.modules:
-				raise OpError(f"Module {module_name} for op {op_name} not found.")
-
-			module = sys.modules[module_name]
-			qualname_parts = handler.__qualname__.split(".")
-
-			if len(qualname_parts) < 2:
-				raise OpError(f"Invalid qualname for op '{op_name}': {handler.__qualname__}")
-
-			class_name = qualname_parts[-2]
-
-			if not hasattr(module, class_name):
-				raise OpError(f"Class {class_name} for op {op_name} not found in {module_name}.")
-
-			ops_class = getattr(module, class_name)
-
-			if not isinstance(ops_class, type):
-				raise OpError(f"{ops_class} is not a class.")
-
-			instance = _get_or_create_instance(ops_class, instance_cache)
-			args_to_pass.append(instance)
+	args_to_pass = prepare_handler_args(op, context, instance_cache)
 
-		args_to_pass.append(context)
+	record = (summary if summary is not None else RunSummary()).record(op_name)
 
-	except Exception as e:
-		if not isinstance(e, OpError):
-			raise OpError(f"Error preparing handler for op '{op_name}': {e}") from e
-		raise e
-
-	if "all" not in op.target_envs and context.env() not in op.target_envs:
+	if not is_op_targeted(op, context):
 		logger.info(f"Skipping action '{op.name}' for environment '{context.env()}'")
+		record.status = OpStatus.skipped
 	else:
 		logger.info(f"Running action '{op.name}'")
 		try:
-			op.handler(*args_to_pass)
+			run_op(op, args_to_pass, record)
+			record.status = OpStatus.completed
 			logger.info(f"Completed action '{op.name}'")
 		except Exception as e:
+			record.status = OpStatus.failed
+			record.error = str(e)
 			logger.error(f"Action '{op.name}' failed: {e}", exc_info=True)
 			raise OpError(f"Failed during execution of '{op.name}'") from e
 
@@ -203,21 +350,5 @@ def _execute_op_with_deps(
 	visited.remove(op_name)
 
 
-def _get_or_create_instance(cls: Type, instance_cache: Dict[Type, Any]) -> Any:
-	"""
-	Gets a singleton instance of an operations class, creating it if needed.
-	Assumes the class has a no-argument __init__ method.
-	"""
-	if cls not in instance_cache:
-		try:
-			instance_cache[cls] = cls()
-		except Exception as e:
-			raise OpError(
-				f"Failed to auto-instantiate ops class {cls.__name__}. "
-				"Classes containing infra operations must have a parameterless __init__."
-			) from e
-	return instance_cache[cls]
-
-
 if __name__ == "__main__":
 	run_command()
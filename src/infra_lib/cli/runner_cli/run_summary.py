@@ -0,0 +1,102 @@
+from dataclasses import dataclass, field
+import logging
+import threading
+from typing import Dict, List, Optional
+
+from ...infra.aws_infra.rate_limiting import AwsCallTelemetry, aws_call_telemetry
+from ...infra.enums import InfraEnvironment, StrEnum
+
+logger = logging.getLogger(__name__)
+
+
+class OpStatus(StrEnum):
+	completed = "completed"
+	skipped = "skipped"
+	failed = "failed"
+
+
+@dataclass
+class OpRunRecord:
+	name: str
+	status: Optional[OpStatus] = None
+	attempts: int = 0
+	duration_secs: float = 0.0
+	error: Optional[str] = None
+
+
+class RunSummary:
+	"""Per-op outcome of a run, filled in by the runners from any thread.
+
+	AWS throttling and retry telemetry recorded while the summary exists is logged
+	along with the op outcomes.
+	"""
+
+	def __init__(self, telemetry: Optional[AwsCallTelemetry] = None):
+		self._records: Dict[str, OpRunRecord] = {}
+		self._lock = threading.Lock()
+		self._telemetry = telemetry if telemetry is not None else aws_call_telemetry
+		self._telemetry_baseline = self._telemetry.snapshot()
+
+	def record(self, op_name: str) -> OpRunRecord:
+		with self._lock:
+			if op_name not in self._records:
+				self._records[op_name] = OpRunRecord(name=op_name)
+			return self._records[op_name]
+
+	@property
+	def records(self) -> List[OpRunRecord]:
+		with self._lock:
+			return list(self._records.values())
+
+	def report_lines(self) -> List[str]:
+		"""One line per op, followed by AWS throttling activity recorded during the run."""
+		lines = []
+		for record in self.records:
+			line = f"{record.name}: {record.status or 'not run'}"
+			if record.attempts:
+				line += f" in {record.duration_secs:.1f}s"
+			if record.attempts > 1:
+				line += f" after {record.attempts} attempts"
+			if record.error:
+				line += f" ({record.error})"
+			lines.append(line)
+
+		for service, stats in sorted(self._telemetry.since(self._telemetry_baseline).items()):
+			lines.append(
+				f"aws {service}: {stats.throttled} throttled, {stats.retries} retries "
+				f"({stats.retry_sleep_secs:.1f}s backoff), {stats.rate_limited_secs:.1f}s rate limited"
+			)
+		return lines
+
+	def log(self):
+		if not self.records:
+			return
+
+		logger.info("Run summary:")
+		for line in self.report_lines():
+			logger.info(f"  {line}")
+
+
+@dataclass
+class EnvRunResult:
+	"""Outcome of running the op DAG for one environment in a worker process."""
+
+	environment: InfraEnvironment
+	error: Optional[str] = None
+	report: List[str] = field(default_factory=list)
+
+	@property
+	def succeeded(self) -> bool:
+		return self.error is None
+
+
+def log_env_results(results: List[EnvRunResult]):
+	"""Log one combined report for a multi-environment run."""
+	logger.info("Run summary:")
+	for result in results:
+		if result.succeeded:
+			logger.info(f"  [{result.environment}] succeeded")
+		else:
+			logger.error(f"  [{result.environment}] failed: {result.error}")
+		for line in result.report:
+			logger.info(f"    {line}")
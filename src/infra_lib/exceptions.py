@@ -12,3 +12,7 @@ class OpError(InfraError):
 
 class CycleError(InfraError):
 	pass
+
+
+class OpTimeoutError(OpError, TimeoutError):
+	pass
@@ -7,7 +7,13 @@ from .aws_infra import (
 )
 from .base_infra import BaseInfraProvider
 from .enums import InfraEnvironment
-from .env_context import EnvironmentContext, AWSEnvironmentContext
+from .env_context import (
+	EnvironmentContext,
+	AWSEnvironmentContext,
+	DeferredEnvValue,
+	LazyEnvValue,
+	SecretRef,
+)
 
 __all__ = [
 	"AWSInfraProvider",
@@ -20,4 +26,7 @@ __all__ = [
 	"InfraEnvironment",
 	"EnvironmentContext",
 	"AWSEnvironmentContext",
+	"DeferredEnvValue",
+	"LazyEnvValue",
+	"SecretRef",
 ]
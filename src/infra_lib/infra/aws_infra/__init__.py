@@ -14,6 +14,8 @@ from .aws_infra import (
 from .queues_util import AWSQueueConfig
 from .lambda_util import AWSLambdaParameters, BaseLambdaZipBuilder, AWSLambdaArchitecture
 from .aws_services_enum import AwsService
+from .async_boto import AsyncBotoClientFactory, gather_limited
+from .rate_limiting import AwsCallTelemetry, RateLimit, aws_call_telemetry
 
 __all__ = [
 	"AWSInfraProvider",
@@ -32,4 +34,9 @@ __all__ = [
 	"STSUtil",
 	"SecretsManagerUtil",
 	"AwsService",
+	"AsyncBotoClientFactory",
+	"gather_limited",
+	"AwsCallTelemetry",
+	"RateLimit",
+	"aws_call_telemetry",
 ]
@@ -1,6 +1,11 @@
+from dataclasses import dataclass
+import hashlib
 import logging
+import os
 from pathlib import Path
-from typing import Dict
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
 import json
 from mypy_boto3_apigateway import APIGatewayClient
 
@@ -11,6 +16,91 @@ from .creds import CredentialsProvider
 
 logger = logging.getLogger(__name__)
 
+CUSTOM_ID_TAG = "_custom_id_"
+# Stage variable names only allow alphanumerics and underscores.
+DEFINITION_HASH_STAGE_VARIABLE = "infraDefinitionSha256"
+
+_HTTP_METHODS = {"get", "put", "post", "delete", "options", "head", "patch"}
+_ANY_METHOD = "x-amazon-apigateway-any-method"
+_LAMBDA_ARN_IN_URI = re.compile(r"/functions/(arn:[^/]+:lambda:[^/]+)/invocations")
+
+
+@dataclass(frozen=True)
+class APIGatewayRoute:
+	method: str
+	path: str
+
+
+class APIGatewayRouteIndex:
+	"""Routes of an API definition indexed by the Lambda function they integrate with.
+
+	Integrations are matched on the Lambda ARN embedded in the integration URI, so a
+	function is only mapped to its own routes and never to functions sharing a prefix.
+	"""
+
+	_cache: Dict[Path, Tuple[Tuple[int, int], "APIGatewayRouteIndex"]] = {}
+	_cache_lock = threading.Lock()
+
+	def __init__(self, routes_by_arn: Dict[str, List[APIGatewayRoute]]):
+		self._routes_by_arn = routes_by_arn
+		self._routes_by_name: Dict[str, List[APIGatewayRoute]] = {}
+		for arn, routes in routes_by_arn.items():
+			self._routes_by_name.setdefault(_function_name_from_arn(arn), []).extend(routes)
+
+	@classmethod
+	def from_definition(cls, definition: Dict) -> "APIGatewayRouteIndex":
+		routes_by_arn: Dict[str, List[APIGatewayRoute]] = {}
+		for resource_path, methods in definition.get("paths", {}).items():
+			for method_name, method_def in methods.items():
+				method_name = method_name.lower()
+				if method_name not in _HTTP_METHODS and method_name != _ANY_METHOD:
+					continue
+
+				uri = method_def.get("x-amazon-apigateway-integration", {}).get("uri", "")
+				match = _LAMBDA_ARN_IN_URI.search(uri)
+				if match is None:
+					continue
+
+				method = "ANY" if method_name == _ANY_METHOD else method_name.upper()
+				routes_by_arn.setdefault(match.group(1), []).append(
+					APIGatewayRoute(method=method, path=resource_path)
+				)
+		return cls(routes_by_arn)
+
+	@classmethod
+	def load(cls, config_file: Path) -> "APIGatewayRouteIndex":
+		"""Parse `config_file` once per modification, sharing the index across callers."""
+		config_file = Path(config_file).resolve()
+		try:
+			stat = os.stat(config_file)
+		except FileNotFoundError:
+			return cls({})
+
+		signature = (stat.st_mtime_ns, stat.st_size)
+		with cls._cache_lock:
+			cached = cls._cache.get(config_file)
+			if cached is not None and cached[0] == signature:
+				return cached[1]
+
+		with open(config_file, "r") as f:
+			index = cls.from_definition(json.load(f))
+
+		with cls._cache_lock:
+			cls._cache[config_file] = (signature, index)
+		return index
+
+	def routes_for(self, function: str) -> List[APIGatewayRoute]:
+		"""Return every route integrated with a function name or (optionally qualified) ARN."""
+		if function.startswith("arn:"):
+			return list(self._routes_by_arn.get(function, []))
+		return list(self._routes_by_name.get(function, []))
+
+
+def _function_name_from_arn(arn: str) -> str:
+	# arn:aws:lambda:<region>:<account>:function:<name>[:<qualifier>]
+	parts = arn.split(":")
+	return parts[6] if len(parts) > 6 else arn
+
 
 class APIGatewayUtil:
 	creds: CredentialsProvider
@@ -35,37 +125,100 @@ class APIGatewayUtil:
 	def apigateway_client(self) -> APIGatewayClient:
 		return self._client_factory.client(AwsService.APIGateway)
 
-	def create_api_gateway(self, api_id: str):
-		api_id = self._create_api_with_custom_id(
-			name=f"{api_id}",
-			custom_id=f"{api_id}",
-		)
-		self._import_api_definition(
-			api_id=api_id,
-			json_file=Path.joinpath(self.aws_config_dir, self.gateway_file),
+	def create_api_gateway(self, api_id: str) -> str:
+		"""Create or update the API tagged with `api_id` and deploy it to the environment stage.
+
+		The existing API is reused when found, and the import and deployment are skipped
+		when the definition hash matches the one recorded on the deployed stage.
+
+		Returns: The REST API id.
+		"""
+		with open(Path.joinpath(self.aws_config_dir, self.gateway_file), "r") as f:
+			body = f.read()
+		definition_hash = hashlib.sha256(body.encode("utf-8")).hexdigest()
+		stage_name = str(self.environment)
+
+		rest_api_id = self._find_api_by_custom_id(custom_id=f"{api_id}")
+		if rest_api_id is None:
+			rest_api_id = self._create_api_with_custom_id(
+				name=f"{api_id}",
+				custom_id=f"{api_id}",
+			)
+			deployed_variables = None
+		else:
+			deployed_variables = self._stage_variables(rest_api_id, stage_name)
+
+		if (
+			deployed_variables is not None
+			and deployed_variables.get(DEFINITION_HASH_STAGE_VARIABLE) == definition_hash
+		):
+			logger.info(f"API Gateway '{rest_api_id}' is up to date on stage '{stage_name}'")
+			return rest_api_id
+
+		self._import_api_definition(api_id=rest_api_id, body=body)
+		self._deploy_api_gateway(
+			rest_api_id,
+			stage_name=stage_name,
+			definition_hash=definition_hash,
+			stage_exists=deployed_variables is not None,
 		)
-		self._deploy_api_gateway(api_id, stage_name=self.environment)
+		return rest_api_id
+
+	def _find_api_by_custom_id(self, custom_id: str) -> Optional[str]:
+		paginator = self.apigateway_client.get_paginator("get_rest_apis")
+		for page in paginator.paginate():
+			for item in page.get("items", []):
+				if item.get("tags", {}).get(CUSTOM_ID_TAG) == custom_id:
+					return item["id"]
+		return None
+
+	def _stage_variables(self, api_id: str, stage_name: str) -> Optional[Dict[str, str]]:
+		"""Return the stage variables, or None when the stage does not exist yet."""
+		try:
+			stage = self.apigateway_client.get_stage(restApiId=api_id, stageName=stage_name)
+		except self.apigateway_client.exceptions.NotFoundException:
+			return None
+		return stage.get("variables", {})
 
 	def _create_api_with_custom_id(self, name: str, custom_id: str) -> str:
 		response = self.apigateway_client.create_rest_api(
-			name=name, tags={"_custom_id_": custom_id}
+			name=name, tags={CUSTOM_ID_TAG: custom_id}
 		)
 		api_id = response["id"]
 		logger.info(f"Created API Gateway '{api_id}'")
 		return api_id
 
-	def _import_api_definition(self, api_id: str, json_file: str):
-		with open(json_file, "r") as f:
-			body = f.read()
-
+	def _import_api_definition(self, api_id: str, body: str):
 		self.apigateway_client.put_rest_api(restApiId=api_id, mode="overwrite", body=body)
 		logger.info(f"Imported API definition for '{api_id}'")
 
-	def _deploy_api_gateway(self, api_id: str, stage_name: str):
-		self.apigateway_client.create_deployment(restApiId=api_id, stageName=stage_name)
+	def _deploy_api_gateway(
+		self, api_id: str, stage_name: str, definition_hash: str, stage_exists: bool
+	):
+		self.apigateway_client.create_deployment(
+			restApiId=api_id,
+			stageName=stage_name,
+			variables={DEFINITION_HASH_STAGE_VARIABLE: definition_hash},
+		)
+		if stage_exists:
+			# Deployment variables only seed new stages; record the hash on existing ones.
+			self.apigateway_client.update_stage(
+				restApiId=api_id,
+				stageName=stage_name,
+				patchOperations=[
+					{
+						"op": "replace",
+						"path": f"/variables/{DEFINITION_HASH_STAGE_VARIABLE}",
+						"value": definition_hash,
+					}
+				],
+			)
 		logger.info(f"Deployed API Gateway '{api_id}' to stage '{stage_name}'")
 		logger.info(f"API endpoint: {self.build_url(api_id=api_id)}")
 
+	def route_index(self) -> APIGatewayRouteIndex:
+		return APIGatewayRouteIndex.load(Path.joinpath(self.aws_config_dir, self.gateway_file))
+
 	def gateway_config_file(self) -> Dict:
 		with open(Path.joinpath(self.aws_config_dir, self.gateway_file), "r") as f:
 			return json.load(f)
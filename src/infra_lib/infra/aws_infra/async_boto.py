@@ -0,0 +1,198 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import threading
+from typing import Any, Awaitable, Callable, Iterable, List, Optional, TypeVar
+import weakref
+
+from boto3.resources.base import ServiceResource
+
+from .aws_services_enum import AwsService
+from .boto_client_factory import BotoClientFactory
+
+T = TypeVar("T")
+
+
+class AsyncBotoClientFactory:
+	"""
+	Asyncio front-end for `BotoClientFactory`.
+
+	boto3 calls are offloaded to a dedicated thread pool and bounded by a per-event-loop
+	semaphore of `max_concurrency`, so ops can `await asyncio.gather(...)` over hundreds
+	of resources without opening hundreds of connections at once.
+
+	    aws = AsyncBotoClientFactory(client_factory)
+	    sqs = aws.client(AwsService.SQS)
+	    await asyncio.gather(*(sqs.create_queue(QueueName=name) for name in names))
+
+	Clients are thread-safe and shared by every worker thread. boto3 resources are not,
+	so `resource` gives each worker thread its own, and resources returned by its calls
+	(`await s3.Bucket(name)`) are rebuilt per thread from their identifiers. `wrap` gives
+	the same treatment to a sync util whose methods are safe to call concurrently, i.e.
+	utils backed by clients, e.g. `aws.wrap(infra.lambda_util)`. Resource-backed utils
+	such as `S3Util` must be built once per thread with `wrap_per_thread`.
+
+	The thread pool is started on first use and stopped by `close`.
+	"""
+
+	def __init__(self, client_factory: BotoClientFactory, max_concurrency: int = 32):
+		self._client_factory = client_factory
+		self.max_concurrency = max_concurrency
+		self._executor: Optional[ThreadPoolExecutor] = None
+		self._executor_lock = threading.Lock()
+		self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+		self._semaphores_lock = threading.Lock()
+
+	def client(self, service: AwsService) -> "AsyncProxy":
+		return AsyncProxy(self._client_factory.client(service), self)
+
+	def resource(self, service: AwsService) -> "PerThreadAsyncProxy":
+		return PerThreadAsyncProxy(
+			lambda: self._client_factory.new_resource(service), self, rebind_resources=True
+		)
+
+	def wrap(self, target: Any) -> "AsyncProxy":
+		"""Expose every method of `target` as a coroutine function run on the pool.
+
+		Methods run on several pool threads at once, so `target` must be thread-safe.
+		"""
+		return AsyncProxy(target, self)
+
+	def wrap_per_thread(self, target_factory: Callable[[], Any]) -> "PerThreadAsyncProxy":
+		"""Like `wrap`, but every pool thread calls its own `target_factory()` instance.
+
+		s3 = aws.wrap_per_thread(lambda: S3Util(creds, BotoClientFactory(creds)))
+		"""
+		return PerThreadAsyncProxy(target_factory, self)
+
+	async def run(self, func: Callable[..., T], *args, **kwargs) -> T:
+		async with self._semaphore():
+			loop = asyncio.get_running_loop()
+			return await loop.run_in_executor(
+				self._pool(), functools.partial(func, *args, **kwargs)
+			)
+
+	def close(self):
+		with self._executor_lock:
+			executor, self._executor = self._executor, None
+		if executor is not None:
+			executor.shutdown(wait=True)
+
+	def _pool(self) -> ThreadPoolExecutor:
+		with self._executor_lock:
+			if self._executor is None:
+				self._executor = ThreadPoolExecutor(
+					max_workers=self.max_concurrency, thread_name_prefix="infra-lib-aws"
+				)
+			return self._executor
+
+	def _semaphore(self) -> asyncio.Semaphore:
+		# asyncio primitives bind to the loop they are first used on, and ops may run
+		# on several loops over the life of the factory.
+		loop = asyncio.get_running_loop()
+		with self._semaphores_lock:
+			semaphore = self._semaphores.get(loop)
+			if semaphore is None:
+				semaphore = asyncio.Semaphore(self.max_concurrency)
+				self._semaphores[loop] = semaphore
+			return semaphore
+
+
+class AsyncProxy:
+	"""Wraps an object so its methods return awaitables; other attributes pass through."""
+
+	def __init__(self, target: Any, factory: AsyncBotoClientFactory):
+		self._target = target
+		self._factory = factory
+
+	def __getattr__(self, name: str) -> Any:
+		attr = getattr(self._target, name)
+		if not callable(attr) or isinstance(attr, type):
+			return attr
+
+		@functools.wraps(attr)
+		async def call(*args, **kwargs):
+			return await self._factory.run(attr, *args, **kwargs)
+
+		return call
+
+
+class PerThreadAsyncProxy:
+	"""`AsyncProxy` over one target per thread, created lazily by `target_factory`.
+
+	Attributes are looked up on the worker thread's own target when the call runs, so
+	every attribute is a coroutine function; plain attributes are read with
+	`run_with_target`. With `rebind_resources`, boto3 resources returned by a call are
+	wrapped in a proxy that rebuilds them on each thread from the root resource.
+	"""
+
+	def __init__(
+		self,
+		target_factory: Callable[[], Any],
+		factory: AsyncBotoClientFactory,
+		rebind_resources: bool = False,
+		root: Optional["PerThreadAsyncProxy"] = None,
+	):
+		self._target_factory = target_factory
+		self._factory = factory
+		self._rebind_resources = rebind_resources
+		self._root = root if root is not None else self
+		self._local = threading.local()
+
+	def _target(self) -> Any:
+		target = getattr(self._local, "target", None)
+		if target is None:
+			target = self._target_factory()
+			self._local.target = target
+		return target
+
+	async def run_with_target(self, func: Callable[[Any], T]) -> T:
+		"""Run `func` with this thread's target on the pool, e.g. to iterate a collection."""
+		return self._bind(await self._factory.run(lambda: func(self._target())))
+
+	def __getattr__(self, name: str) -> Any:
+		if name.startswith("__"):
+			raise AttributeError(name)
+
+		def invoke(*args, **kwargs):
+			attr = getattr(self._target(), name)
+			if not callable(attr):
+				raise TypeError(f"'{name}' is not callable; read it with `run_with_target`")
+			return attr(*args, **kwargs)
+
+		async def call(*args, **kwargs):
+			return self._bind(await self._factory.run(invoke, *args, **kwargs))
+
+		call.__name__ = call.__qualname__ = name
+		return call
+
+	def _bind(self, result: Any) -> Any:
+		if not self._rebind_resources:
+			return result
+		if isinstance(result, list):
+			return [self._bind(item) for item in result]
+		if not isinstance(result, ServiceResource) or not result.meta.identifiers:
+			return result
+
+		# Sub-resources are created from the root resource by model name and identifiers,
+		# e.g. `s3.Object(bucket_name, key)`.
+		root = self._root
+		model_name = result.meta.resource_model.name
+		identifiers = [getattr(result, name) for name in result.meta.identifiers]
+		return PerThreadAsyncProxy(
+			lambda: getattr(root._target(), model_name)(*identifiers),
+			self._factory,
+			rebind_resources=True,
+			root=root,
+		)
+
+
+async def gather_limited(aws: Iterable[Awaitable[T]], limit: int) -> List[T]:
+	"""`asyncio.gather` that awaits at most `limit` of `aws` at a time."""
+	semaphore = asyncio.Semaphore(limit)
+
+	async def bounded(aw: Awaitable[T]) -> T:
+		async with semaphore:
+			return await aw
+
+	return list(await asyncio.gather(*(bounded(aw) for aw in aws)))
@@ -1,3 +1,4 @@
+from .async_boto import AsyncBotoClientFactory
 from .boto_client_factory import BotoClientFactory
 from .creds import CredentialsProvider
 from .eventbridge_util import EventBridgeUtil
@@ -24,6 +25,8 @@ class AWSInfraProvider(BaseInfraProvider):
 	    eventbridge_util (EventBridgeUtil): Utility for managing EventBridge rules and events.
 	    secrets_util (SecretsManagerUtil): Utility for managing Secrets Manager secrets.
 	    api_gateway_util (APIGatewayUtil): Utility for managing API Gateway endpoints.
+	    async_client_factory (AsyncBotoClientFactory): Asyncio access to clients and utils;
+	        its thread pool starts on first use and is stopped by `close()`.
 	    env_vars (Dict[str, str]): Environment variables used for deployment.
 	    infrastructure_dir (Path): Path to infrastructure configuration directory.
 	    projects_dir (Path): Path to project source directories.
@@ -39,20 +42,29 @@ class AWSInfraProvider(BaseInfraProvider):
 	secrets_util: SecretsManagerUtil
 	api_gateway_util: APIGatewayUtil
 	sts_util: STSUtil
+	async_client_factory: AsyncBotoClientFactory
 
 	def __init__(self, env_context: AWSEnvironmentContext):
 		super().__init__(env_context=env_context)
 
-		self.creds = CredentialsProvider.from_env()
-		self._client_factory = BotoClientFactory(self.creds)
+		self.creds = CredentialsProvider.from_env(env_context.environ)
+		self._client_factory = BotoClientFactory(
+			self.creds, rate_limits=env_context.aws_rate_limits()
+		)
+		self.async_client_factory = AsyncBotoClientFactory(self._client_factory)
 
 		self.secrets_util = SecretsManagerUtil(
 			creds=self.creds,
 			aws_config_dir=env_context.aws_config_dir(),
 			client_factory=self._client_factory,
+			async_client_factory=self.async_client_factory,
 		)
 		self.s3_util = S3Util(creds=self.creds, client_factory=self._client_factory)
-		self.queues_util = QueuesUtil(creds=self.creds, client_factory=self._client_factory)
+		self.queues_util = QueuesUtil(
+			creds=self.creds,
+			client_factory=self._client_factory,
+			async_client_factory=self.async_client_factory,
+		)
 		self.api_gateway_util = APIGatewayUtil(
 			creds=self.creds,
 			environment=env_context.env(),
@@ -65,13 +77,20 @@ class AWSInfraProvider(BaseInfraProvider):
 			config_dir=env_context.aws_config_dir(),
 			project_root=env_context.project_root,
 			client_factory=self._client_factory,
+			async_client_factory=self.async_client_factory,
+			environ=env_context.environ,
 		)
 		self.eventbridge_util = EventBridgeUtil(
 			creds=self.creds,
 			environment=env_context.env(),
 			aws_localstack_dir=env_context.aws_config_dir(),
+			client_factory=self._client_factory,
 		)
 		self.sts_util = STSUtil(
 			creds=self.creds,
 			client_factory=self._client_factory,
 		)
+
+	def close(self):
+		"""Stop the thread pool behind `async_client_factory`, if it was started."""
+		self.async_client_factory.close()
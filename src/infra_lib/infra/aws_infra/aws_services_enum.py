@@ -9,3 +9,4 @@ class AwsService(StrEnum):
 	SECRETS_MANAGER = "secretsmanager"
 	CLOUD_FORMATION = "cloudformation"
 	STS = "sts"
+	SSM = "ssm"
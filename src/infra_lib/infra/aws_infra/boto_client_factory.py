@@ -1,11 +1,33 @@
+import threading
+from typing import Dict, Optional
+
 import boto3
 
 from .aws_services_enum import AwsService
 from .creds import CredentialsProvider
+from .rate_limiting import (
+	AwsCallTelemetry,
+	ClientInstrumentation,
+	RateLimit,
+	TokenBucket,
+	aws_call_telemetry,
+)
 
 
 class BotoClientFactory:
-	def __init__(self, creds: CredentialsProvider):
+	"""Creates and caches one boto3 client per service.
+
+	Every client records throttling and retry telemetry. Services listed in
+	`rate_limits` also share a client-side token bucket, which keeps fan-out calls near
+	the API's sustained rate instead of bursting into throttling and backoff.
+	"""
+
+	def __init__(
+		self,
+		creds: CredentialsProvider,
+		rate_limits: Optional[Dict[AwsService, RateLimit]] = None,
+		telemetry: Optional[AwsCallTelemetry] = None,
+	):
 		self._session = boto3.session.Session(
 			aws_access_key_id=creds.access_key_id,
 			aws_secret_access_key=creds.secret_access_key,
@@ -13,18 +35,48 @@ class BotoClientFactory:
 		)
 		self._endpoint_url = creds.url
 		self._cache = {}
+		# Sessions are not thread-safe; the clients they create are.
+		self._lock = threading.Lock()
+		self._buckets = {
+			AwsService(service): TokenBucket(limit)
+			for service, limit in (rate_limits or {}).items()
+		}
+		self.telemetry = telemetry if telemetry is not None else aws_call_telemetry
 
 	def client(self, service: AwsService):
 		if service not in self._cache:
-			self._cache[service] = self._session.client(
-				service.value,
-				endpoint_url=self._endpoint_url,
-			)
+			with self._lock:
+				if service not in self._cache:
+					client = self._session.client(
+						service.value,
+						endpoint_url=self._endpoint_url,
+					)
+					self._instrument(service, client)
+					self._cache[service] = client
 		return self._cache[service]
 
 	def resource(self, service: AwsService):
 		if service not in self._cache:
-			self._cache[service] = self._session.resource(
-				service.value, endpoint_url=self._endpoint_url
-			)
+			with self._lock:
+				if service not in self._cache:
+					self._cache[service] = self._create_resource(service)
 		return self._cache[service]
+
+	def new_resource(self, service: AwsService):
+		"""Create an uncached resource.
+
+		boto3 resources are not thread-safe, so code sharing this factory across threads
+		should give each thread its own resource from here instead of using `resource`.
+		"""
+		with self._lock:
+			return self._create_resource(service)
+
+	def _create_resource(self, service: AwsService):
+		resource = self._session.resource(service.value, endpoint_url=self._endpoint_url)
+		self._instrument(service, resource.meta.client)
+		return resource
+
+	def _instrument(self, service: AwsService, client):
+		ClientInstrumentation(
+			service=service.value, bucket=self._buckets.get(service), telemetry=self.telemetry
+		).register(client)
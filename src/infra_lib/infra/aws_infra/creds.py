@@ -1,5 +1,6 @@
 import os
 from dataclasses import dataclass
+from typing import Mapping, Optional
 
 from ...exceptions import ConfigError
 
@@ -12,25 +13,27 @@ class CredentialsProvider:
 	region: str
 
 	@classmethod
-	def from_env(cls) -> "CredentialsProvider":
+	def from_env(cls, environ: Optional[Mapping[str, str]] = None) -> "CredentialsProvider":
+		"""Read credentials from `environ`, defaulting to os.environ."""
+		environ = os.environ if environ is None else environ
 		required_vars = [
 			"AWS_ACCESS_KEY_ID",
 			"AWS_SECRET_ACCESS_KEY",
 			"AWS_ENDPOINT_URL",
 			"AWS_DEFAULT_REGION",
 		]
-		missing_vars = [var for var in required_vars if not os.getenv(var)]
+		missing_vars = [var for var in required_vars if not environ.get(var)]
 
 		if missing_vars:
 			raise ConfigError(
 				"Missing required AWS environment variables: " + ", ".join(missing_vars)
 			)
 
-		endpoint_url = os.getenv("AWS_ENDPOINT_URL")
+		endpoint_url = environ.get("AWS_ENDPOINT_URL")
 
 		return cls(
-			access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
-			secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
+			access_key_id=environ.get("AWS_ACCESS_KEY_ID"),
+			secret_access_key=environ.get("AWS_SECRET_ACCESS_KEY"),
 			url=endpoint_url.replace("localstack", "localhost"),
-			region=os.getenv("AWS_DEFAULT_REGION"),
+			region=environ.get("AWS_DEFAULT_REGION"),
 		)
@@ -1,14 +1,31 @@
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+import hashlib
 from pathlib import Path
-import boto3
 import logging
+import time
+from typing import Dict, Iterable, List, Optional
+
+from botocore.exceptions import ClientError
+from mypy_boto3_cloudformation import CloudFormationClient
 
 from ..enums import InfraEnvironment
+from .aws_services_enum import AwsService
+from .boto_client_factory import BotoClientFactory
 from .creds import CredentialsProvider
+from ...exceptions import InfraError
+from ...utils.polling import poll_until
 
 
 logger = logging.getLogger(__name__)
 
+# SSM parameter holding the hash of the last template applied to a stack. Unlike stack
+# tags, it is not propagated to every resource of the stack.
+TEMPLATE_HASH_PARAMETER = "/infra-lib/cloudformation/{stack_name}/template-sha256"
+_SUCCESS_STATUSES = {"CREATE_COMPLETE", "UPDATE_COMPLETE"}
+# A stack whose last update rolled back is healthy and runs its previous template.
+_STABLE_STATUSES = _SUCCESS_STATUSES | {"UPDATE_ROLLBACK_COMPLETE"}
+
 
 @dataclass
 class EventBridgeStackConfig:
@@ -20,38 +37,180 @@ class EventBridgeUtil:
 	creds: CredentialsProvider
 	environment: InfraEnvironment
 	_aws_localstack_dir: Path
+	_client_factory: BotoClientFactory
 
 	def __init__(
 		self,
 		creds: CredentialsProvider,
 		aws_localstack_dir: Path,
 		environment: InfraEnvironment,
+		client_factory: BotoClientFactory,
 	):
 		self.creds = creds
 		self._aws_localstack_dir: Path = aws_localstack_dir
 		self.environment = environment
+		self._client_factory = client_factory
+
+	@property
+	def _cfn_client(self) -> CloudFormationClient:
+		return self._client_factory.client(AwsService.CLOUD_FORMATION)
+
+	@property
+	def _ssm_client(self):
+		return self._client_factory.client(AwsService.SSM)
 
 	def template_file(self, file_name: str) -> Path:
 		return Path.joinpath(self._aws_localstack_dir, file_name)
 
-	def create_stack(self, stack: EventBridgeStackConfig):
+	def create_stack(
+		self, stack: EventBridgeStackConfig, wait: bool = True, timeout_secs: float = 600
+	) -> Optional[str]:
+		"""Create the stack, or update it through a change set when its template changed.
+
+		The hash of the last applied template is kept in an SSM parameter, so unchanged
+		templates skip the update entirely. With `wait=True` the stack status is polled
+		with backoff until the operation completes, including an operation already in
+		progress on an unchanged stack.
+
+		Returns: The final stack status, or None when the template file does not exist.
+
+		Raises:
+		    InfraError: If an operation submitted here fails or rolls back, or the stack
+		        ends in a failed state.
+		"""
 		if not self.template_file(stack.template_name).exists():
 			logger.info(f"Skipping EventBridge stack '{stack.name}': template not found")
-			return
+			return None
 
 		with open(self.template_file(stack.template_name), "r") as f:
 			template_body = f.read()
 
-		cfn = boto3.client(
-			"cloudformation",
-			endpoint_url=self.creds.url,
-			region_name=self.creds.region,
-			aws_access_key_id=self.creds.access_key_id,
-			aws_secret_access_key=self.creds.secret_access_key,
+		template_hash = hashlib.sha256(template_body.encode("utf-8")).hexdigest()
+		existing = self._describe_stack(stack.name)
+
+		if existing is not None and existing["StackStatus"] == "ROLLBACK_COMPLETE":
+			# A stack whose creation rolled back cannot be updated, only replaced.
+			logger.info(f"Replacing rolled back EventBridge stack '{stack.name}'")
+			self._cfn_client.delete_stack(StackName=stack.name)
+			self._wait_for_stack(stack.name, timeout_secs)
+			existing = None
+
+		if existing is None:
+			self._cfn_client.create_stack(StackName=stack.name, TemplateBody=template_body)
+			logger.info(f"Creating EventBridge stack '{stack.name}'")
+			submitted = True
+		elif self._applied_template_hash(stack.name) == template_hash:
+			logger.info(f"EventBridge stack '{stack.name}' is up to date")
+			submitted = False
+		else:
+			submitted = self._update_with_change_set(stack.name, template_body, timeout_secs)
+			if not submitted:
+				# The deployed stack already matches the template.
+				self._record_template_hash(stack.name, template_hash)
+
+		if not wait:
+			return None if submitted else existing["StackStatus"]
+
+		status = self._wait_for_stack(stack.name, timeout_secs)
+		if status not in (_SUCCESS_STATUSES if submitted else _STABLE_STATUSES):
+			raise InfraError(
+				f"EventBridge stack '{stack.name}' ended in '{status}': "
+				f"{'; '.join(self._failure_reasons(stack.name)) or 'no failure events'}"
+			)
+
+		if submitted:
+			self._record_template_hash(stack.name, template_hash)
+		logger.info(f"EventBridge stack '{stack.name}' is {status}")
+		return status
+
+	def create_stacks(
+		self,
+		stacks: Iterable[EventBridgeStackConfig],
+		max_workers: int = 4,
+		wait: bool = True,
+		timeout_secs: float = 600,
+	) -> Dict[str, Optional[str]]:
+		"""Submit several stacks concurrently and wait for all of them."""
+		stacks = list(stacks)
+		with ThreadPoolExecutor(max_workers=max_workers) as executor:
+			statuses = executor.map(
+				lambda stack: self.create_stack(stack, wait=wait, timeout_secs=timeout_secs), stacks
+			)
+			return {stack.name: status for stack, status in zip(stacks, statuses)}
+
+	def _update_with_change_set(
+		self, stack_name: str, template_body: str, timeout_secs: float
+	) -> bool:
+		"""Create and execute an update change set. Returns False if it had no changes."""
+		change_set_name = f"infra-lib-{int(time.time())}"
+		self._cfn_client.create_change_set(
+			StackName=stack_name,
+			ChangeSetName=change_set_name,
+			ChangeSetType="UPDATE",
+			TemplateBody=template_body,
+		)
+
+		change_set = poll_until(
+			probe=lambda: self._cfn_client.describe_change_set(
+				StackName=stack_name, ChangeSetName=change_set_name
+			),
+			is_done=lambda response: response["Status"] in ("CREATE_COMPLETE", "FAILED"),
+			timeout_secs=timeout_secs,
 		)
 
+		if change_set["Status"] == "FAILED":
+			reason = change_set.get("StatusReason", "")
+			self._cfn_client.delete_change_set(StackName=stack_name, ChangeSetName=change_set_name)
+			if "didn't contain changes" in reason or "No updates" in reason:
+				logger.info(f"EventBridge stack '{stack_name}' has no changes to apply")
+				return False
+			raise InfraError(f"Change set for EventBridge stack '{stack_name}' failed: {reason}")
+
+		self._cfn_client.execute_change_set(StackName=stack_name, ChangeSetName=change_set_name)
+		logger.info(f"Updating EventBridge stack '{stack_name}'")
+		return True
+
+	def _applied_template_hash(self, stack_name: str) -> Optional[str]:
 		try:
-			cfn.create_stack(StackName=stack.name, TemplateBody=template_body)
-			logger.info(f"Created EventBridge stack '{stack.name}'")
-		except cfn.exceptions.AlreadyExistsException:
-			logger.info(f"EventBridge stack '{stack.name}' already exists")
+			response = self._ssm_client.get_parameter(
+				Name=TEMPLATE_HASH_PARAMETER.format(stack_name=stack_name)
+			)
+		except self._ssm_client.exceptions.ParameterNotFound:
+			return None
+		return response["Parameter"]["Value"]
+
+	def _record_template_hash(self, stack_name: str, template_hash: str):
+		self._ssm_client.put_parameter(
+			Name=TEMPLATE_HASH_PARAMETER.format(stack_name=stack_name),
+			Value=template_hash,
+			Type="String",
+			Overwrite=True,
+		)
+
+	def _describe_stack(self, stack_name: str) -> Optional[Dict]:
+		try:
+			stacks = self._cfn_client.describe_stacks(StackName=stack_name)["Stacks"]
+		except ClientError as e:
+			if "does not exist" in str(e):
+				return None
+			raise
+		return stacks[0] if stacks else None
+
+	def _wait_for_stack(self, stack_name: str, timeout_secs: float) -> str:
+		"""Poll until the stack leaves its *_IN_PROGRESS state. Deleted stacks return DELETE_COMPLETE."""
+		stack = poll_until(
+			probe=lambda: self._describe_stack(stack_name),
+			is_done=lambda s: s is None or not s["StackStatus"].endswith("_IN_PROGRESS"),
+			timeout_secs=timeout_secs,
+		)
+		return "DELETE_COMPLETE" if stack is None else stack["StackStatus"]
+
+	def _failure_reasons(self, stack_name: str, limit: int = 5) -> List[str]:
+		"""Return the most recent failure reasons from the stack events (newest first)."""
+		events = self._cfn_client.describe_stack_events(StackName=stack_name)["StackEvents"]
+		reasons = [
+			f"{event['LogicalResourceId']}: {event.get('ResourceStatusReason', '')}"
+			for event in events
+			if event["ResourceStatus"].endswith("_FAILED")
+		]
+		return reasons[:limit]
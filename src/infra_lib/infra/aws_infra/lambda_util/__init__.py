@@ -1,4 +1,12 @@
 from .lambda_util import AWSLambdaParameters, LambdaUtil, BaseLambdaZipBuilder
 from .arch_enum import AWSLambdaArchitecture
+from .lambda_zip_builder import DotnetPublishProfile, DotnetZipBuilder
 
-__all__ = ["AWSLambdaParameters", "LambdaUtil", "BaseLambdaZipBuilder", "AWSLambdaArchitecture"]
+__all__ = [
+	"AWSLambdaParameters",
+	"LambdaUtil",
+	"BaseLambdaZipBuilder",
+	"AWSLambdaArchitecture",
+	"DotnetPublishProfile",
+	"DotnetZipBuilder",
+]
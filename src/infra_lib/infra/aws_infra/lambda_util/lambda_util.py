@@ -1,6 +1,12 @@
+import asyncio
+import base64
+import copy
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import InitVar, dataclass, field
+import hashlib
 import shutil
-from typing import Dict, List, Optional
+import threading
+from typing import Any, Dict, Iterable, List, Mapping, Optional
 import logging
 from pathlib import Path
 
@@ -9,15 +15,21 @@ from mypy_boto3_lambda.literals import RuntimeType
 
 
 from ..api_gateway_util import APIGatewayUtil
+from ..async_boto import AsyncBotoClientFactory
 from ..boto_client_factory import AwsService, BotoClientFactory
 from ...enums import InfraEnvironment
 from ..creds import CredentialsProvider
 from .lambda_zip_builder import DEFAULT_BUILDER_BY_RUNTIME, BaseLambdaZipBuilder
 from ..sts_util import STSUtil
 from .arch_enum import AWSLambdaArchitecture
+from ....exceptions import InfraError
+from ....utils.polling import poll_until
 
 logger = logging.getLogger(__name__)
 
+# Matches the previous `function_updated` waiter budget (12 attempts, 5 s apart).
+FUNCTION_UPDATE_TIMEOUT_SECS = 60
+
 
 class LambdaUtil:
 	_infra_dir: Path
@@ -26,6 +38,7 @@ class LambdaUtil:
 	_client_factory: BotoClientFactory
 	config_dir: Path
 	_sts_util: STSUtil
+	_wait_executor: Optional[ThreadPoolExecutor]
 
 	def __init__(
 		self,
@@ -34,16 +47,28 @@ class LambdaUtil:
 		project_root: Path,
 		client_factory: BotoClientFactory,
 		config_dir: Path,
+		async_client_factory: Optional[AsyncBotoClientFactory] = None,
+		environ: Optional[Mapping[str, str]] = None,
 	):
 		self.creds = creds
 		self.environment = environment
 		self._infra_dir = project_root
 		self._client_factory = client_factory
+		self._async_client_factory = async_client_factory or AsyncBotoClientFactory(client_factory)
 		self.config_dir = config_dir
+		self._environ = environ
 		self._sts_util = STSUtil(
 			creds=creds,
 			client_factory=client_factory,
 		)
+		self._gateway_util = APIGatewayUtil(
+			creds=creds,
+			aws_config_dir=config_dir,
+			environment=environment,
+			client_factory=client_factory,
+		)
+		self._wait_executor = None
+		self._wait_executor_lock = threading.Lock()
 
 	@property
 	def _lambda_client(self) -> LambdaClient:
@@ -59,12 +84,9 @@ class LambdaUtil:
 			output_dir=self.output_dir,
 		)
 
-		account_id = self._sts_util.get_account_id()
-		role = "lambda-role"
-
 		self._create_lambda(
 			zip_path=zip_path,
-			role=f"arn:aws:iam::{account_id}:role/{role}",
+			role=self._lambda_role_arn(),
 			lambda_params=lambda_params,
 		)
 
@@ -76,25 +98,153 @@ class LambdaUtil:
 			lambda_name=lambda_params.function_name, api_id=lambda_params.api_id
 		)
 
-	def update_lambda_code(self, lambda_params: "AWSLambdaParameters"):
+	def ensure_lambda(self, lambda_params: "AWSLambdaParameters"):
+		"""
+		Creates the Lambda function, or reconciles an existing one with `lambda_params`.
+
+		The current configuration is fetched once and diffed against the parameters.
+		Configuration is only updated when memory, timeout, env vars, handler, runtime or
+		SnapStart changed, and code is only uploaded when the package hash or architecture
+		changed. Reserved concurrency, the published alias and its provisioned concurrency
+		are reconciled afterwards.
+		"""
+		zip_path = self._build_lambda(
+			lambda_params=lambda_params,
+			output_dir=self.output_dir,
+		)
+		function_name = lambda_params.function_name
+		current = self._get_function_configuration(function_name)
+
+		if current is None:
+			self._create_lambda(
+				zip_path=zip_path,
+				role=self._lambda_role_arn(),
+				lambda_params=lambda_params,
+			)
+		else:
+			config_changes = self._configuration_changes(current, lambda_params)
+			if config_changes:
+				logger.info(
+					f"Updating configuration of Lambda '{function_name}': "
+					f"{', '.join(sorted(config_changes))}"
+				)
+				self._lambda_client.update_function_configuration(
+					FunctionName=function_name, **config_changes
+				)
+
+			with open(zip_path, "rb") as f:
+				zip_bytes = f.read()
+
+			code_changed = current.get("CodeSha256") != _code_sha256(zip_bytes)
+			arch_changed = current.get("Architectures", ["x86_64"]) != [str(lambda_params.arch)]
+
+			if code_changed or arch_changed:
+				if config_changes:
+					# Lambda rejects a code update while the configuration update is in progress.
+					self.wait_for_function_updated(function_name)
+				self._lambda_client.update_function_code(
+					FunctionName=function_name,
+					ZipFile=zip_bytes,
+					Architectures=[str(lambda_params.arch)],
+				)
+				logger.info(f"Updating code of Lambda '{function_name}'")
+
+			if config_changes or code_changed or arch_changed:
+				self.wait_for_function_updated(function_name)
+				logger.info(f"Updated Lambda function '{function_name}'")
+			else:
+				logger.info(f"Lambda function '{function_name}' is up to date")
+
+		self._reconcile_concurrency(lambda_params)
+
+		self._add_lambda_permission_for_apigateway(
+			function_name=function_name, statement_id="apigateway-access"
+		)
+
+		self._log_lambda_paths_from_apigateway(
+			lambda_name=function_name, api_id=lambda_params.api_id
+		)
+
+	def update_lambda_code(
+		self, lambda_params: "AWSLambdaParameters", wait: bool = True
+	) -> Optional[Future]:
 		"""
 		Builds and updates the code for an existing Lambda function.
 		Note: This only updates the code, not the configuration (e.g., env vars, memory).
+
+		With `wait=False` the update is submitted and a future for its completion is
+		returned, so several functions can be updated and joined together.
 		"""
 		zip_path = self._build_lambda(
 			lambda_params=lambda_params,
 			output_dir=self.output_dir,
 		)
 
-		self._update_lambda_code(
+		pending = self._update_lambda_code(
 			zip_path=zip_path,
 			function_name=lambda_params.function_name,
+			wait=wait,
 		)
 
 		# Log the API gateway paths after the update
 		self._log_lambda_paths_from_apigateway(
 			lambda_name=lambda_params.function_name, api_id=lambda_params.api_id
 		)
+		return pending
+
+	def wait_for_function_updated(
+		self, function_name: str, timeout_secs: float = FUNCTION_UPDATE_TIMEOUT_SECS
+	) -> Dict[str, Any]:
+		"""
+		Polls `LastUpdateStatus` with exponential backoff until the update finishes.
+
+		The first check happens immediately and the delay starts at 100 ms, so fast
+		updates (e.g. on LocalStack) return in milliseconds.
+
+		Returns: The final function configuration.
+
+		Raises:
+		    InfraError: If the update failed.
+		    TimeoutError: If the update did not finish within `timeout_secs`.
+		"""
+		logger.info(f"Waiting for Lambda update for '{function_name}'")
+		config = poll_until(
+			probe=lambda: self._lambda_client.get_function_configuration(
+				FunctionName=function_name
+			),
+			is_done=lambda c: (
+				c.get("LastUpdateStatus") != "InProgress" and c.get("State") != "Pending"
+			),
+			timeout_secs=timeout_secs,
+			initial_delay=0.1,
+		)
+		if config.get("LastUpdateStatus") == "Failed":
+			raise InfraError(
+				f"Update of Lambda function '{function_name}' failed: "
+				f"{config.get('LastUpdateStatusReason', 'no reason reported')}"
+			)
+		if config.get("State") == "Failed":
+			raise InfraError(
+				f"Lambda function '{function_name}' failed to become active: "
+				f"{config.get('StateReason', 'no reason reported')}"
+			)
+		return config
+
+	def wait_for_function_updated_async(
+		self, function_name: str, timeout_secs: float = FUNCTION_UPDATE_TIMEOUT_SECS
+	) -> Future:
+		"""Submits `wait_for_function_updated` to a shared pool and returns its future."""
+		return self._executor().submit(self.wait_for_function_updated, function_name, timeout_secs)
+
+	def wait_for_functions_updated(
+		self, function_names: Iterable[str], timeout_secs: float = FUNCTION_UPDATE_TIMEOUT_SECS
+	) -> Dict[str, Dict[str, Any]]:
+		"""Waits for several functions concurrently. Raises the first failure after all finish."""
+		futures = {
+			name: self.wait_for_function_updated_async(name, timeout_secs)
+			for name in dict.fromkeys(function_names)
+		}
+		return join_function_updates(futures)
 
 	def _build_lambda(
 		self,
@@ -110,22 +260,12 @@ class LambdaUtil:
 		output_dir.mkdir(parents=True, exist_ok=True)
 
 		build_dir = output_dir / "build" / project_root.name
+		lambda_builder = self._lambda_builder(lambda_params)
 
-		if build_dir.exists():
+		if lambda_builder.clean_build_dir and build_dir.exists():
 			shutil.rmtree(build_dir)
 		build_dir.mkdir(parents=True, exist_ok=True)
 
-		lambda_builder = lambda_params.custom_lambda_builder
-
-		if lambda_builder is None:
-			default_lambda_builder_cls = DEFAULT_BUILDER_BY_RUNTIME.get(lambda_params.runtime)
-
-			if not default_lambda_builder_cls:
-				raise NotImplementedError(
-					f"`custom_lambda_builder` not provided and Default Build runner for runtime '{lambda_params.runtime}' not implemented. Must provide a `custom_lambda_builder` or correct the runtime {lambda_params.runtime}"
-				)
-			lambda_builder = default_lambda_builder_cls()
-
 		lambda_zip_file = lambda_builder.build(
 			project_root=project_root,
 			build_dir=build_dir,
@@ -137,26 +277,182 @@ class LambdaUtil:
 
 		return lambda_zip_file
 
+	def _lambda_builder(self, lambda_params: "AWSLambdaParameters") -> BaseLambdaZipBuilder:
+		lambda_builder = lambda_params.custom_lambda_builder
+		if lambda_builder is None:
+			lambda_builder = self._default_lambda_builder(lambda_params)
+
+		if self._environ is not None and lambda_builder.environ is None:
+			# Copied so a builder shared between contexts keeps its own environment.
+			lambda_builder = copy.copy(lambda_builder)
+			lambda_builder.environ = self._environ
+		return lambda_builder
+
+	@staticmethod
+	def _default_lambda_builder(lambda_params: "AWSLambdaParameters") -> BaseLambdaZipBuilder:
+		default_lambda_builder_cls = DEFAULT_BUILDER_BY_RUNTIME.get(lambda_params.runtime)
+
+		if not default_lambda_builder_cls:
+			raise NotImplementedError(
+				f"`custom_lambda_builder` not provided and Default Build runner for runtime '{lambda_params.runtime}' not implemented. Must provide a `custom_lambda_builder` or correct the runtime {lambda_params.runtime}"
+			)
+		return default_lambda_builder_cls.from_lambda_params(lambda_params)
+
+	def _lambda_role_arn(self, role: str = "lambda-role") -> str:
+		account_id = self._sts_util.get_account_id()
+		return f"arn:aws:iam::{account_id}:role/{role}"
+
+	def _get_function_configuration(self, function_name: str) -> Optional[Dict[str, Any]]:
+		try:
+			return self._lambda_client.get_function_configuration(FunctionName=function_name)
+		except self._lambda_client.exceptions.ResourceNotFoundException:
+			return None
+
+	def _configuration_changes(
+		self, current: Dict[str, Any], lambda_params: "AWSLambdaParameters"
+	) -> Dict[str, Any]:
+		"""Return the `update_function_configuration` arguments that differ from `current`."""
+		lambda_builder = self._lambda_builder(lambda_params)
+		desired = {
+			"MemorySize": lambda_params.memory_size,
+			"Timeout": lambda_params.timeout_secs,
+			"Handler": lambda_builder.target_handler(lambda_params.handler),
+			"Runtime": lambda_builder.target_runtime(lambda_params.runtime),
+		}
+		changes = {key: value for key, value in desired.items() if current.get(key) != value}
+
+		current_env = current.get("Environment", {}).get("Variables", {})
+		if current_env != lambda_params.filtered_env_vars:
+			changes["Environment"] = {"Variables": lambda_params.filtered_env_vars}
+
+		snap_start = _snap_start_config(lambda_params)
+		if current.get("SnapStart", {}).get("ApplyOn", "None") != snap_start["ApplyOn"]:
+			changes["SnapStart"] = snap_start
+
+		return changes
+
+	def _reconcile_concurrency(self, lambda_params: "AWSLambdaParameters"):
+		"""
+		Applies reserved concurrency, then publishes a version behind `alias_name` and sets
+		its provisioned concurrency when the function needs published versions.
+
+		`publish_version` returns the latest version unchanged when neither code nor
+		configuration changed, so repeated runs do not create new versions. When versions
+		are no longer published, provisioned concurrency left on an existing alias is
+		removed so it stops being billed.
+		"""
+		function_name = lambda_params.function_name
+		self._apply_reserved_concurrency(function_name, lambda_params.reserved_concurrency)
+
+		if not lambda_params.publishes_versions:
+			if self._alias_exists(function_name, lambda_params.alias_name):
+				self._apply_provisioned_concurrency(function_name, lambda_params.alias_name, None)
+			return
+
+		self.wait_for_function_updated(function_name)
+		version = self._lambda_client.publish_version(FunctionName=function_name)["Version"]
+		self._point_alias(function_name, lambda_params.alias_name, version)
+		self._apply_provisioned_concurrency(
+			function_name, lambda_params.alias_name, lambda_params.provisioned_concurrency
+		)
+
+	def _apply_reserved_concurrency(self, function_name: str, reserved: Optional[int]):
+		current = self._lambda_client.get_function_concurrency(FunctionName=function_name).get(
+			"ReservedConcurrentExecutions"
+		)
+		if current == reserved:
+			return
+
+		if reserved is None:
+			self._lambda_client.delete_function_concurrency(FunctionName=function_name)
+			logger.info(f"Removed reserved concurrency of Lambda '{function_name}'")
+		else:
+			self._lambda_client.put_function_concurrency(
+				FunctionName=function_name, ReservedConcurrentExecutions=reserved
+			)
+			logger.info(f"Set reserved concurrency of Lambda '{function_name}' to {reserved}")
+
+	def _alias_exists(self, function_name: str, alias_name: str) -> bool:
+		try:
+			self._lambda_client.get_alias(FunctionName=function_name, Name=alias_name)
+		except self._lambda_client.exceptions.ResourceNotFoundException:
+			return False
+		return True
+
+	def _point_alias(self, function_name: str, alias_name: str, version: str):
+		try:
+			alias = self._lambda_client.get_alias(FunctionName=function_name, Name=alias_name)
+		except self._lambda_client.exceptions.ResourceNotFoundException:
+			self._lambda_client.create_alias(
+				FunctionName=function_name, Name=alias_name, FunctionVersion=version
+			)
+			logger.info(f"Created alias '{alias_name}' -> {version} for Lambda '{function_name}'")
+			return
+
+		if alias["FunctionVersion"] != version:
+			self._lambda_client.update_alias(
+				FunctionName=function_name, Name=alias_name, FunctionVersion=version
+			)
+			logger.info(f"Moved alias '{alias_name}' to {version} for Lambda '{function_name}'")
+
+	def _apply_provisioned_concurrency(
+		self, function_name: str, alias_name: str, provisioned: Optional[int]
+	):
+		try:
+			current = self._lambda_client.get_provisioned_concurrency_config(
+				FunctionName=function_name, Qualifier=alias_name
+			)["RequestedProvisionedConcurrentExecutions"]
+		except self._lambda_client.exceptions.ProvisionedConcurrencyConfigNotFoundException:
+			current = None
+
+		if current == provisioned:
+			return
+
+		if provisioned is None:
+			self._lambda_client.delete_provisioned_concurrency_config(
+				FunctionName=function_name, Qualifier=alias_name
+			)
+			logger.info(f"Removed provisioned concurrency of '{function_name}:{alias_name}'")
+		else:
+			self._lambda_client.put_provisioned_concurrency_config(
+				FunctionName=function_name,
+				Qualifier=alias_name,
+				ProvisionedConcurrentExecutions=provisioned,
+			)
+			logger.info(
+				f"Set provisioned concurrency of '{function_name}:{alias_name}' to {provisioned}"
+			)
+
 	def _create_lambda(self, zip_path: str, role: str, lambda_params: "AWSLambdaParameters"):
 		with open(zip_path, "rb") as f:
 			zip_bytes = f.read()
 
+		lambda_builder = self._lambda_builder(lambda_params)
+
 		try:
 			self._lambda_client.create_function(
 				FunctionName=lambda_params.function_name,
-				Runtime=lambda_params.runtime,
+				Runtime=lambda_builder.target_runtime(lambda_params.runtime),
 				Role=role,
-				Handler=lambda_params.handler,
+				Handler=lambda_builder.target_handler(lambda_params.handler),
 				Code={"ZipFile": zip_bytes},
 				Environment={"Variables": lambda_params.filtered_env_vars},
 				MemorySize=lambda_params.memory_size,
 				Timeout=lambda_params.timeout_secs,
+				Architectures=[str(lambda_params.arch)],
+				**(
+					{"SnapStart": _snap_start_config(lambda_params)}
+					if lambda_params.snap_start
+					else {}
+				),
 			)
 			logger.info(f"Created Lambda function '{lambda_params.function_name}'")
 		except self._lambda_client.exceptions.ResourceConflictException:
 			logger.info(f"Lambda function '{lambda_params.function_name}' already exists")
 
-	def _update_lambda_code(self, zip_path: str, function_name: str):
+	def _update_lambda_code(
+		self, zip_path: str, function_name: str, wait: bool = True
+	) -> Optional[Future]:
 		"""Updates the code for an existing Lambda function using the provided zip file."""
 		logger.info(f"Updating Lambda function '{function_name}'")
 
@@ -169,11 +465,13 @@ class LambdaUtil:
 				ZipFile=zip_bytes,
 			)
 
-			logger.info(f"Waiting for Lambda update for '{function_name}'")
-			waiter = self._lambda_client.get_waiter("function_updated")
-			waiter.wait(FunctionName=function_name, WaiterConfig={"Delay": 5, "MaxAttempts": 12})
+			if not wait:
+				return self.wait_for_function_updated_async(function_name)
+
+			self.wait_for_function_updated(function_name)
 
 			logger.info(f"Updated Lambda function '{function_name}'")
+			return None
 
 		except self._lambda_client.exceptions.ResourceNotFoundException:
 			logger.error(f"Lambda function '{function_name}' not found")
@@ -182,6 +480,27 @@ class LambdaUtil:
 			logger.error(f"Failed to update Lambda function '{function_name}': {e}")
 			raise
 
+	def _executor(self) -> ThreadPoolExecutor:
+		with self._wait_executor_lock:
+			if self._wait_executor is None:
+				self._wait_executor = ThreadPoolExecutor(
+					max_workers=16, thread_name_prefix="infra-lib-lambda-wait"
+				)
+			return self._wait_executor
+
+	async def add_apigateway_permissions_async(
+		self, function_names: Iterable[str], statement_id: str = "apigateway-access"
+	):
+		"""Grant API Gateway invoke permission on many functions concurrently."""
+		await asyncio.gather(
+			*(
+				self._async_client_factory.run(
+					self._add_lambda_permission_for_apigateway, function_name, statement_id
+				)
+				for function_name in function_names
+			)
+		)
+
 	def _add_lambda_permission_for_apigateway(self, function_name: str, statement_id: str):
 		try:
 			self._lambda_client.add_permission(
@@ -198,31 +517,43 @@ class LambdaUtil:
 
 	def _log_lambda_paths_from_apigateway(self, lambda_name: str, api_id: str):
 		"""
-		Checks the API Gateway JSON for any paths integrated with the given Lambda,
-		and logs the URL for each path.
+		Logs the URL of every API Gateway route integrated with the given Lambda,
+		using the route index shared by all deploys of the current config file.
 		"""
-		gateway_util = APIGatewayUtil(
-			creds=self.creds,
-			aws_config_dir=self.config_dir,
-			environment=self.environment,
-			client_factory=self._client_factory,
-		)
-		gateway_content = gateway_util.gateway_config_file()
-
-		paths = gateway_content.get("paths", {})
-		for resource_path, methods in paths.items():
-			for method_name, method_def in methods.items():
-				integration = method_def.get("x-amazon-apigateway-integration", {})
-				uri = integration.get("uri", "")
-				if lambda_name in uri:
-					logger.info(
-						f"Mapped Lambda '{lambda_name}' to {method_name.upper()} {resource_path}"
-					)
-					logger.info(
-						f"API endpoint: {gateway_util.build_url(api_id=api_id, resource_path=resource_path)}"
-					)
-					return
-		logger.info(f"No API Gateway integration found for Lambda '{lambda_name}'")
+		routes = self._gateway_util.route_index().routes_for(lambda_name)
+		for route in routes:
+			logger.info(f"Mapped Lambda '{lambda_name}' to {route.method} {route.path}")
+			logger.info(
+				f"API endpoint: {self._gateway_util.build_url(api_id=api_id, resource_path=route.path)}"
+			)
+		if not routes:
+			logger.info(f"No API Gateway integration found for Lambda '{lambda_name}'")
+
+
+def join_function_updates(futures: Dict[str, Future]) -> Dict[str, Dict[str, Any]]:
+	"""Collects the results of `wait_for_function_updated_async` futures keyed by function name."""
+	results: Dict[str, Dict[str, Any]] = {}
+	errors: List[BaseException] = []
+
+	for name, future in futures.items():
+		try:
+			results[name] = future.result()
+		except Exception as e:
+			logger.error(f"Lambda function '{name}' did not finish updating: {e}")
+			errors.append(e)
+
+	if errors:
+		raise errors[0]
+	return results
+
+
+def _snap_start_config(lambda_params: "AWSLambdaParameters") -> Dict[str, str]:
+	return {"ApplyOn": "PublishedVersions" if lambda_params.snap_start else "None"}
+
+
+def _code_sha256(zip_bytes: bytes) -> str:
+	"""Hash a package the way Lambda reports `CodeSha256` (base64 of the SHA-256 digest)."""
+	return base64.b64encode(hashlib.sha256(zip_bytes).digest()).decode("ascii")
 
 
 @dataclass
@@ -246,10 +577,27 @@ class AWSLambdaParameters:
 		]
 	)
 	custom_lambda_builder: BaseLambdaZipBuilder = None
+	# Gitignore-style patterns added after the project's `.lambdaignore` rules.
+	exclude_patterns: List[str] = field(default_factory=list)
+	reserved_concurrency: Optional[int] = None
+	# Provisioned concurrency and SnapStart apply to the version published behind `alias_name`.
+	provisioned_concurrency: Optional[int] = None
+	snap_start: bool = False
+	alias_name: str = "live"
 
 	def __post_init__(self, env_vars: Dict[str, str]):
+		if self.snap_start and self.provisioned_concurrency is not None:
+			raise ValueError(
+				f"Lambda '{self.function_name}': SnapStart cannot be combined with "
+				"provisioned concurrency on the same version"
+			)
 		self._filtered_env_vars = {k: v for k, v in env_vars.items() if k in self.allowed_env_vars}
 
 	@property
 	def filtered_env_vars(self) -> Dict[str, str]:
 		return self._filtered_env_vars
+
+	@property
+	def publishes_versions(self) -> bool:
+		"""SnapStart and provisioned concurrency only apply to published versions."""
+		return self.snap_start or self.provisioned_concurrency is not None
@@ -1,4 +1,15 @@
 from .builder_by_runtime import DEFAULT_BUILDER_BY_RUNTIME
 from .base_lambda_zip_builder import BaseLambdaZipBuilder
+from .dotnet_lambda_zip_builder import DotnetPublishProfile, DotnetZipBuilder
+from .lambda_ignore import LambdaIgnoreRules
+from .python_lambda_zip_builder import PythonPackagePolicy, PythonZipBuilder
 
-__all__ = ["DEFAULT_BUILDER_BY_RUNTIME", "BaseLambdaZipBuilder"]
+__all__ = [
+	"DEFAULT_BUILDER_BY_RUNTIME",
+	"BaseLambdaZipBuilder",
+	"DotnetPublishProfile",
+	"DotnetZipBuilder",
+	"LambdaIgnoreRules",
+	"PythonPackagePolicy",
+	"PythonZipBuilder",
+]
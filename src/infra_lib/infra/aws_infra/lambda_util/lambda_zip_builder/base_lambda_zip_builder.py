@@ -1,14 +1,40 @@
 from abc import ABC, abstractmethod
 import logging
+import os
 from pathlib import Path
+import shutil
+import stat
+from typing import TYPE_CHECKING, Dict, Mapping, Optional
 import zipfile
 
+from mypy_boto3_lambda.literals import RuntimeType
+
 from ..arch_enum import AWSLambdaArchitecture
+from .lambda_ignore import LambdaIgnoreRules
+
+if TYPE_CHECKING:
+	from ..lambda_util import AWSLambdaParameters
 
 logger = logging.getLogger(__name__)
 
+# Earliest timestamp a zip entry can hold; used for every entry so builds are reproducible.
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+COPY_BUFFER_SIZE = 1024 * 1024
+
 
 class BaseLambdaZipBuilder(ABC):
+	# Whether `LambdaUtil` wipes `build_dir` before calling `build`. Incremental builders
+	# keep it and sync their output into it.
+	clean_build_dir: bool = True
+	# Environment build subprocesses run with. `LambdaUtil` sets it to the context's
+	# `environ`, so isolated contexts don't build against the global process environment.
+	environ: Optional[Mapping[str, str]] = None
+
+	@classmethod
+	def from_lambda_params(cls, lambda_params: "AWSLambdaParameters") -> "BaseLambdaZipBuilder":
+		"""Creates the default builder for `lambda_params` when no custom builder is given."""
+		return cls()
+
 	@abstractmethod
 	def build(
 		self, project_root: Path, build_dir: Path, output_dir: Path, arch: AWSLambdaArchitecture
@@ -19,9 +45,51 @@ class BaseLambdaZipBuilder(ABC):
 		"""
 		pass
 
-	def _zip_folder(self, project_root: Path, build_dir: Path, output_dir: Path) -> Path:
+	def target_runtime(self, runtime: RuntimeType) -> RuntimeType:
+		"""Runtime the built package runs on. Builders producing custom-runtime output override this."""
+		return runtime
+
+	def target_handler(self, handler: str) -> str:
+		"""Handler the built package is invoked with."""
+		return handler
+
+	def _command_env(self, **overrides: str) -> Optional[Dict[str, str]]:
+		"""`env_vars` for `run_command`: `environ` (or the process environment) plus `overrides`."""
+		if self.environ is None and not overrides:
+			return None
+		return {**(os.environ if self.environ is None else self.environ), **overrides}
+
+	def _zip_folder(
+		self,
+		project_root: Path,
+		build_dir: Path,
+		output_dir: Path,
+		exclude: Optional[LambdaIgnoreRules] = None,
+	) -> Path:
+		"""Zip `build_dir` reproducibly.
+
+		Entries are written in sorted order with a fixed timestamp and normalized
+		permissions, so unchanged sources produce the same zip bytes and `CodeSha256`
+		comparisons can skip redundant code uploads.
+		"""
 		zip_path = output_dir / f"{project_root.name}.zip"
 		with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zipf:
-			for file_path in build_dir.rglob("*"):
-				zipf.write(file_path, arcname=file_path.relative_to(build_dir))
+			for file_path in sorted(build_dir.rglob("*")):
+				arcname = file_path.relative_to(build_dir).as_posix()
+				is_dir = file_path.is_dir()
+				if exclude is not None and exclude.is_excluded(arcname, is_dir=is_dir):
+					continue
+
+				if is_dir:
+					info = zipfile.ZipInfo(f"{arcname}/", date_time=ZIP_DATE_TIME)
+					info.external_attr = (stat.S_IFDIR | 0o755) << 16 | 0x10
+					zipf.writestr(info, b"")
+				else:
+					# Keep the executable bit, e.g. for custom runtime `bootstrap` files.
+					executable = file_path.stat().st_mode & 0o111
+					info = zipfile.ZipInfo(arcname, date_time=ZIP_DATE_TIME)
+					info.external_attr = (stat.S_IFREG | (0o755 if executable else 0o644)) << 16
+					info.compress_type = zipfile.ZIP_DEFLATED
+					with open(file_path, "rb") as src, zipf.open(info, "w") as dst:
+						shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
 		return zip_path
@@ -1,20 +1,119 @@
+import hashlib
+import logging
 from pathlib import Path
+import shutil
+from typing import List, Optional, Set, Union
+from xml.etree import ElementTree
+
+from mypy_boto3_lambda.literals import RuntimeType
 
 from .....utils import run_command
-from .base_lambda_zip_builder import BaseLambdaZipBuilder
+from ....enums import StrEnum
+from .base_lambda_zip_builder import COPY_BUFFER_SIZE, BaseLambdaZipBuilder
+from .file_stager import FileStager
 from ..arch_enum import AWSLambdaArchitecture
 
+logger = logging.getLogger(__name__)
+
+CUSTOM_RUNTIME: RuntimeType = "provided.al2023"
+CUSTOM_RUNTIME_HANDLER = "bootstrap"
+
+# Lock file restored next to each project of the graph.
+PROJECT_LOCK_FILE = "packages.lock.json"
+
+# Files MSBuild and NuGet pick up from a project's directory or any of its ancestors.
+RESTORE_ANCESTOR_FILES = (
+	"Directory.Build.props",
+	"Directory.Build.targets",
+	"Directory.Packages.props",
+	"NuGet.config",
+	"nuget.config",
+	"global.json",
+)
+
+DOTNET_RUNTIME_IDENTIFIERS = {
+	AWSLambdaArchitecture.x86_64: "linux-x64",
+	AWSLambdaArchitecture.arm64: "linux-arm64",
+}
+
+
+class DotnetPublishProfile(StrEnum):
+	"""
+	`framework` and `ready_to_run` run on the managed `dotnet*` runtime.
+	`self_contained_trimmed` and `native_aot` run as `bootstrap` on `provided.al2023`;
+	Native AOT must be built on Linux with the target architecture.
+	"""
+
+	framework = "framework"
+	ready_to_run = "ready_to_run"
+	self_contained_trimmed = "self_contained_trimmed"
+	native_aot = "native_aot"
+
+	@property
+	def is_custom_runtime(self) -> bool:
+		return self in (
+			DotnetPublishProfile.self_contained_trimmed,
+			DotnetPublishProfile.native_aot,
+		)
+
 
 class DotnetZipBuilder(BaseLambdaZipBuilder):
+	"""
+	Publishes a .NET project incrementally.
+
+	NuGet packages are cached under `cache_dir` (default `<output_dir>/cache/dotnet`) and
+	`obj/`/`bin/` stay in the project, so only changed sources are recompiled. Restore is
+	skipped with `--no-restore` while the restore inputs of the whole project graph are
+	unchanged.
+	Output is published into a fresh staging directory and only changed files are copied
+	into `build_dir`.
+	"""
+
+	clean_build_dir = False
+
+	publish_profile: DotnetPublishProfile
+	project_file: Optional[Path]
+	cache_dir: Optional[Path]
+
+	def __init__(
+		self,
+		publish_profile: DotnetPublishProfile = DotnetPublishProfile.framework,
+		project_file: Optional[Union[str, Path]] = None,
+		cache_dir: Optional[Path] = None,
+	):
+		self.publish_profile = DotnetPublishProfile(publish_profile)
+		self.project_file = Path(project_file) if project_file is not None else None
+		self.cache_dir = cache_dir
+
+	def target_runtime(self, runtime: RuntimeType) -> RuntimeType:
+		return CUSTOM_RUNTIME if self.publish_profile.is_custom_runtime else runtime
+
+	def target_handler(self, handler: str) -> str:
+		return CUSTOM_RUNTIME_HANDLER if self.publish_profile.is_custom_runtime else handler
+
 	def build(
 		self, project_root: Path, build_dir: Path, output_dir: Path, arch: AWSLambdaArchitecture
 	) -> Path:
-		project_files = list(project_root.glob("*.csproj"))
-		if not project_files:
-			raise FileNotFoundError(f"No .csproj found in {project_root}")
-		project_file = project_files[0]
+		project_file = self._resolve_project_file(project_root)
 
 		output_dir.mkdir(parents=True, exist_ok=True)
+		cache_dir = self.cache_dir or output_dir / "cache" / "dotnet"
+		staging_dir = cache_dir / "publish" / project_root.name
+		stamp_file = cache_dir / "restore" / f"{project_root.name}.sha256"
+
+		if staging_dir.exists():
+			shutil.rmtree(staging_dir)
+		staging_dir.mkdir(parents=True)
+
+		publish_args = self._publish_args(arch)
+		restore_hash = self._restore_hash(project_file, publish_args)
+		assets_file = project_file.parent / "obj" / "project.assets.json"
+		can_skip_restore = (
+			assets_file.exists()
+			and stamp_file.exists()
+			and stamp_file.read_text().strip() == restore_hash
+		)
+
 		build_cmd = [
 			"dotnet",
 			"publish",
@@ -22,10 +121,180 @@ class DotnetZipBuilder(BaseLambdaZipBuilder):
 			"-c",
 			"Release",
 			"-o",
-			str(build_dir),
+			str(staging_dir),
+			*publish_args,
 		]
+		if can_skip_restore:
+			build_cmd.append("--no-restore")
+			logger.info(f"Restore inputs of '{project_file.name}' unchanged, skipping restore")
+
+		run_command(
+			" ".join(build_cmd),
+			env_vars=self._command_env(NUGET_PACKAGES=str(cache_dir / "nuget-packages")),
+		)
+
+		stamp_file.parent.mkdir(parents=True, exist_ok=True)
+		stamp_file.write_text(restore_hash)
+
+		if self.publish_profile.is_custom_runtime:
+			self._ensure_bootstrap(project_file, staging_dir)
+
+		_sync_dir(staging_dir, build_dir)
 
-		run_command(" ".join(build_cmd))
 		return self._zip_folder(
 			project_root=project_root, build_dir=build_dir, output_dir=output_dir
 		)
+
+	def _resolve_project_file(self, project_root: Path) -> Path:
+		if self.project_file is not None:
+			project_file = project_root / self.project_file
+			if not project_file.is_file():
+				raise FileNotFoundError(f"Project file '{project_file}' not found")
+			return project_file
+
+		project_files = sorted(project_root.glob("*.csproj"))
+		if not project_files:
+			raise FileNotFoundError(f"No .csproj found in {project_root}")
+		if len(project_files) > 1:
+			raise ValueError(
+				f"Multiple .csproj found in {project_root}: "
+				f"{', '.join(p.name for p in project_files)}. Pass `project_file` to choose one"
+			)
+		return project_files[0]
+
+	@staticmethod
+	def _restore_hash(project_file: Path, publish_args: List[str]) -> str:
+		"""Hash of everything `dotnet restore` depends on, including the RID and publish mode.
+
+		Covers every project reachable through `<ProjectReference>`, their lock files and
+		the props/config files MSBuild and NuGet find by searching upwards from each project.
+		"""
+		digest = hashlib.sha256(" ".join(publish_args).encode("utf-8"))
+		for path in sorted(_restore_inputs(project_file)):
+			if path.is_file():
+				digest.update(str(path).encode("utf-8"))
+				digest.update(path.read_bytes())
+		return digest.hexdigest()
+
+	def _publish_args(self, arch: AWSLambdaArchitecture) -> List[str]:
+		args = ["-r", DOTNET_RUNTIME_IDENTIFIERS[AWSLambdaArchitecture(arch)]]
+
+		if self.publish_profile == DotnetPublishProfile.framework:
+			args += ["--self-contained", "false"]
+		elif self.publish_profile == DotnetPublishProfile.ready_to_run:
+			args += ["--self-contained", "false", "-p:PublishReadyToRun=true"]
+		elif self.publish_profile == DotnetPublishProfile.self_contained_trimmed:
+			args += ["--self-contained", "true", "-p:PublishTrimmed=true"]
+		elif self.publish_profile == DotnetPublishProfile.native_aot:
+			args += ["--self-contained", "true", "-p:PublishAot=true", "-p:StripSymbols=true"]
+
+		return args
+
+	@staticmethod
+	def _ensure_bootstrap(project_file: Path, build_dir: Path):
+		"""
+		Custom runtimes start the `bootstrap` executable. Projects that don't set
+		`<AssemblyName>bootstrap</AssemblyName>` get their app host renamed instead, since
+		passing the assembly name on the command line would also rename referenced projects.
+		"""
+		bootstrap = build_dir / CUSTOM_RUNTIME_HANDLER
+		if bootstrap.exists():
+			return
+
+		executable = build_dir / project_file.stem
+		if not executable.exists():
+			raise FileNotFoundError(
+				f"Neither '{CUSTOM_RUNTIME_HANDLER}' nor '{executable.name}' found in {build_dir}; "
+				"set <AssemblyName>bootstrap</AssemblyName> in the project"
+			)
+		executable.rename(bootstrap)
+
+
+def _restore_inputs(project_file: Path) -> Set[Path]:
+	"""Project files of the `<ProjectReference>` graph rooted at `project_file`, plus the
+	lock and ancestor config files that apply to each of them."""
+	inputs: Set[Path] = set()
+	pending = [project_file.resolve()]
+	visited: Set[Path] = set()
+
+	while pending:
+		project = pending.pop()
+		if project in visited:
+			continue
+		visited.add(project)
+		inputs.add(project)
+		inputs.add(project.parent / PROJECT_LOCK_FILE)
+		for directory in (project.parent, *project.parent.parents):
+			inputs.update(directory / name for name in RESTORE_ANCESTOR_FILES)
+		pending.extend(_project_references(project))
+
+	return inputs
+
+
+def _project_references(project_file: Path) -> List[Path]:
+	"""Resolve the `<ProjectReference Include="...">` paths of a project file.
+
+	References built from MSBuild properties cannot be resolved here and are skipped.
+	"""
+	try:
+		root = ElementTree.parse(project_file).getroot()
+	except (ElementTree.ParseError, OSError) as e:
+		logger.debug(f"Could not read project references of '{project_file}': {e}")
+		return []
+
+	references = []
+	for element in root.iter():
+		# SDK-style projects have no namespace; legacy ones use the MSBuild namespace.
+		if element.tag.rsplit("}", 1)[-1] != "ProjectReference":
+			continue
+		include = element.get("Include", "")
+		if not include or "$(" in include:
+			continue
+		reference = (project_file.parent / include.replace("\\", "/")).resolve()
+		if reference.is_file():
+			references.append(reference)
+	return references
+
+
+def _sync_dir(source_dir: Path, target_dir: Path):
+	"""Make `target_dir` mirror `source_dir`, copying only new or changed files."""
+	target_dir.mkdir(parents=True, exist_ok=True)
+	source_files = {p.relative_to(source_dir) for p in source_dir.rglob("*") if p.is_file()}
+	# The staging dir is recreated on every publish, so linking its files is safe.
+	stager = FileStager()
+	copied = 0
+
+	for target_path in sorted(target_dir.rglob("*"), reverse=True):
+		relative = target_path.relative_to(target_dir)
+		if target_path.is_file() and relative not in source_files:
+			target_path.unlink()
+		elif target_path.is_dir() and not (source_dir / relative).is_dir():
+			shutil.rmtree(target_path)
+
+	for relative in source_files:
+		source_path = source_dir / relative
+		target_path = target_dir / relative
+		if target_path.exists() and _same_content(source_path, target_path):
+			continue
+		target_path.parent.mkdir(parents=True, exist_ok=True)
+		stager.stage(source_path, target_path)
+		copied += 1
+
+	logger.info(f"Synced {copied} of {len(source_files)} published files into '{target_dir}'")
+
+
+def _same_content(first: Path, second: Path) -> bool:
+	"""Compare file contents byte by byte.
+
+	`dotnet publish` can keep a file's size and mtime while changing its content, so
+	stat-based checks (and `filecmp`, which caches by stat signature) are not enough.
+	"""
+	if first.stat().st_size != second.stat().st_size:
+		return False
+	with open(first, "rb") as a, open(second, "rb") as b:
+		while True:
+			chunk = a.read(COPY_BUFFER_SIZE)
+			if chunk != b.read(COPY_BUFFER_SIZE):
+				return False
+			if not chunk:
+				return True
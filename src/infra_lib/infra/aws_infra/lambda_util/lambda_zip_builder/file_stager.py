@@ -0,0 +1,94 @@
+from collections import Counter
+import errno
+import logging
+import os
+from pathlib import Path
+import shutil
+from typing import Union
+
+try:
+	import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+	fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# linux/fs.h: _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+
+# Errors meaning "this filesystem (pair) can't do it", as opposed to a real I/O failure.
+_UNSUPPORTED_ERRNOS = {
+	errno.EXDEV,
+	errno.EPERM,
+	errno.EMLINK,
+	errno.EINVAL,
+	errno.ENOTTY,
+	errno.EOPNOTSUPP,
+	errno.ENOSYS,
+}
+
+PathLike = Union[str, Path]
+
+
+class FileStager:
+	"""
+	A `copy_function` for `shutil.copytree` that stages files without copying their data.
+
+	Each file is reflinked (copy-on-write clone), else hardlinked, else copied. After the
+	first "unsupported" error a method is not tried again, so unsupported filesystems pay
+	for one failed syscall only. Hardlinks share the inode with the source, so staged
+	files must only be read, unlinked or replaced, never modified in place.
+	"""
+
+	def __init__(self, allow_reflinks: bool = True, allow_hardlinks: bool = True):
+		self._reflinks = allow_reflinks and fcntl is not None
+		self._hardlinks = allow_hardlinks
+		self.counts: Counter = Counter()
+
+	def __call__(self, src: PathLike, dst: PathLike) -> str:
+		self.stage(src, dst)
+		return str(dst)
+
+	def stage(self, src: PathLike, dst: PathLike) -> str:
+		"""Stage `src` at `dst`, replacing `dst`. Returns the method used."""
+		if os.path.lexists(dst):
+			os.unlink(dst)
+
+		if self._reflinks:
+			try:
+				_reflink(src, dst)
+				return self._count("reflink")
+			except OSError as e:
+				self._reflinks = self._still_supported(e, dst)
+
+		if self._hardlinks:
+			try:
+				os.link(src, dst, follow_symlinks=True)
+				return self._count("hardlink")
+			except OSError as e:
+				self._hardlinks = self._still_supported(e, dst)
+
+		shutil.copy2(src, dst)
+		return self._count("copy")
+
+	def log_summary(self, target: PathLike):
+		summary = ", ".join(f"{method}: {count}" for method, count in sorted(self.counts.items()))
+		logger.info(f"Staged {sum(self.counts.values())} files into '{target}' ({summary})")
+
+	def _count(self, method: str) -> str:
+		self.counts[method] += 1
+		return method
+
+	@staticmethod
+	def _still_supported(error: OSError, dst: PathLike) -> bool:
+		if os.path.lexists(dst):
+			os.unlink(dst)
+		if error.errno not in _UNSUPPORTED_ERRNOS:
+			raise error
+		return False
+
+
+def _reflink(src: PathLike, dst: PathLike):
+	with open(src, "rb") as src_file, open(dst, "wb") as dst_file:
+		fcntl.ioctl(dst_file.fileno(), FICLONE, src_file.fileno())
+	shutil.copystat(src, dst)
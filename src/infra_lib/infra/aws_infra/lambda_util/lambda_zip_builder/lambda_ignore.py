@@ -0,0 +1,137 @@
+from dataclasses import dataclass
+from pathlib import Path
+import re
+from typing import Iterable, List, Optional, Pattern
+
+LAMBDA_IGNORE_FILE = ".lambdaignore"
+
+# Excluded unless re-included with a `!pattern` rule. `__pycache__` is left to the
+# builders, which compile bytecode for the target runtime after copying.
+DEFAULT_EXCLUDE_PATTERNS = (
+	".git/",
+	".venv/",
+	"venv/",
+	"node_modules/",
+	".pytest_cache/",
+	".mypy_cache/",
+	".ruff_cache/",
+	LAMBDA_IGNORE_FILE,
+)
+
+
+@dataclass(frozen=True)
+class _IgnoreRule:
+	regex: Pattern[str]
+	negated: bool
+	dir_only: bool
+
+
+class LambdaIgnoreRules:
+	"""
+	Gitignore-style exclude rules for Lambda packages.
+
+	Supports comments, `!` negation, trailing `/` for directories, leading `/` or inner
+	`/` to anchor at the root, and `*`, `?`, `[...]` and `**` wildcards. As in git, the
+	last matching rule wins and nothing below an excluded directory can be re-included.
+	"""
+
+	def __init__(self, patterns: Iterable[str] = ()):
+		self._rules: List[_IgnoreRule] = [
+			rule for rule in (_parse_rule(p) for p in patterns) if rule is not None
+		]
+
+	@classmethod
+	def for_project(
+		cls, project_root: Path, extra_patterns: Iterable[str] = ()
+	) -> "LambdaIgnoreRules":
+		"""Defaults, then the project's `.lambdaignore`, then `extra_patterns`."""
+		patterns = list(DEFAULT_EXCLUDE_PATTERNS)
+		ignore_file = project_root / LAMBDA_IGNORE_FILE
+		if ignore_file.is_file():
+			patterns += ignore_file.read_text(encoding="utf-8").splitlines()
+		patterns += list(extra_patterns)
+		return cls(patterns)
+
+	def is_excluded(self, relative_path: str, is_dir: bool = False) -> bool:
+		parts = Path(relative_path).as_posix().split("/")
+		for i in range(1, len(parts) + 1):
+			if self._matches("/".join(parts[:i]), is_dir=is_dir or i < len(parts)):
+				return True
+		return False
+
+	def copytree_ignore(self, root: Path):
+		"""An `ignore` callable for `shutil.copytree` applying the rules relative to `root`."""
+
+		def ignore(directory: str, names: List[str]) -> List[str]:
+			relative_dir = Path(directory).relative_to(root)
+			return [
+				name
+				for name in names
+				if self._matches(
+					(relative_dir / name).as_posix(), is_dir=(Path(directory) / name).is_dir()
+				)
+			]
+
+		return ignore
+
+	def _matches(self, path: str, is_dir: bool) -> bool:
+		excluded = False
+		for rule in self._rules:
+			if rule.dir_only and not is_dir:
+				continue
+			if rule.regex.fullmatch(path):
+				excluded = not rule.negated
+		return excluded
+
+
+def _parse_rule(pattern: str) -> Optional[_IgnoreRule]:
+	pattern = pattern.rstrip("\n").rstrip()
+	if not pattern or pattern.startswith("#"):
+		return None
+
+	negated = pattern.startswith("!")
+	if negated:
+		pattern = pattern[1:]
+	dir_only = pattern.endswith("/")
+	pattern = pattern.rstrip("/")
+	anchored = "/" in pattern
+	pattern = pattern.lstrip("/")
+	if not pattern:
+		return None
+
+	regex = _translate(pattern)
+	if not anchored:
+		regex = f"(?:.*/)?{regex}"
+	return _IgnoreRule(regex=re.compile(regex), negated=negated, dir_only=dir_only)
+
+
+def _translate(pattern: str) -> str:
+	regex = ""
+	i = 0
+	while i < len(pattern):
+		if pattern.startswith("**/", i):
+			regex += "(?:.*/)?"
+			i += 3
+		elif pattern.startswith("/**", i) and i + 3 == len(pattern):
+			regex += "/.*"
+			i += 3
+		elif pattern.startswith("**", i):
+			regex += ".*"
+			i += 2
+		elif pattern[i] == "*":
+			regex += "[^/]*"
+			i += 1
+		elif pattern[i] == "?":
+			regex += "[^/]"
+			i += 1
+		elif pattern[i] == "[" and "]" in pattern[i + 1 :]:
+			end = pattern.index("]", i + 1)
+			body = pattern[i + 1 : end]
+			if body.startswith("!"):
+				body = "^" + body[1:]
+			regex += f"[{body}]"
+			i = end + 1
+		else:
+			regex += re.escape(pattern[i])
+			i += 1
+	return regex
@@ -1,21 +1,206 @@
+import csv
+from dataclasses import dataclass, field
+import logging
 from pathlib import Path
 import shutil
+import sys
+from typing import TYPE_CHECKING, FrozenSet, Iterable, List, Optional, Set
+
 from .....utils import run_command
 from .base_lambda_zip_builder import BaseLambdaZipBuilder
+from .file_stager import FileStager
+from .lambda_ignore import LambdaIgnoreRules
 from ..arch_enum import AWSLambdaArchitecture
 
+if TYPE_CHECKING:
+	from ..lambda_util import AWSLambdaParameters
+
+logger = logging.getLogger(__name__)
+
+# Directory the Lambda runtime extracts the package into.
+LAMBDA_TASK_ROOT = "/var/task"
+
+
+@dataclass(frozen=True)
+class PythonPackagePolicy:
+	"""What the optimization stage of `PythonZipBuilder` compiles and strips.
+
+	Stripping only applies inside installed dependencies, i.e. the top-level paths
+	recorded by a `*.dist-info` directory. The project's own sources are shipped as is.
+	"""
+
+	compile_bytecode: bool = True
+	strip_tests: bool = True
+	strip_docs: bool = True
+	strip_type_stubs: bool = True
+	slim_dist_info: bool = True
+	test_dir_names: FrozenSet[str] = frozenset({"tests", "test"})
+	doc_dir_names: FrozenSet[str] = frozenset({"docs", "doc", "examples"})
+	doc_suffixes: FrozenSet[str] = frozenset({".md", ".rst"})
+	# Install bookkeeping that `importlib.metadata` does not need at runtime.
+	dist_info_files: FrozenSet[str] = field(
+		default_factory=lambda: frozenset({"RECORD", "INSTALLER", "REQUESTED", "direct_url.json"})
+	)
+
 
 class PythonZipBuilder(BaseLambdaZipBuilder):
+	python_version: Optional[str]
+	policy: PythonPackagePolicy
+	exclude_patterns: List[str]
+	allow_hardlinks: bool
+
+	def __init__(
+		self,
+		python_version: Optional[str] = None,
+		policy: Optional[PythonPackagePolicy] = None,
+		exclude_patterns: Iterable[str] = (),
+		allow_hardlinks: bool = True,
+	):
+		self.python_version = python_version
+		self.policy = policy or PythonPackagePolicy()
+		self.exclude_patterns = list(exclude_patterns)
+		self.allow_hardlinks = allow_hardlinks
+
+	@classmethod
+	def from_lambda_params(cls, lambda_params: "AWSLambdaParameters") -> "PythonZipBuilder":
+		return cls(
+			python_version=lambda_params.runtime.removeprefix("python"),
+			exclude_patterns=lambda_params.exclude_patterns,
+		)
+
 	def build(
 		self, project_root: Path, build_dir: Path, output_dir: Path, arch: AWSLambdaArchitecture
 	) -> Path:
 		requirements_path = project_root / "requirements.txt"
+		exclude = LambdaIgnoreRules.for_project(project_root, self.exclude_patterns)
 
-		shutil.copytree(project_root, build_dir, dirs_exist_on_ok=True)
+		# The build only adds, replaces or deletes files in `build_dir`, so sources can be
+		# staged as reflinks or hardlinks instead of full copies.
+		stager = FileStager(allow_hardlinks=self.allow_hardlinks)
+		shutil.copytree(
+			project_root,
+			build_dir,
+			dirs_exist_ok=True,
+			ignore=exclude.copytree_ignore(project_root),
+			copy_function=stager,
+		)
+		stager.log_summary(build_dir)
 
 		if requirements_path.exists():
-			run_command(f"pip install -r {requirements_path} -t {build_dir}")
+			# Bytecode is compiled for the target runtime by the optimization stage.
+			run_command(
+				f"pip install --no-compile -r {requirements_path} -t {build_dir}",
+				env_vars=self._command_env(),
+			)
+
+		self._optimize(build_dir)
 
+		output_dir.mkdir(parents=True, exist_ok=True)
 		return self._zip_folder(
-			project_root=project_root, build_dir=build_dir, output_dir=output_dir
+			project_root=project_root, build_dir=build_dir, output_dir=output_dir, exclude=exclude
 		)
+
+	def _optimize(self, build_dir: Path):
+		size_before = _tree_size(build_dir)
+		# Read before `slim_dist_info` removes the RECORD files listing them.
+		dependency_roots = _installed_top_level_names(build_dir)
+
+		# Bytecode compiled for the local interpreter is ignored by a different runtime version.
+		for pycache in list(build_dir.rglob("__pycache__")):
+			shutil.rmtree(pycache, ignore_errors=True)
+
+		for path in sorted(build_dir.rglob("*"), key=lambda p: len(p.parts)):
+			relative = path.relative_to(build_dir)
+			if relative.parts[0] not in dependency_roots and not relative.parts[0].endswith(
+				".dist-info"
+			):
+				continue
+			if path.exists() and self._should_strip(path):
+				if path.is_dir():
+					shutil.rmtree(path)
+				else:
+					path.unlink()
+
+		if self.policy.compile_bytecode:
+			self._compile_bytecode(build_dir)
+
+		size_after = _tree_size(build_dir)
+		logger.info(
+			f"Optimized Lambda package '{build_dir.name}': {size_before / 1e6:.1f} MB -> "
+			f"{size_after / 1e6:.1f} MB ({(size_before - size_after) / 1e6:.1f} MB saved)"
+		)
+
+	def _should_strip(self, path: Path) -> bool:
+		policy = self.policy
+		if path.is_dir():
+			return (policy.strip_tests and path.name in policy.test_dir_names) or (
+				policy.strip_docs and path.name in policy.doc_dir_names
+			)
+
+		if policy.strip_type_stubs and (path.suffix == ".pyi" or path.name == "py.typed"):
+			return True
+		if policy.slim_dist_info and path.parent.name.endswith(".dist-info"):
+			return path.name in policy.dist_info_files
+		return policy.strip_docs and path.suffix in policy.doc_suffixes
+
+	def _compile_bytecode(self, build_dir: Path):
+		"""
+		Lambda mounts the package read-only, so bytecode that is not shipped is recompiled on
+		every cold start. Hash-based pycs stay valid regardless of the mtimes in the zip,
+		and source paths are recorded relative to the Lambda task root instead of the
+		local build directory, so rebuilding unchanged sources yields identical bytecode.
+
+		Compilation is best-effort: wheels often ship files that do not compile (Python 2
+		modules, invalid test fixtures, templates), and those are shipped as source only.
+		"""
+		interpreter = self._target_interpreter()
+		if interpreter is None:
+			target = f"python{self.python_version}" if self.python_version else "target Python"
+			logger.warning(f"No {target} interpreter found, shipping without bytecode")
+			return
+
+		returncode = run_command(
+			f"{interpreter} -m compileall -q -j 0 --invalidation-mode unchecked-hash "
+			f"-s {build_dir} -p {LAMBDA_TASK_ROOT} {build_dir}",
+			check=False,
+			env_vars=self._command_env(),
+		)
+		if returncode != 0:
+			uncompiled = sorted(
+				str(source.relative_to(build_dir))
+				for source in build_dir.rglob("*.py")
+				if not any((source.parent / "__pycache__").glob(f"{source.stem}.*.pyc"))
+			)
+			logger.warning(
+				f"Shipping {len(uncompiled)} file(s) without bytecode, they failed to "
+				f"compile: {', '.join(uncompiled)}"
+			)
+
+	def _target_interpreter(self) -> Optional[str]:
+		"""Interpreter matching the target runtime, or None when it is unknown or missing."""
+		if self.python_version is None:
+			return None
+		local_version = f"{sys.version_info.major}.{sys.version_info.minor}"
+		if self.python_version == local_version:
+			return sys.executable
+		return shutil.which(f"python{self.python_version}")
+
+
+def _installed_top_level_names(build_dir: Path) -> Set[str]:
+	"""Top-level files and directories installed by the distributions in `build_dir`."""
+	names: Set[str] = set()
+	for dist_info in build_dir.glob("*.dist-info"):
+		record = dist_info / "RECORD"
+		if record.is_file():
+			with open(record, newline="") as f:
+				names.update(Path(row[0]).parts[0] for row in csv.reader(f) if row and row[0])
+		top_level = dist_info / "top_level.txt"
+		if top_level.is_file():
+			names.update(line.strip() for line in top_level.read_text().splitlines())
+	names.discard("")
+	names.discard("..")
+	return names
+
+
+def _tree_size(root: Path) -> int:
+	return sum(p.stat().st_size for p in root.rglob("*") if p.is_file())
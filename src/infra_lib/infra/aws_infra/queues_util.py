@@ -1,11 +1,13 @@
+import asyncio
 import logging
 from dataclasses import dataclass
-from typing import Optional, Iterable
+from typing import Dict, Optional, Iterable
 
 from mypy_boto3_lambda import LambdaClient
 from mypy_boto3_sqs import SQSClient
 
 from .sts_util import STSUtil
+from .async_boto import AsyncBotoClientFactory
 from .boto_client_factory import BotoClientFactory
 from .aws_services_enum import AwsService
 from .creds import CredentialsProvider
@@ -28,9 +30,15 @@ class QueuesUtil:
 	creds: CredentialsProvider
 	_client_factory: BotoClientFactory
 
-	def __init__(self, creds: CredentialsProvider, client_factory: BotoClientFactory):
+	def __init__(
+		self,
+		creds: CredentialsProvider,
+		client_factory: BotoClientFactory,
+		async_client_factory: Optional[AsyncBotoClientFactory] = None,
+	):
 		self.creds = creds
 		self._client_factory = client_factory
+		self._async_client_factory = async_client_factory or AsyncBotoClientFactory(client_factory)
 		self._sts_util = STSUtil(
 			creds=creds,
 			client_factory=client_factory,
@@ -46,16 +54,19 @@ class QueuesUtil:
 
 	def create_queues(self, queues: Iterable[AWSQueueConfig]):
 		for q in queues:
-			self._sqs_client.create_queue(
-				QueueName=q.name,
-				Attributes={
-					"FifoQueue": "true",
-					"ContentBasedDeduplication": "true",
-					"VisibilityTimeout": str(q.visibility_timeout),
-				},
-			)
+			self._sqs_client.create_queue(QueueName=q.name, Attributes=_queue_attributes(q))
 			logger.info(f"Created queue '{q.name}'")
 
+	async def create_queues_async(self, queues: Iterable[AWSQueueConfig]):
+		"""Create `queues` concurrently, bounded by the async client factory."""
+		sqs = self._async_client_factory.client(AwsService.SQS)
+
+		async def create(q: AWSQueueConfig):
+			await sqs.create_queue(QueueName=q.name, Attributes=_queue_attributes(q))
+			logger.info(f"Created queue '{q.name}'")
+
+		await asyncio.gather(*(create(q) for q in queues))
+
 	def attach_lambda(self, lambda_func: AWSLambdaParameters, queue_config: AWSQueueConfig):
 		account_id = self._sts_util.get_account_id()
 		self._lambda_client.create_event_source_mapping(
@@ -68,3 +79,11 @@ class QueuesUtil:
 			),
 		)
 		logger.info(f"Attached queue '{queue_config.name}' to Lambda '{lambda_func.function_name}'")
+
+
+def _queue_attributes(queue: AWSQueueConfig) -> Dict[str, str]:
+	return {
+		"FifoQueue": "true",
+		"ContentBasedDeduplication": "true",
+		"VisibilityTimeout": str(queue.visibility_timeout),
+	}
@@ -0,0 +1,187 @@
+from dataclasses import dataclass, replace
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+# Error codes AWS services use to report that a request was throttled.
+THROTTLING_ERROR_CODES = frozenset(
+	{
+		"Throttling",
+		"ThrottlingException",
+		"ThrottledException",
+		"RequestThrottled",
+		"RequestThrottledException",
+		"TooManyRequestsException",
+		"ProvisionedThroughputExceededException",
+		"RequestLimitExceeded",
+		"BandwidthLimitExceeded",
+		"LimitExceededException",
+		"SlowDown",
+		"PriorRequestNotComplete",
+	}
+)
+
+
+@dataclass(frozen=True)
+class RateLimit:
+	"""Sustained request rate for one service, allowing bursts of up to `burst` requests."""
+
+	rate_per_sec: float
+	burst: int = 1
+
+	def __post_init__(self):
+		if self.rate_per_sec <= 0:
+			raise ValueError("rate_per_sec must be positive")
+		if self.burst < 1:
+			raise ValueError("burst must be at least 1")
+
+
+class TokenBucket:
+	"""Thread-safe token bucket.
+
+	A caller that finds the bucket empty reserves the next token and sleeps outside
+	the lock, so concurrent callers queue up at the sustained rate instead of waking
+	together and bursting.
+	"""
+
+	def __init__(
+		self,
+		limit: RateLimit,
+		clock: Callable[[], float] = time.monotonic,
+		sleep: Callable[[float], None] = time.sleep,
+	):
+		self.limit = limit
+		self._clock = clock
+		self._sleep = sleep
+		self._tokens = float(limit.burst)
+		self._updated_at = clock()
+		self._lock = threading.Lock()
+
+	def acquire(self) -> float:
+		"""Take one token, waiting for it if needed. Returns the seconds waited."""
+		with self._lock:
+			now = self._clock()
+			self._tokens = min(
+				self.limit.burst, self._tokens + (now - self._updated_at) * self.limit.rate_per_sec
+			)
+			self._updated_at = now
+			self._tokens -= 1
+			wait_secs = -self._tokens / self.limit.rate_per_sec if self._tokens < 0 else 0.0
+
+		if wait_secs:
+			self._sleep(wait_secs)
+		return wait_secs
+
+
+@dataclass
+class ServiceCallStats:
+	throttled: int = 0
+	retries: int = 0
+	retry_sleep_secs: float = 0.0
+	rate_limited_secs: float = 0.0
+
+	def __sub__(self, other: "ServiceCallStats") -> "ServiceCallStats":
+		return ServiceCallStats(
+			throttled=self.throttled - other.throttled,
+			retries=self.retries - other.retries,
+			retry_sleep_secs=self.retry_sleep_secs - other.retry_sleep_secs,
+			rate_limited_secs=self.rate_limited_secs - other.rate_limited_secs,
+		)
+
+	def __bool__(self) -> bool:
+		return bool(self.throttled or self.retries or self.rate_limited_secs)
+
+
+class AwsCallTelemetry:
+	"""Per-service counts of throttled responses, retries and time spent waiting."""
+
+	def __init__(self):
+		self._stats: Dict[str, ServiceCallStats] = {}
+		self._lock = threading.Lock()
+
+	def record_throttle(self, service: str):
+		with self._lock:
+			self._service(service).throttled += 1
+
+	def record_retry(self, service: str, sleep_secs: float):
+		with self._lock:
+			stats = self._service(service)
+			stats.retries += 1
+			stats.retry_sleep_secs += sleep_secs
+
+	def record_rate_limit_wait(self, service: str, wait_secs: float):
+		with self._lock:
+			self._service(service).rate_limited_secs += wait_secs
+
+	def snapshot(self) -> Dict[str, ServiceCallStats]:
+		with self._lock:
+			return {service: replace(stats) for service, stats in self._stats.items()}
+
+	def since(self, baseline: Dict[str, ServiceCallStats]) -> Dict[str, ServiceCallStats]:
+		"""Stats accumulated after `baseline` was taken, omitting services without activity."""
+		deltas = {
+			service: stats - baseline.get(service, ServiceCallStats())
+			for service, stats in self.snapshot().items()
+		}
+		return {service: stats for service, stats in deltas.items() if stats}
+
+	def _service(self, service: str) -> ServiceCallStats:
+		if service not in self._stats:
+			self._stats[service] = ServiceCallStats()
+		return self._stats[service]
+
+
+# Process-wide telemetry shared by every client factory unless one is given explicitly.
+aws_call_telemetry = AwsCallTelemetry()
+
+
+class ClientInstrumentation:
+	"""Botocore event handlers applying a client-side rate limit and recording telemetry.
+
+	Handlers run for every HTTP attempt, so retries consume tokens too. Retry sleeps are
+	measured on the calling thread, from the retry decision to the next attempt.
+	"""
+
+	def __init__(
+		self,
+		service: str,
+		bucket: Optional[TokenBucket],
+		telemetry: AwsCallTelemetry,
+		clock: Callable[[], float] = time.monotonic,
+	):
+		self.service = service
+		self._bucket = bucket
+		self._telemetry = telemetry
+		self._clock = clock
+		self._local = threading.local()
+
+	def register(self, client):
+		# Every client owns a copy of the session's event hooks, so unqualified event
+		# names only apply to this client.
+		events = client.meta.events
+		events.register("request-created", self.on_request_created)
+		events.register("before-send", self.on_before_send)
+		events.register("needs-retry", self.on_needs_retry)
+
+	def on_request_created(self, request, **kwargs):
+		retry_decided_at = getattr(self._local, "retry_decided_at", None)
+		self._local.retry_decided_at = None
+		attempt = getattr(request, "context", {}).get("retries", {}).get("attempt", 1)
+		if attempt > 1 and retry_decided_at is not None:
+			self._telemetry.record_retry(self.service, self._clock() - retry_decided_at)
+
+	def on_before_send(self, request, **kwargs):
+		if self._bucket is None:
+			return None
+		waited = self._bucket.acquire()
+		if waited:
+			self._telemetry.record_rate_limit_wait(self.service, waited)
+		return None
+
+	def on_needs_retry(self, response=None, **kwargs):
+		if response is not None:
+			error_code = response[1].get("Error", {}).get("Code")
+			if error_code in THROTTLING_ERROR_CODES:
+				self._telemetry.record_throttle(self.service)
+		self._local.retry_decided_at = self._clock()
+		return None
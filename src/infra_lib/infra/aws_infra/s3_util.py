@@ -1,13 +1,71 @@
+import io
 import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Set, Union
+
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
 from mypy_boto3_s3 import S3ServiceResource
 
 from .boto_client_factory import BotoClientFactory
 from .aws_services_enum import AwsService
 from .creds import CredentialsProvider
+from ...exceptions import InfraError
 
 logger = logging.getLogger(__name__)
 
+BytesLike = Union[bytes, bytearray, memoryview]
+StreamSource = Union[BinaryIO, BytesLike, Iterable[BytesLike]]
+
+# S3 rejects multipart parts smaller than 5 MiB (except the last one).
+MIN_MULTIPART_CHUNK_SIZE = 5 * 1024 * 1024
+DEFAULT_MULTIPART_CHUNK_SIZE = 8 * 1024 * 1024
+DEFAULT_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+# Upper bound of keys accepted by a single DeleteObjects request.
+DELETE_OBJECTS_BATCH_SIZE = 1000
+
+
+class _ChunkReader(io.RawIOBase):
+	"""Read-only, non-seekable file object over an iterable of byte chunks.
+
+	Chunks are consumed lazily and sliced through memoryviews, so at most one
+	source chunk is referenced at a time and nothing is joined up front.
+	"""
+
+	def __init__(self, chunks: Iterable[BytesLike]):
+		self._chunks = iter(chunks)
+		self._current = memoryview(b"")
+
+	def readable(self) -> bool:
+		return True
+
+	def readinto(self, buffer) -> int:
+		while not self._current:
+			try:
+				self._current = memoryview(next(self._chunks)).cast("B")
+			except StopIteration:
+				return 0
+
+		size = min(len(buffer), len(self._current))
+		buffer[:size] = self._current[:size]
+		self._current = self._current[size:]
+		return size
+
+	def read(self, size: int = -1) -> bytes:
+		# Multipart parts must be full-sized, so never return a short read before EOF.
+		if size is None or size < 0:
+			return self.readall()
+
+		buffer = bytearray(size)
+		view = memoryview(buffer)
+		filled = 0
+		while filled < size:
+			read = self.readinto(view[filled:])
+			if not read:
+				break
+			filled += read
+		return bytes(view[:filled])
+
 
 class S3Util:
 	"""Utility class for AWS S3 operations like bucket creation and file upload."""
@@ -57,3 +115,185 @@ class S3Util:
 		except ClientError as e:
 			logger.error(f"Failed to upload file '{file_path}' to '{bucket_name}/{key}': {e}")
 			raise
+
+	def upload_stream(
+		self,
+		bucket_name: str,
+		key: str,
+		source: StreamSource,
+		chunk_size: int = DEFAULT_MULTIPART_CHUNK_SIZE,
+		max_concurrency: int = 4,
+	) -> None:
+		"""Upload a file-like object, bytes-like buffer or iterable of byte chunks.
+
+		Payloads larger than `chunk_size` are sent as a multipart upload. At most
+		`max_concurrency` parts are buffered in memory at once, so generated payloads
+		never have to be fully materialized or written to disk first.
+		"""
+		if chunk_size < MIN_MULTIPART_CHUNK_SIZE:
+			raise ValueError(
+				f"chunk_size must be at least {MIN_MULTIPART_CHUNK_SIZE} bytes, got {chunk_size}"
+			)
+
+		config = TransferConfig(
+			multipart_threshold=chunk_size,
+			multipart_chunksize=chunk_size,
+			max_concurrency=max_concurrency,
+		)
+		config.max_in_memory_upload_chunks = max_concurrency
+
+		try:
+			self._s3_resource.meta.client.upload_fileobj(
+				Fileobj=self._as_fileobj(source), Bucket=bucket_name, Key=key, Config=config
+			)
+			logger.info(f"Uploaded stream to '{bucket_name}/{key}'")
+		except ClientError as e:
+			logger.error(f"Failed to upload stream to '{bucket_name}/{key}': {e}")
+			raise
+
+	def upload_bytes(
+		self,
+		bucket_name: str,
+		key: str,
+		data: BytesLike,
+		chunk_size: int = DEFAULT_MULTIPART_CHUNK_SIZE,
+		max_concurrency: int = 4,
+	) -> None:
+		"""Upload an in-memory buffer (e.g. a Lambda zip built in memory) without copying it."""
+		self.upload_stream(
+			bucket_name=bucket_name,
+			key=key,
+			source=data,
+			chunk_size=chunk_size,
+			max_concurrency=max_concurrency,
+		)
+
+	def download_stream(
+		self, bucket_name: str, key: str, chunk_size: int = DEFAULT_DOWNLOAD_CHUNK_SIZE
+	) -> Iterator[bytes]:
+		"""Yield the object's content in chunks of at most `chunk_size` bytes."""
+		try:
+			response = self._s3_resource.meta.client.get_object(Bucket=bucket_name, Key=key)
+		except ClientError as e:
+			logger.error(f"Failed to download '{bucket_name}/{key}': {e}")
+			raise
+
+		body = response["Body"]
+		try:
+			yield from body.iter_chunks(chunk_size=chunk_size)
+		finally:
+			body.close()
+
+	def empty_bucket(
+		self,
+		bucket_name: str,
+		max_workers: int = 8,
+		on_progress: Optional[Callable[[int], None]] = None,
+	) -> int:
+		"""Delete every object, version and delete marker in a bucket.
+
+		Keys are paged lazily and removed in `DeleteObjects` batches of up to 1000 keys
+		across `max_workers` threads. `on_progress` receives the running total of deleted
+		keys after each batch.
+
+		Returns: The number of deleted keys.
+		"""
+		client = self._s3_resource.meta.client
+		deleted = 0
+		pending: Set[Future] = set()
+
+		def collect(done: Set[Future]):
+			nonlocal deleted
+			for future in done:
+				deleted += future.result()
+				if on_progress is not None:
+					on_progress(deleted)
+
+		with ThreadPoolExecutor(max_workers=max_workers) as executor:
+			for batch in self._iter_delete_batches(bucket_name):
+				# Keep paging ahead of the workers without queueing the whole bucket.
+				if len(pending) >= max_workers * 2:
+					done, pending = wait(pending, return_when=FIRST_COMPLETED)
+					collect(done)
+				pending.add(executor.submit(self._delete_batch, client, bucket_name, batch))
+
+			collect(set(pending))
+
+		logger.info(f"Deleted {deleted} objects from bucket '{bucket_name}'")
+		return deleted
+
+	def delete_bucket(
+		self,
+		bucket_name: str,
+		max_workers: int = 8,
+		on_progress: Optional[Callable[[int], None]] = None,
+	) -> None:
+		"""Empty and delete a bucket. Missing buckets are skipped."""
+		client = self._s3_resource.meta.client
+
+		try:
+			client.head_bucket(Bucket=bucket_name)
+		except ClientError as e:
+			if int(e.response["Error"]["Code"]) == 404:
+				logger.info(f"Bucket '{bucket_name}' does not exist")
+				return
+			logger.error(f"Failed to check bucket '{bucket_name}': {e}")
+			raise
+
+		self.empty_bucket(bucket_name, max_workers=max_workers, on_progress=on_progress)
+
+		try:
+			client.delete_bucket(Bucket=bucket_name)
+			logger.info(f"Deleted bucket '{bucket_name}'")
+		except ClientError as e:
+			logger.error(f"Failed to delete bucket '{bucket_name}': {e}")
+			raise
+
+	def _iter_delete_batches(self, bucket_name: str) -> Iterator[List[Dict[str, str]]]:
+		client = self._s3_resource.meta.client
+		versioning = client.get_bucket_versioning(Bucket=bucket_name).get("Status")
+
+		if versioning in ("Enabled", "Suspended"):
+			pages = client.get_paginator("list_object_versions").paginate(Bucket=bucket_name)
+			objects = (
+				{"Key": obj["Key"], "VersionId": obj["VersionId"]}
+				for page in pages
+				for obj in [*page.get("Versions", []), *page.get("DeleteMarkers", [])]
+			)
+		else:
+			pages = client.get_paginator("list_objects_v2").paginate(Bucket=bucket_name)
+			objects = ({"Key": obj["Key"]} for page in pages for obj in page.get("Contents", []))
+
+		batch: List[Dict[str, str]] = []
+		for obj in objects:
+			batch.append(obj)
+			if len(batch) == DELETE_OBJECTS_BATCH_SIZE:
+				yield batch
+				batch = []
+		if batch:
+			yield batch
+
+	@staticmethod
+	def _delete_batch(client, bucket_name: str, batch: List[Dict[str, str]]) -> int:
+		response = client.delete_objects(
+			Bucket=bucket_name, Delete={"Objects": batch, "Quiet": True}
+		)
+		errors = response.get("Errors", [])
+		if errors:
+			first = errors[0]
+			raise InfraError(
+				f"Failed to delete {len(errors)} objects from bucket '{bucket_name}': "
+				f"{first.get('Key')}: {first.get('Code')} {first.get('Message')}"
+			)
+		return len(batch)
+
+	@staticmethod
+	def _as_fileobj(source: StreamSource) -> BinaryIO:
+		if hasattr(source, "read"):
+			return source
+		if isinstance(source, bytes):
+			# BytesIO shares the immutable buffer instead of copying it.
+			return io.BytesIO(source)
+		if isinstance(source, (bytearray, memoryview)):
+			return _ChunkReader([source])
+		return _ChunkReader(source)
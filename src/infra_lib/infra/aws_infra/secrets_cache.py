@@ -0,0 +1,175 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Union
+
+from mypy_boto3_secretsmanager import SecretsManagerClient
+
+from ...exceptions import InfraError
+
+logger = logging.getLogger(__name__)
+
+SecretValue = Union[str, bytes]
+
+# Upper bound of secret ids accepted by a single BatchGetSecretValue request.
+BATCH_GET_SECRET_VALUE_SIZE = 20
+
+
+@dataclass
+class _CacheEntry:
+	value: SecretValue
+	expires_at: float
+
+
+class SecretsCache:
+	"""Process-local LRU cache of secret values with a per-entry TTL.
+
+	Lookups of fresh entries are a dict lookup under a lock. Misses are fetched with
+	`GetSecretValue`, or `BatchGetSecretValue` for batches. When `refresh_interval_secs`
+	is set, a daemon thread re-fetches cached entries in the background so hot callers
+	never block on an expired entry.
+	"""
+
+	def __init__(
+		self,
+		client_provider: Callable[[], SecretsManagerClient],
+		ttl_secs: float = 300,
+		max_entries: int = 256,
+		refresh_interval_secs: Optional[float] = None,
+		clock: Callable[[], float] = time.monotonic,
+	):
+		self._client_provider = client_provider
+		self.ttl_secs = ttl_secs
+		self.max_entries = max_entries
+		self._clock = clock
+		self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+		self._lock = threading.Lock()
+		self._stop_refresh = threading.Event()
+		self._refresh_thread: Optional[threading.Thread] = None
+
+		if refresh_interval_secs is not None:
+			self.start_background_refresh(refresh_interval_secs)
+
+	def get(self, name: str) -> SecretValue:
+		value = self._get_fresh(name)
+		if value is not None:
+			return value
+
+		response = self._client_provider().get_secret_value(SecretId=name)
+		value = _secret_value(response)
+		self._store({name: value})
+		return value
+
+	def get_many(self, names: Iterable[str]) -> Dict[str, SecretValue]:
+		names = list(dict.fromkeys(names))
+		values: Dict[str, SecretValue] = {}
+		missing: List[str] = []
+
+		for name in names:
+			value = self._get_fresh(name)
+			if value is None:
+				missing.append(name)
+			else:
+				values[name] = value
+
+		if missing:
+			fetched = self._fetch_batch(missing)
+			self._store(fetched)
+			values.update(fetched)
+
+		return {name: values[name] for name in names}
+
+	def invalidate(self, name: Optional[str] = None):
+		"""Drop one entry, or every entry when `name` is omitted."""
+		with self._lock:
+			if name is None:
+				self._entries.clear()
+			else:
+				self._entries.pop(name, None)
+
+	def start_background_refresh(self, interval_secs: float):
+		if self._refresh_thread is not None:
+			return
+
+		self._stop_refresh.clear()
+		self._refresh_thread = threading.Thread(
+			target=self._refresh_loop,
+			args=(interval_secs,),
+			name="infra-lib-secrets-refresh",
+			daemon=True,
+		)
+		self._refresh_thread.start()
+
+	def stop_background_refresh(self):
+		if self._refresh_thread is None:
+			return
+
+		self._stop_refresh.set()
+		self._refresh_thread.join()
+		self._refresh_thread = None
+
+	def refresh(self):
+		"""Re-fetch every cached entry."""
+		with self._lock:
+			names = list(self._entries)
+		if names:
+			self._store(self._fetch_batch(names))
+
+	def _refresh_loop(self, interval_secs: float):
+		while not self._stop_refresh.wait(interval_secs):
+			try:
+				self.refresh()
+			except Exception as e:
+				# Keep serving the cached values; the next lookup after expiry retries.
+				logger.warning(f"Background secrets refresh failed: {e}")
+
+	def _get_fresh(self, name: str) -> Optional[SecretValue]:
+		with self._lock:
+			entry = self._entries.get(name)
+			if entry is None or entry.expires_at <= self._clock():
+				return None
+			self._entries.move_to_end(name)
+			return entry.value
+
+	def _store(self, values: Dict[str, SecretValue]):
+		expires_at = self._clock() + self.ttl_secs
+		with self._lock:
+			for name, value in values.items():
+				self._entries[name] = _CacheEntry(value=value, expires_at=expires_at)
+				self._entries.move_to_end(name)
+			while len(self._entries) > self.max_entries:
+				self._entries.popitem(last=False)
+
+	def _fetch_batch(self, names: List[str]) -> Dict[str, SecretValue]:
+		client = self._client_provider()
+		values: Dict[str, SecretValue] = {}
+
+		for start in range(0, len(names), BATCH_GET_SECRET_VALUE_SIZE):
+			response = client.batch_get_secret_value(
+				SecretIdList=names[start : start + BATCH_GET_SECRET_VALUE_SIZE]
+			)
+			errors = response.get("Errors", [])
+			if errors:
+				first = errors[0]
+				raise InfraError(
+					f"Failed to fetch {len(errors)} secrets: "
+					f"{first.get('SecretId')}: {first.get('ErrorCode')} {first.get('Message')}"
+				)
+			for secret in response.get("SecretValues", []):
+				values[secret["Name"]] = _secret_value(secret)
+
+		# BatchGetSecretValue reports secrets by name; map ARN or partial-name
+		# requests back to what the caller asked for.
+		missing = [name for name in names if name not in values]
+		for name in missing:
+			values[name] = _secret_value(client.get_secret_value(SecretId=name))
+
+		return values
+
+
+def _secret_value(response) -> SecretValue:
+	if "SecretString" in response:
+		return response["SecretString"]
+	return response["SecretBinary"]
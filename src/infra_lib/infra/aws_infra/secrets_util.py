@@ -1,18 +1,30 @@
+import asyncio
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
 import logging
 
 from mypy_boto3_secretsmanager import SecretsManagerClient
 
+from .async_boto import AsyncBotoClientFactory
 from .boto_client_factory import BotoClientFactory
 from .aws_services_enum import AwsService
 from .creds import CredentialsProvider
+from .secrets_cache import BATCH_GET_SECRET_VALUE_SIZE, SecretsCache
+from ..enums import StrEnum
+from ...exceptions import InfraError
 
 logger = logging.getLogger(__name__)
 
 
+class SecretSyncAction(StrEnum):
+	created = "created"
+	updated = "updated"
+	unchanged = "unchanged"
+
+
 class SecretsManagerUtil:
 	creds: CredentialsProvider
 	_client_factory: BotoClientFactory
@@ -23,27 +35,182 @@ class SecretsManagerUtil:
 		creds: CredentialsProvider,
 		client_factory: BotoClientFactory,
 		aws_config_dir: Path,
+		cache_ttl_secs: float = 300,
+		async_client_factory: Optional[AsyncBotoClientFactory] = None,
 	):
 		self.creds = creds
 		self._client_factory = client_factory
+		self._async_client_factory = async_client_factory or AsyncBotoClientFactory(client_factory)
 		self.config_dir = aws_config_dir
+		self.secrets_cache = SecretsCache(
+			client_provider=lambda: self.secrets_client, ttl_secs=cache_ttl_secs
+		)
 
 	@property
 	def secrets_client(self) -> SecretsManagerClient:
 		return self._client_factory.client(AwsService.SECRETS_MANAGER)
 
-	def create_secrets(self, secrets_file: str = "secrets.json"):
+	def get_secret(self, name: str, as_json: bool = False, use_cache: bool = True) -> Any:
+		"""Read a secret value, served from the in-memory cache while it is fresh."""
+		if not use_cache:
+			self.secrets_cache.invalidate(name)
+		value = self.secrets_cache.get(name)
+		return json.loads(value) if as_json else value
+
+	def get_secrets_batch(self, names: Iterable[str], as_json: bool = False) -> Dict[str, Any]:
+		"""Read several secrets, fetching all cache misses in batched requests."""
+		values = self.secrets_cache.get_many(names)
+		if as_json:
+			return {name: json.loads(value) for name, value in values.items()}
+		return values
+
+	def create_secrets(
+		self, secrets_file: str = "secrets.json", upsert: bool = False, max_workers: int = 8
+	) -> Optional[Dict[str, SecretSyncAction]]:
+		"""Create the secrets defined in `secrets_file`.
+
+		By default existing secrets are left untouched. With `upsert=True` existing
+		secrets are listed once, their values are fetched in batches and only new or
+		changed secrets are written, concurrently with `max_workers` threads.
+
+		Returns: The action taken per secret name when `upsert` is enabled.
+		"""
 		secrets_file_path = Path.joinpath(self.config_dir, secrets_file)
 		if not os.path.exists(secrets_file_path):
 			logger.info(f"Skipping secrets creation: file not found at '{secrets_file_path}'")
-			return
+			return None
 
 		with open(secrets_file_path, "r") as f:
 			secrets: Dict = json.load(f)
 
+		if upsert:
+			return self.upsert_secrets(secrets, max_workers=max_workers)
+
 		for name, value in secrets.items():
 			try:
 				value = self.secrets_client.create_secret(Name=name, SecretString=json.dumps(value))
 				logger.info(f"Created secret '{name}'")
 			except self.secrets_client.exceptions.ResourceExistsException:
 				logger.info(f"Secret '{name}' already exists")
+
+	def upsert_secrets(
+		self, secrets: Dict[str, object], max_workers: int = 8
+	) -> Dict[str, SecretSyncAction]:
+		"""Create missing secrets and update secrets whose value changed.
+
+		Current values are fetched with `batch_get_secret_value` and compared with the
+		desired values, so nothing derived from a secret value is stored outside it.
+		"""
+		desired = {name: json.dumps(value) for name, value in secrets.items()}
+		existing_names, current_values = self._current_secrets(desired)
+
+		def sync(name: str) -> SecretSyncAction:
+			return self._sync_secret(name, desired[name], existing_names, current_values)
+
+		with ThreadPoolExecutor(max_workers=max_workers) as executor:
+			actions = dict(zip(desired, executor.map(sync, desired)))
+
+		return self._finish_sync(actions)
+
+	async def upsert_secrets_async(self, secrets: Dict[str, object]) -> Dict[str, SecretSyncAction]:
+		"""`upsert_secrets` with the writes awaited concurrently on the async client factory."""
+		aws = self._async_client_factory
+		desired = {name: json.dumps(value) for name, value in secrets.items()}
+		existing_names, current_values = await aws.run(self._current_secrets, desired)
+
+		results = await asyncio.gather(
+			*(
+				aws.run(self._sync_secret, name, secret_string, existing_names, current_values)
+				for name, secret_string in desired.items()
+			)
+		)
+		return self._finish_sync(dict(zip(desired, results)))
+
+	def _current_secrets(self, desired: Dict[str, str]) -> Tuple[Set[str], Dict[str, str]]:
+		"""Existing secret names and the current values of the desired ones."""
+		existing_names = self._list_secret_names()
+		current_values, deleted_names = self._fetch_secret_strings(
+			[name for name in desired if name in existing_names]
+		)
+		# Deleted since the listing; created again like any other missing secret.
+		return existing_names - deleted_names, current_values
+
+	def _sync_secret(
+		self,
+		name: str,
+		secret_string: str,
+		existing_names: Set[str],
+		current_values: Dict[str, str],
+	) -> SecretSyncAction:
+		if name not in existing_names:
+			return self._create_or_update_secret(name, secret_string)
+
+		if current_values.get(name) != secret_string:
+			self.secrets_client.put_secret_value(SecretId=name, SecretString=secret_string)
+			logger.info(f"Updated secret '{name}'")
+			return SecretSyncAction.updated
+
+		return SecretSyncAction.unchanged
+
+	def _finish_sync(self, actions: Dict[str, SecretSyncAction]) -> Dict[str, SecretSyncAction]:
+		for name, action in actions.items():
+			if action == SecretSyncAction.updated:
+				self.secrets_cache.invalidate(name)
+
+		counts = {action: list(actions.values()).count(action) for action in SecretSyncAction}
+		logger.info(
+			f"Synced {len(actions)} secrets: {counts[SecretSyncAction.created]} created, "
+			f"{counts[SecretSyncAction.updated]} updated, "
+			f"{counts[SecretSyncAction.unchanged]} unchanged"
+		)
+		return actions
+
+	def _create_or_update_secret(self, name: str, secret_string: str) -> SecretSyncAction:
+		try:
+			self.secrets_client.create_secret(Name=name, SecretString=secret_string)
+			logger.info(f"Created secret '{name}'")
+			return SecretSyncAction.created
+		except self.secrets_client.exceptions.ResourceExistsException:
+			# Created concurrently since the listing; fall back to writing a new version.
+			self.secrets_client.put_secret_value(SecretId=name, SecretString=secret_string)
+			logger.info(f"Updated secret '{name}'")
+			return SecretSyncAction.updated
+
+	def _list_secret_names(self) -> Set[str]:
+		"""Names of every existing secret, read in one paginated listing."""
+		names: Set[str] = set()
+		paginator = self.secrets_client.get_paginator("list_secrets")
+		for page in paginator.paginate():
+			names.update(secret["Name"] for secret in page.get("SecretList", []))
+		return names
+
+	def _fetch_secret_strings(self, names: Iterable[str]) -> Tuple[Dict[str, str], Set[str]]:
+		"""Fetch the current string values of `names` in batched requests.
+
+		Returns the values and the names that no longer exist. Secrets without a string
+		value (binary secrets) are omitted, so they are always treated as changed. Any
+		other read error raises `InfraError` instead of overwriting a secret blindly.
+		"""
+		names = list(names)
+		values: Dict[str, str] = {}
+		not_found: Set[str] = set()
+		for start in range(0, len(names), BATCH_GET_SECRET_VALUE_SIZE):
+			response = self.secrets_client.batch_get_secret_value(
+				SecretIdList=names[start : start + BATCH_GET_SECRET_VALUE_SIZE]
+			)
+			errors = []
+			for error in response.get("Errors", []):
+				if error.get("ErrorCode") == "ResourceNotFoundException":
+					not_found.add(error["SecretId"])
+				else:
+					errors.append(error)
+			if errors:
+				first = errors[0]
+				raise InfraError(
+					f"Failed to fetch {len(errors)} secrets: "
+					f"{first.get('SecretId')}: {first.get('ErrorCode')} {first.get('Message')}"
+				)
+			for secret in response.get("SecretValues", []):
+				if "SecretString" in secret:
+					values[secret["Name"]] = secret["SecretString"]
+		return values, not_found
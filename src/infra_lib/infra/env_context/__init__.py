@@ -1,7 +1,11 @@
 from .env_context import EnvironmentContext
 from .aws_env_context import AWSEnvironmentContext
+from .lazy_env import DeferredEnvValue, LazyEnvValue, SecretRef
 
 __all__ = [
 	"EnvironmentContext",
 	"AWSEnvironmentContext",
+	"DeferredEnvValue",
+	"LazyEnvValue",
+	"SecretRef",
 ]
@@ -1,8 +1,46 @@
 import abc
 from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
+
 from . import EnvironmentContext
 
+if TYPE_CHECKING:
+	from ..aws_infra.aws_services_enum import AwsService
+	from ..aws_infra.rate_limiting import RateLimit
+	from ..aws_infra.secrets_cache import SecretsCache
+
 
 class AWSEnvironmentContext(EnvironmentContext, abc.ABC):
+	_secrets_cache: Optional["SecretsCache"] = None
+
 	def aws_config_dir(self) -> Path:
 		return self.environment_dir / "aws_config"
+
+	def aws_rate_limits(self) -> Dict["AwsService", "RateLimit"]:
+		"""Client-side request rate limits per AWS service. Unlisted services are unlimited.
+
+		Override to keep fan-out operations under an account's API quotas, e.g.
+		`{AwsService.LAMBDA: RateLimit(rate_per_sec=10, burst=20)}`.
+		"""
+		return {}
+
+	def resolve_secrets(self, names: List[str]) -> Dict[str, Union[str, bytes]]:
+		"""Fetch `SecretRef` values from Secrets Manager with `BatchGetSecretValue`.
+
+		Credentials come from this context's own environment, so secrets referenced
+		in get_extra_env_vars() are fetched only after the dotenv files are loaded.
+		"""
+		if self._secrets_cache is None:
+			# Imported here: aws_infra depends on this module.
+			from ..aws_infra.aws_services_enum import AwsService
+			from ..aws_infra.boto_client_factory import BotoClientFactory
+			from ..aws_infra.creds import CredentialsProvider
+			from ..aws_infra.secrets_cache import SecretsCache
+
+			factory = BotoClientFactory(
+				CredentialsProvider.from_env(self.environ), rate_limits=self.aws_rate_limits()
+			)
+			self._secrets_cache = SecretsCache(
+				client_provider=lambda: factory.client(AwsService.SECRETS_MANAGER)
+			)
+		return self._secrets_cache.get_many(names)
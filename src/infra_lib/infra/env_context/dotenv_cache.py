@@ -0,0 +1,61 @@
+import os
+from pathlib import Path
+import threading
+from types import MappingProxyType
+from typing import Dict, Iterable, Mapping, Optional, Tuple, Union
+
+from dotenv import dotenv_values
+
+# (st_mtime_ns, st_size, st_ino): a rewrite changes the mtime or size, and an
+# atomic replace changes the inode.
+_FileSignature = Tuple[int, int, int]
+
+_cache: Dict[str, Tuple[_FileSignature, Optional[Mapping[str, Optional[str]]]]] = {}
+_cache_lock = threading.Lock()
+
+
+def read_dotenv(path: Union[str, Path]) -> Mapping[str, Optional[str]]:
+	"""Parse a dotenv file like `dotenv_values`, reusing the result while the file is unchanged.
+
+	Returns a read-only mapping shared between callers. Files using `${VAR}` expansion
+	are re-parsed on every call, because the expansion reads os.environ.
+
+	Raises:
+	    FileNotFoundError: If the file does not exist.
+	"""
+	key = os.path.abspath(path)
+	stat = os.stat(key)
+	signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+	with _cache_lock:
+		cached = _cache.get(key)
+	if cached is not None and cached[0] == signature:
+		values = cached[1]
+	else:
+		raw_values = dotenv_values(key, interpolate=False)
+		interpolated = any(value is not None and "${" in value for value in raw_values.values())
+		values = None if interpolated else MappingProxyType(raw_values)
+		with _cache_lock:
+			_cache[key] = (signature, values)
+
+	if values is None:
+		return MappingProxyType(dotenv_values(key))
+	return values
+
+
+def merge_dotenv_files(paths: Iterable[Union[str, Path]]) -> Dict[str, str]:
+	"""Merge dotenv files in order, later files winning. Missing files and keys without
+	a value are skipped."""
+	merged: Dict[str, str] = {}
+	for path in paths:
+		try:
+			values = read_dotenv(path)
+		except FileNotFoundError:
+			continue
+		merged.update((key, value) for key, value in values.items() if value is not None)
+	return merged
+
+
+def clear_dotenv_cache():
+	with _cache_lock:
+		_cache.clear()
@@ -1,26 +1,44 @@
 import abc
+from collections import ChainMap
 import json
 import os
 from pathlib import Path
-from typing import Dict, Optional
-
-from dotenv import dotenv_values
+import shutil
+import tempfile
+import threading
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Union
 
+from ...exceptions import ConfigError
 from ...infra.enums import InfraEnvironment
+from .dotenv_cache import merge_dotenv_files
+from .lazy_env import LazyEnvValue
 
 
 class EnvironmentContext(abc.ABC):
 	"""Stores environment-specific configuration.
 
 	Configuration is loaded via the .load() method and stored in
-	container_env_vars and host_env_vars. This class updates global os.environ.
+	container_env_vars and host_env_vars. This class updates global os.environ,
+	unless `isolated` is set: isolated contexts keep host_env_vars as a read-only
+	overlay of their variables on a snapshot of os.environ taken at load, so several
+	contexts can coexist in one process. Code running for an isolated context must
+	read its environment from `environ` instead of os.environ.
+
+	`get_extra_env_vars()` may return `LazyEnvValue`s such as `SecretRef`. They are
+	resolved on the first `get()` of their key, or in one batch per value type when
+	the whole env is materialized through container_env_vars or host_env_vars.
+	Resolved values are memoized for the lifetime of the context, across reloads.
 
 	Attributes:
 	    config_dir: The root directory for configuration files.
 	    container_env_vars: The environment variables for containers.
 	    host_env_vars: The environment variables used for host subprocesses.
+	    isolated: Whether load() leaves os.environ untouched.
 	"""
 
+	isolated: bool = False
+
 	def __init__(self, project_root: Path, environment_dir: Path):
 		"""Initializes the EnvironmentContext.
 
@@ -30,16 +48,32 @@ class EnvironmentContext(abc.ABC):
 		self.project_root: Path = project_root
 		self.environment_dir: Path = environment_dir
 		self._container_env_vars: Dict[str, str] = {}
-		self._host_env_vars: Dict[str, str] = {}
+		self._host_env_vars: Mapping[str, str] = {}
+		self._lazy_env_vars: Dict[str, LazyEnvValue] = {}
+		self._resolved_values: Dict[LazyEnvValue, str] = {}
+		self._resolve_lock = threading.RLock()
 		super().__init__()
 
 	@property
-	def container_env_vars(self) -> Dict[str, str]:
+	def container_env_vars(self) -> Mapping[str, str]:
+		"""A copy of the container variables, or a read-only view when isolated."""
+		self._resolve_lazy_env_vars(list(self._lazy_env_vars))
+		if self.isolated:
+			return MappingProxyType(self._container_env_vars)
 		return self._container_env_vars.copy()
 
 	@property
-	def host_env_vars(self) -> Dict[str, str]:
-		return self._host_env_vars.copy()
+	def host_env_vars(self) -> Mapping[str, str]:
+		"""A copy of the host variables, or a read-only view when isolated."""
+		self._resolve_lazy_env_vars(list(self._lazy_env_vars))
+		if self.isolated:
+			return self._host_env_vars
+		return dict(self._host_env_vars)
+
+	@property
+	def environ(self) -> Mapping[str, str]:
+		"""The environment host-side code (credentials, subprocesses) should read."""
+		return self._host_env_vars if self.isolated else os.environ
 
 	@abc.abstractmethod
 	def env(self) -> InfraEnvironment:
@@ -65,16 +99,43 @@ class EnvironmentContext(abc.ABC):
 		"""Gets the canonical infra-generated dotenv path for this context."""
 		return self.environment_dir / ".infra.generated.env"
 
-	def get_extra_env_vars(self) -> Dict[str, str]:
+	def get_extra_env_vars(self) -> Dict[str, Union[str, LazyEnvValue]]:
 		"""Return container env vars loaded after dotenv files and before load(extra_vars)."""
 		return {}
 
+	def resolve_secrets(self, names: List[str]) -> Dict[str, Union[str, bytes]]:
+		"""Fetch the secrets referenced by `SecretRef` values, in a single call if possible.
+
+		Subclasses backed by a secret store override this.
+		"""
+		raise ConfigError(f"{type(self).__name__} cannot resolve secrets: {', '.join(names)}")
+
 	def write_generated_env_file(self) -> Path:
 		"""Write the fully resolved environment in the environment directory."""
+		self.update_generated_env_file()
+		return self.get_generated_env_path()
+
+	def update_generated_env_file(self) -> bool:
+		"""Write the generated env file only if its content changed.
+
+		The file is replaced atomically, so readers never see a partial file. An
+		unchanged file keeps its mtime, so compose and file watchers don't react to it.
+
+		Returns:
+		    Whether the file was written.
+		"""
 		env_file = self.get_generated_env_path()
 		lines = [f"{key}={json.dumps(value)}" for key, value in self.container_env_vars.items()]
-		env_file.write_text("\n".join(lines) + "\n")
-		return env_file
+		content = ("\n".join(lines) + "\n").encode("utf-8")
+
+		try:
+			if env_file.read_bytes() == content:
+				return False
+		except FileNotFoundError:
+			pass
+
+		_write_atomic(env_file, content)
+		return True
 
 	def pre_load_action(self):
 		"""A hook for subclasses to run logic before config is loaded.
@@ -87,16 +148,7 @@ class EnvironmentContext(abc.ABC):
 	def _build_container_env_vars(
 		self, extra_vars: Optional[Dict[str, str]] = None
 	) -> Dict[str, str]:
-		container_env_vars: Dict[str, str] = {}
-
-		for dotenv_path in self.get_dotenv_paths():
-			if dotenv_path.exists():
-				dotenv_vars = {
-					key: value
-					for key, value in dotenv_values(dotenv_path).items()
-					if value is not None
-				}
-				container_env_vars.update(dotenv_vars)
+		container_env_vars: Dict[str, str] = merge_dotenv_files(self.get_dotenv_paths())
 
 		container_env_vars["TARGET_ENV"] = self.env().value
 		container_env_vars.update(self.get_extra_env_vars())
@@ -106,10 +158,8 @@ class EnvironmentContext(abc.ABC):
 
 		return container_env_vars
 
-	def _build_host_env_vars(self, container_env_vars: Dict[str, str]) -> Dict[str, str]:
-		host_env_vars = os.environ.copy()
-		host_env_vars.update(container_env_vars)
-		return host_env_vars
+	def _build_host_env_vars(self, container_env_vars: Dict[str, str]) -> Mapping[str, str]:
+		return MappingProxyType(ChainMap(container_env_vars, dict(os.environ)))
 
 	def load(self, extra_vars: Optional[Dict[str, str]] = None):
 		"""Loads configuration into container and host environment dictionaries.
@@ -120,9 +170,17 @@ class EnvironmentContext(abc.ABC):
 		"""
 		self.pre_load_action()
 
-		self._container_env_vars = self._build_container_env_vars(extra_vars)
-		self._host_env_vars = self._build_host_env_vars(self.container_env_vars)
-		os.environ.update(self._host_env_vars)
+		env_vars = self._build_container_env_vars(extra_vars)
+		with self._resolve_lock:
+			self._lazy_env_vars = {
+				key: value for key, value in env_vars.items() if isinstance(value, LazyEnvValue)
+			}
+			self._container_env_vars = {
+				key: value for key, value in env_vars.items() if key not in self._lazy_env_vars
+			}
+			self._host_env_vars = self._build_host_env_vars(self._container_env_vars)
+			if not self.isolated:
+				os.environ.update(self._container_env_vars)
 
 	def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
 		"""Safe getter for accessing configuration values.
@@ -134,4 +192,44 @@ class EnvironmentContext(abc.ABC):
 		Returns:
 		    The value of the environment variable, or the default.
 		"""
+		if key in self._lazy_env_vars:
+			self._resolve_lazy_env_vars([key])
 		return self._container_env_vars.get(key, default)
+
+	def _resolve_lazy_env_vars(self, keys: List[str]):
+		"""Resolve pending lazy values, batching the ones of the same type."""
+		if not keys:
+			return
+
+		with self._resolve_lock:
+			pending = {key: self._lazy_env_vars[key] for key in keys if key in self._lazy_env_vars}
+			by_type: Dict[type, List[LazyEnvValue]] = {}
+			for value in dict.fromkeys(pending.values()):
+				if value not in self._resolved_values:
+					by_type.setdefault(type(value), []).append(value)
+
+			for value_type, values in by_type.items():
+				resolved = value_type.resolve_many(values, self)
+				self._resolved_values.update(zip(values, resolved))
+
+			for key, value in pending.items():
+				self._container_env_vars[key] = self._resolved_values[value]
+				del self._lazy_env_vars[key]
+				if not self.isolated:
+					os.environ[key] = self._resolved_values[value]
+
+
+def _write_atomic(path: Path, content: bytes):
+	fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+	try:
+		with os.fdopen(fd, "wb") as f:
+			f.write(content)
+		# mkstemp creates the file as 0600; keep the permissions a plain write would give.
+		if path.exists():
+			shutil.copymode(path, tmp_path)
+		else:
+			os.chmod(tmp_path, 0o644)
+		os.replace(tmp_path, path)
+	except BaseException:
+		os.unlink(tmp_path)
+		raise
@@ -0,0 +1,60 @@
+import abc
+from dataclasses import dataclass
+import json
+from typing import TYPE_CHECKING, Callable, List, Optional, Union
+
+if TYPE_CHECKING:
+	from .env_context import EnvironmentContext
+
+
+class LazyEnvValue(abc.ABC):
+	"""An env var value that is only computed when something reads it.
+
+	Return these from `EnvironmentContext.get_extra_env_vars()` for values that are
+	expensive to fetch. Subclasses that can fetch several values in one call override
+	`resolve_many`; the context uses it whenever it materializes the whole env.
+	"""
+
+	@abc.abstractmethod
+	def resolve(self, context: "EnvironmentContext") -> str:
+		pass
+
+	@classmethod
+	def resolve_many(cls, values: List["LazyEnvValue"], context: "EnvironmentContext") -> List[str]:
+		return [value.resolve(context) for value in values]
+
+
+class DeferredEnvValue(LazyEnvValue):
+	"""Compute a value with an arbitrary zero-argument callable."""
+
+	def __init__(self, factory: Callable[[], str]):
+		self.factory = factory
+
+	def resolve(self, context: "EnvironmentContext") -> str:
+		return self.factory()
+
+
+@dataclass(frozen=True)
+class SecretRef(LazyEnvValue):
+	"""A secret resolved through `EnvironmentContext.resolve_secrets`.
+
+	With `json_key`, the secret is parsed as a JSON object and only that key is used.
+	"""
+
+	name: str
+	json_key: Optional[str] = None
+
+	def resolve(self, context: "EnvironmentContext") -> str:
+		return self.resolve_many([self], context)[0]
+
+	@classmethod
+	def resolve_many(cls, values: List["SecretRef"], context: "EnvironmentContext") -> List[str]:
+		secrets = context.resolve_secrets(list(dict.fromkeys(value.name for value in values)))
+		return [value._extract(secrets[value.name]) for value in values]
+
+	def _extract(self, secret: Union[str, bytes]) -> str:
+		if isinstance(secret, bytes):
+			secret = secret.decode("utf-8")
+		if self.json_key is None:
+			return secret
+		return str(json.loads(secret)[self.json_key])
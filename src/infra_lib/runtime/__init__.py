@@ -1,8 +1,17 @@
+import json
 import os
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Iterable, Optional
+
+from ..infra.aws_infra.secrets_cache import SecretsCache
+from ..infra.env_context.dotenv_cache import read_dotenv
 from ..infra.enums import InfraEnvironment
 
+_secrets_cache: Optional[SecretsCache] = None
+_secrets_cache_lock = threading.RLock()
+_secrets_client = None
+
 
 def load_env(env: Optional[InfraEnvironment] = None, project_root: Optional[Path] = None) -> None:
 	"""Load environment variables from .env file and set TARGET_ENV.
@@ -36,9 +45,7 @@ def load_env(env: Optional[InfraEnvironment] = None, project_root: Optional[Path
 			f".env file not found at {dotenv_file}. Cannot load environment '{env.value}'"
 		)
 
-	from dotenv import dotenv_values
-
-	loaded_vars = dotenv_values(dotenv_file)
+	loaded_vars = read_dotenv(dotenv_file)
 	os.environ["TARGET_ENV"] = env.value
 	os.environ.update(loaded_vars)
 
@@ -118,3 +125,79 @@ def get_env_vars(key: Optional[str] = None) -> Optional[str]:
 		return dict(os.environ)
 
 	return os.environ.get(key)
+
+
+def configure_secrets_cache(
+	ttl_secs: float = 300,
+	max_entries: int = 256,
+	refresh_interval_secs: Optional[float] = None,
+) -> SecretsCache:
+	"""Replace the process-wide cache used by get_secret and get_secrets_batch.
+
+	Call this once at import time of a Lambda handler module to tune the TTL or to
+	enable background refresh. The Secrets Manager client is created lazily from the
+	default boto3 credential chain, which honours AWS_ENDPOINT_URL for LocalStack.
+	"""
+	global _secrets_cache
+
+	with _secrets_cache_lock:
+		if _secrets_cache is not None:
+			_secrets_cache.stop_background_refresh()
+		_secrets_cache = SecretsCache(
+			client_provider=_default_secrets_client,
+			ttl_secs=ttl_secs,
+			max_entries=max_entries,
+			refresh_interval_secs=refresh_interval_secs,
+		)
+		return _secrets_cache
+
+
+def get_secret(name: str, as_json: bool = False) -> Any:
+	"""Get a secret value, cached in memory for repeated lookups.
+
+	Args:
+	    name: The secret name or ARN.
+	    as_json: Decode the secret string as JSON.
+
+	Returns:
+	    The secret string (or bytes for binary secrets), or the decoded JSON value.
+	"""
+	value = _get_secrets_cache().get(name)
+	return json.loads(value) if as_json else value
+
+
+def get_secrets_batch(names: Iterable[str], as_json: bool = False) -> Dict[str, Any]:
+	"""Get several secret values, fetching cache misses in batched requests.
+
+	Args:
+	    names: The secret names or ARNs.
+	    as_json: Decode every secret string as JSON.
+
+	Returns:
+	    A dict mapping each requested name to its value.
+	"""
+	values = _get_secrets_cache().get_many(names)
+	if as_json:
+		return {name: json.loads(value) for name, value in values.items()}
+	return values
+
+
+def _get_secrets_cache() -> SecretsCache:
+	cache = _secrets_cache
+	if cache is not None:
+		return cache
+
+	with _secrets_cache_lock:
+		if _secrets_cache is None:
+			return configure_secrets_cache()
+		return _secrets_cache
+
+
+def _default_secrets_client():
+	global _secrets_client
+
+	if _secrets_client is None:
+		import boto3
+
+		_secrets_client = boto3.client("secretsmanager")
+	return _secrets_client
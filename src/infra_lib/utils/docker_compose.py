@@ -71,7 +71,16 @@ class DockerCompose:
 		logger.info("Building containers")
 		self._run_compose_command("build")
 
-	def up(self, detach: bool = True):
+	def up(self, detach: bool = True, skip_if_unchanged: bool = False):
+		"""Start the containers.
+
+		With `skip_if_unchanged`, nothing is run when the generated env file did not
+		change, for callers that know the containers are already running.
+		"""
+		env_changed = self.env_context.update_generated_env_file()
+		if skip_if_unchanged and not env_changed:
+			logger.info("Environment unchanged, skipping 'up'")
+			return
+
 		logger.info("Starting containers")
-		self.env_context.write_generated_env_file()
 		self._run_compose_command(f"up {'-d' if detach else ''}")
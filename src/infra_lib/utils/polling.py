@@ -0,0 +1,50 @@
+import random
+import time
+from typing import Callable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+
+def backoff_delays(
+	initial_delay: float = 0.25,
+	max_delay: float = 5.0,
+	factor: float = 2.0,
+	jitter: float = 0.1,
+) -> Iterator[float]:
+	"""Yield exponentially growing delays capped at `max_delay`, with +/- `jitter` ratio."""
+	delay = initial_delay
+	while True:
+		yield delay * random.uniform(1 - jitter, 1 + jitter) if jitter else delay
+		delay = min(delay * factor, max_delay)
+
+
+def poll_until(
+	probe: Callable[[], T],
+	is_done: Callable[[T], bool],
+	timeout_secs: float,
+	initial_delay: float = 0.25,
+	max_delay: float = 5.0,
+	factor: float = 2.0,
+	sleep: Callable[[float], None] = time.sleep,
+	clock: Callable[[], float] = time.monotonic,
+) -> T:
+	"""Call `probe` with exponential backoff until `is_done` accepts its result.
+
+	The first probe runs immediately, so fast operations (e.g. on LocalStack) return
+	without paying a fixed initial delay.
+
+	Raises:
+	    TimeoutError: If `is_done` did not accept a result within `timeout_secs`.
+	"""
+	deadline = clock() + timeout_secs
+	delays = backoff_delays(initial_delay=initial_delay, max_delay=max_delay, factor=factor)
+
+	while True:
+		result = probe()
+		if is_done(result):
+			return result
+
+		remaining = deadline - clock()
+		if remaining <= 0:
+			raise TimeoutError(f"Timed out after {timeout_secs}s waiting for completion")
+		sleep(min(next(delays), remaining))
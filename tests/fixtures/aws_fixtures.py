@@ -10,6 +10,7 @@ from infra_lib.infra.aws_infra import (
 	BaseLambdaZipBuilder,
 	BotoClientFactory,
 )
+from infra_lib.infra.aws_infra.api_gateway_util import APIGatewayRouteIndex
 
 
 @pytest.fixture
@@ -152,5 +153,8 @@ class MockAPIGatewayUtil:
 	def gateway_config_file(self) -> Dict:
 		return {}
 
+	def route_index(self) -> APIGatewayRouteIndex:
+		return APIGatewayRouteIndex({})
+
 	def build_url(self, api_id: str, resource_path: str) -> str:
 		return ""
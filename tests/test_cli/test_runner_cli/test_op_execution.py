@@ -0,0 +1,174 @@
+import asyncio
+import logging
+import threading
+import pytest
+from unittest.mock import MagicMock
+
+from infra_lib.cli.runner_cli.exceptions import OpTimeoutError
+from infra_lib.cli.runner_cli.infra_op_decorator import InfraOp, infra_operation, OP_REGISTRY
+from infra_lib.cli.runner_cli.op_execution import run_op
+from infra_lib.cli.runner_cli.run_summary import OpRunRecord, OpStatus, RunSummary
+from infra_lib.infra.aws_infra import AwsCallTelemetry
+
+
+class Throttled(Exception):
+	pass
+
+
+def _flaky(failures: int, error: Exception):
+	calls = []
+
+	def handler(ctx):
+		calls.append(ctx)
+		if len(calls) <= failures:
+			raise error
+		return "ok"
+
+	return handler, calls
+
+
+class TestRunOp:
+	def test_should_retry_until_success_and_record_attempts(self):
+		handler, calls = _flaky(2, Throttled("slow down"))
+		op = InfraOp(name="op", description="", handler=handler, retries=3, backoff=0.5)
+		record = OpRunRecord(name="op")
+		sleep = MagicMock()
+
+		run_op(op, ["ctx"], record, sleep=sleep)
+
+		assert len(calls) == 3
+		assert record.attempts == 3
+		assert sleep.call_count == 2
+		first_delay, second_delay = (c.args[0] for c in sleep.call_args_list)
+		assert 0.25 <= first_delay <= 0.75
+		assert 0.5 <= second_delay <= 1.5
+
+	def test_should_raise_after_retries_are_exhausted(self):
+		handler, calls = _flaky(5, Throttled("slow down"))
+		op = InfraOp(name="op", description="", handler=handler, retries=1)
+
+		with pytest.raises(Throttled):
+			run_op(op, ["ctx"], sleep=MagicMock())
+
+		assert len(calls) == 2
+
+	def test_should_not_retry_errors_outside_retry_on(self):
+		handler, calls = _flaky(1, ValueError("bad config"))
+		op = InfraOp(name="op", description="", handler=handler, retries=3, retry_on=(Throttled,))
+
+		with pytest.raises(ValueError):
+			run_op(op, ["ctx"], sleep=MagicMock())
+
+		assert len(calls) == 1
+
+	def test_should_time_out_sync_attempts_without_retrying(self):
+		release = threading.Event()
+		calls = []
+
+		def handler(ctx):
+			calls.append(ctx)
+			release.wait(2)
+
+		op = InfraOp(name="op", description="", handler=handler, retries=2, timeout=0.05)
+
+		try:
+			with pytest.raises(OpTimeoutError, match="timed out after 0.05s"):
+				run_op(op, ["ctx"], sleep=MagicMock())
+		finally:
+			release.set()
+
+		assert len(calls) == 1
+
+	def test_should_cancel_and_retry_timed_out_async_attempts(self):
+		calls = []
+
+		async def handler(ctx):
+			calls.append(ctx)
+			if len(calls) == 1:
+				await asyncio.sleep(10)
+			return "ok"
+
+		op = InfraOp(name="op", description="", handler=handler, retries=1, backoff=0, timeout=0.05)
+		record = OpRunRecord(name="op")
+
+		run_op(op, ["ctx"], record)
+
+		assert record.attempts == 2
+
+	@pytest.mark.parametrize("timeout", [None, 5])
+	def test_should_retry_handler_timeout_error_like_other_failures(self, timeout):
+		calls = []
+
+		async def handler(ctx):
+			calls.append(ctx)
+			raise TimeoutError("upstream timed out")
+
+		op = InfraOp(
+			name="op", description="", handler=handler, retries=1, backoff=0, timeout=timeout
+		)
+
+		with pytest.raises(TimeoutError, match="upstream timed out") as exc_info:
+			run_op(op, ["ctx"])
+
+		assert not isinstance(exc_info.value, OpTimeoutError)
+		assert len(calls) == 2
+
+	def test_should_not_mistake_sync_handler_timeout_error_for_op_timeout(self):
+		def handler(ctx):
+			raise TimeoutError("upstream timed out")
+
+		op = InfraOp(name="op", description="", handler=handler, timeout=5)
+
+		with pytest.raises(TimeoutError, match="upstream timed out") as exc_info:
+			run_op(op, ["ctx"], sleep=MagicMock())
+
+		assert not isinstance(exc_info.value, OpTimeoutError)
+
+
+class TestInfraOperationPolicy:
+	@pytest.fixture(autouse=True)
+	def clear_op_registry(self):
+		OP_REGISTRY.clear()
+		yield
+		OP_REGISTRY.clear()
+
+	def test_should_register_retry_policy(self):
+		@infra_operation(retries=2, backoff=0.1, timeout=30, retry_on=(Throttled,))
+		def deploy(ctx):
+			pass
+
+		op = OP_REGISTRY["deploy"]
+		assert (op.retries, op.backoff, op.timeout, op.retry_on) == (2, 0.1, 30, (Throttled,))
+
+	@pytest.mark.parametrize("kwargs", [{"retries": -1}, {"backoff": -1}, {"timeout": 0}])
+	def test_should_reject_invalid_policies(self, kwargs):
+		with pytest.raises(ValueError):
+			infra_operation(**kwargs)
+
+
+class TestRunSummary:
+	def test_should_log_status_and_attempts(self, caplog):
+		summary = RunSummary()
+		summary.record("deploy").status = OpStatus.completed
+		summary.record("deploy").attempts = 3
+		summary.record("skipped").status = OpStatus.skipped
+
+		with caplog.at_level(logging.INFO):
+			summary.log()
+
+		assert "deploy: completed in 0.0s after 3 attempts" in caplog.text
+		assert "skipped: skipped" in caplog.text
+
+	def test_should_log_aws_throttling_recorded_during_run(self, caplog):
+		telemetry = AwsCallTelemetry()
+		telemetry.record_throttle("sqs")
+		summary = RunSummary(telemetry=telemetry)
+		summary.record("deploy").status = OpStatus.completed
+		telemetry.record_throttle("lambda")
+		telemetry.record_retry("lambda", 1.5)
+
+		with caplog.at_level(logging.INFO):
+			summary.log()
+
+		assert "aws lambda: 1 throttled, 1 retries (1.5s backoff)" in caplog.text
+		assert "aws sqs" not in caplog.text
@@ -0,0 +1,169 @@
+import asyncio
+from dataclasses import replace
+import threading
+import time
+import pytest
+from unittest.mock import Mock
+
+from infra_lib.cli.runner_cli.exceptions import CycleError, OpError
+from infra_lib.cli.runner_cli.op_scheduler import OpScheduler
+from infra_lib import InfraEnvironment, EnvironmentContext
+
+from ...fixtures import infra_op_factory
+
+
+@pytest.fixture
+def mock_context():
+	context = Mock(spec=EnvironmentContext)
+	context.env.return_value = InfraEnvironment.local
+	return context
+
+
+def _registry(*ops):
+	return {op.name: op for op in ops}
+
+
+def _op(name, handler, depends_on=None, target_envs=None):
+	handler.__name__ = name
+	return infra_op_factory(
+		name=name,
+		handler=handler,
+		depends_on=depends_on,
+		target_envs=target_envs or [InfraEnvironment.local],
+	)
+
+
+class TestOpScheduler:
+	def test_should_run_dependencies_before_dependents(self, mock_context):
+		order = []
+		registry = _registry(
+			_op("a", lambda ctx: order.append("a")),
+			_op("b", lambda ctx: order.append("b"), depends_on=["a"]),
+			_op("c", lambda ctx: order.append("c"), depends_on=["b"]),
+		)
+
+		OpScheduler(registry, mock_context, max_workers=4).run(["c"])
+
+		assert order == ["a", "b", "c"]
+
+	def test_should_run_independent_sync_ops_in_parallel(self, mock_context):
+		barrier = threading.Barrier(3, timeout=2)
+		registry = _registry(*(_op(f"op{i}", lambda ctx: barrier.wait()) for i in range(3)))
+
+		OpScheduler(registry, mock_context, max_workers=3).run(["op0", "op1", "op2"])
+
+	def test_should_run_async_ops_concurrently_on_shared_loop(self, mock_context):
+		loops = set()
+
+		async def handler(ctx):
+			loops.add(asyncio.get_running_loop())
+			await asyncio.sleep(0.05)
+
+		registry = _registry(*(_op(f"op{i}", handler) for i in range(4)))
+
+		start = time.monotonic()
+		OpScheduler(registry, mock_context, max_workers=4).run(list(registry))
+
+		assert time.monotonic() - start < 0.15
+		assert len(loops) == 1
+
+	def test_should_overlap_async_ops_with_a_single_worker(self, mock_context):
+		barrier = threading.Barrier(2, timeout=2)
+
+		async def handler(ctx):
+			await asyncio.to_thread(barrier.wait)
+
+		registry = _registry(
+			_op("sync", lambda ctx: barrier.wait()),
+			_op("async0", handler),
+			_op("async1", handler),
+		)
+
+		OpScheduler(registry, mock_context, max_workers=1).run(["async0", "async1"])
+		barrier.reset()
+		OpScheduler(registry, mock_context, max_workers=1).run(["sync", "async0"])
+
+	def test_should_detect_async_ops_among_dependencies(self, mock_context):
+		async def async_handler(ctx):
+			pass
+
+		registry = _registry(
+			_op("a", async_handler),
+			_op("b", lambda ctx: None, depends_on=["a"]),
+			_op("c", lambda ctx: None),
+		)
+		scheduler = OpScheduler(registry, mock_context)
+
+		assert scheduler.has_async_ops(["b"])
+		assert not scheduler.has_async_ops(["c"])
+
+	def test_should_limit_concurrent_ops_per_resource_tag(self, mock_context):
+		lock = threading.Lock()
+		active, peak = [0], [0]
+
+		def handler(ctx):
+			with lock:
+				active[0] += 1
+				peak[0] = max(peak[0], active[0])
+			time.sleep(0.02)
+			with lock:
+				active[0] -= 1
+
+		registry = _registry(
+			*(replace(_op(f"op{i}", handler), resources=["lambda-api"]) for i in range(4))
+		)
+
+		OpScheduler(registry, mock_context, max_workers=4, resource_limits={"lambda-api": 2}).run(
+			list(registry)
+		)
+
+		assert peak[0] == 2
+
+	def test_should_run_ops_without_limited_tags_alongside_limited_ones(self, mock_context):
+		barrier = threading.Barrier(2, timeout=2)
+		limited = replace(_op("limited", lambda ctx: barrier.wait()), resources=["cpu-build"])
+		registry = _registry(limited, _op("free", lambda ctx: barrier.wait()))
+
+		OpScheduler(registry, mock_context, max_workers=2, resource_limits={"cpu-build": 1}).run(
+			list(registry)
+		)
+
+	def test_should_skip_untargeted_ops_but_run_their_dependents(self, mock_context):
+		ran = []
+		registry = _registry(
+			_op(
+				"stage-only", lambda ctx: ran.append("stage"), target_envs=[InfraEnvironment.stage]
+			),
+			_op("main", lambda ctx: ran.append("main"), depends_on=["stage-only"]),
+		)
+
+		OpScheduler(registry, mock_context).run(["main"])
+
+		assert ran == ["main"]
+
+	def test_should_not_start_new_ops_after_failure(self, mock_context):
+		ran = []
+
+		def fail(ctx):
+			raise ValueError("boom")
+
+		registry = _registry(
+			_op("failing", fail),
+			_op("after", lambda ctx: ran.append("after"), depends_on=["failing"]),
+		)
+
+		with pytest.raises(OpError, match="Failed during execution of 'failing'"):
+			OpScheduler(registry, mock_context).run(["after"])
+
+		assert ran == []
+
+	def test_should_raise_on_cycles_and_unknown_ops(self, mock_context):
+		registry = _registry(
+			_op("a", lambda ctx: None, depends_on=["b"]),
+			_op("b", lambda ctx: None, depends_on=["a"]),
+		)
+
+		with pytest.raises(CycleError):
+			OpScheduler(registry, mock_context).run(["a"])
+		with pytest.raises(OpError, match="not found"):
+			OpScheduler(registry, mock_context).run(["missing"])
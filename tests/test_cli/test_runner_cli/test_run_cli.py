@@ -1,4 +1,6 @@
 from infra_lib.cli.runner_cli.infra_op_decorator.decorator import infra_operation
+import os
+import textwrap
 import pytest
 from pathlib import Path
 from unittest.mock import MagicMock, Mock, patch
@@ -7,8 +9,8 @@ from click.testing import CliRunner
 from infra_lib.cli.runner_cli.run_cli import (
 	run_command,
 	_execute_op_with_deps,
-	_get_or_create_instance,
 )
+from infra_lib.cli.runner_cli.op_execution import get_or_create_instance
 from infra_lib.cli.runner_cli.infra_op_decorator import OP_REGISTRY
 from infra_lib.cli.runner_cli.exceptions import ConfigError, OpError, CycleError
 from infra_lib import InfraEnvironment, EnvironmentContext
@@ -118,6 +120,82 @@ class TestRunCli:
 		assert "fresh-op" in result.output
 		assert "stale-op" not in result.output
 
+	@patch("infra_lib.cli.runner_cli.run_cli.OpScheduler")
+	@patch("infra_lib.cli.runner_cli.run_cli._execute_op_with_deps")
+	def test_should_use_scheduler_when_jobs_greater_than_one(
+		self, mock_execute, mock_scheduler_cls, runner, mock_discover_and_context, tmp_path
+	):
+		env = InfraEnvironment.local
+		op = infra_op_factory(target_envs=[env])
+		infra_operation(name=op.name, target_envs=[env])(op.handler)
+
+		result = runner.invoke(
+			run_command, ["-e", env.value, "-op", op.name, "-p", tmp_path, "--jobs", "4"]
+		)
+
+		assert result.exit_code == 0
+		mock_execute.assert_not_called()
+		assert mock_scheduler_cls.call_args.kwargs["max_workers"] == 4
+		mock_scheduler_cls.return_value.run.assert_called_once_with([op.name])
+
+	@patch("infra_lib.cli.runner_cli.run_cli.OpScheduler")
+	@patch("infra_lib.cli.runner_cli.run_cli._execute_op_with_deps")
+	def test_should_use_scheduler_for_async_ops_with_one_job(
+		self, mock_execute, mock_scheduler_cls, runner, mock_discover_and_context, tmp_path
+	):
+		env = InfraEnvironment.local
+		op = infra_op_factory(target_envs=[env])
+		infra_operation(name=op.name, target_envs=[env])(op.handler)
+		mock_scheduler_cls.return_value.has_async_ops.return_value = True
+
+		result = runner.invoke(run_command, ["-e", env.value, "-op", op.name, "-p", tmp_path])
+
+		assert result.exit_code == 0
+		mock_execute.assert_not_called()
+		assert mock_scheduler_cls.call_args.kwargs["max_workers"] == 1
+		mock_scheduler_cls.return_value.run.assert_called_once_with([op.name])
+
+	@patch("infra_lib.cli.runner_cli.run_cli.OpScheduler")
+	def test_should_pass_resource_limits_to_scheduler(
+		self, mock_scheduler_cls, runner, mock_discover_and_context, tmp_path
+	):
+		env = InfraEnvironment.local
+		op = infra_op_factory(target_envs=[env])
+		infra_operation(name=op.name, target_envs=[env])(op.handler)
+
+		result = runner.invoke(
+			run_command,
+			[
+				"-e",
+				env.value,
+				"-op",
+				op.name,
+				"-p",
+				tmp_path,
+				"-j",
+				"4",
+				"--resource-limit",
+				"lambda-api=2",
+				"--resource-limit",
+				"cpu-build=1",
+			],
+		)
+
+		assert result.exit_code == 0
+		assert mock_scheduler_cls.call_args.kwargs["resource_limits"] == {
+			"lambda-api": 2,
+			"cpu-build": 1,
+		}
+
+	def test_should_reject_malformed_resource_limit(self, runner, tmp_path):
+		result = runner.invoke(
+			run_command,
+			["-e", InfraEnvironment.local.value, "-p", tmp_path, "--resource-limit", "lambda-api"],
+		)
+
+		assert result.exit_code != 0
+		assert "TAG=N" in result.output
+
 	@patch("infra_lib.cli.runner_cli.run_cli._execute_op_with_deps")
 	def test_should_pass_env_file_values_as_overrides(
 		self, mock_execute, runner, mock_discover_and_context, tmp_path
@@ -139,6 +217,88 @@ class TestRunCli:
 		mock_execute.assert_called_once()
 
 
+def _write_project(project_root: Path, envs, failing_env=None):
+	for env in envs:
+		env_dir = project_root / "environments" / env.value
+		env_dir.mkdir(parents=True)
+		(env_dir / f"{env.value}.py").write_text(
+			textwrap.dedent(f"""
+			import os
+			from infra_lib import EnvironmentContext, InfraEnvironment
+
+			class Context(EnvironmentContext):
+				def load(self, extra_vars=None):
+					os.environ["FAN_OUT_MARKER"] = "{env.value}"
+
+				def env(self):
+					return InfraEnvironment.{env.value}
+			""")
+		)
+
+	ops_dir = project_root / "operations"
+	ops_dir.mkdir()
+	(ops_dir / "ops.py").write_text(
+		textwrap.dedent(f"""
+		import os
+		from pathlib import Path
+		from infra_lib import infra_operation, InfraEnvironment
+
+		@infra_operation(target_envs=list(InfraEnvironment))
+		def record(ctx):
+			if ctx.env().value == {str(failing_env)!r}:
+				raise RuntimeError("boom")
+			out = Path({str(project_root)!r}) / f"{{ctx.env().value}}.out"
+			out.write_text(f"{{os.getpid()}}:{{os.environ['FAN_OUT_MARKER']}}")
+		""")
+	)
+
+
+class TestRunCliMultipleEnvironments:
+	def test_should_run_each_environment_in_its_own_process(self, runner, tmp_path):
+		project_root = tmp_path / "infra"
+		envs = [InfraEnvironment.local, InfraEnvironment.stage]
+		_write_project(project_root, envs)
+
+		result = runner.invoke(
+			run_command, ["-e", "local", "-e", "stage", "-p", project_root, "-op", "record"]
+		)
+
+		assert result.exit_code == 0, result.output
+		outputs = {env: (project_root / f"{env.value}.out").read_text().split(":") for env in envs}
+		assert outputs[InfraEnvironment.local][1] == "local"
+		assert outputs[InfraEnvironment.stage][1] == "stage"
+		pids = {pid for pid, _ in outputs.values()}
+		assert len(pids) == 2 and str(os.getpid()) not in pids
+		assert "FAN_OUT_MARKER" not in os.environ
+
+	def test_should_report_failed_environment_and_exit_non_zero(self, runner, tmp_path, caplog):
+		project_root = tmp_path / "infra"
+		_write_project(
+			project_root,
+			[InfraEnvironment.local, InfraEnvironment.stage],
+			failing_env=InfraEnvironment.stage,
+		)
+
+		with caplog.at_level("INFO"):
+			result = runner.invoke(run_command, ["--all-envs", "-p", project_root, "-op", "record"])
+
+		assert result.exit_code == 1
+		assert "[local] succeeded" in caplog.text
+		assert "[stage] failed: Failed during execution of 'record'" in caplog.text
+		assert "(boom)" in caplog.text
+		assert (project_root / "local.out").exists()
+
+	def test_should_list_operations_per_environment(self, runner, tmp_path):
+		project_root = tmp_path / "infra"
+		_write_project(project_root, [InfraEnvironment.local, InfraEnvironment.stage])
+
+		result = runner.invoke(run_command, ["--all-envs", "-p", project_root])
+
+		assert result.exit_code == 0
+		assert "Available operations for 'local':" in result.output
+		assert "Available operations for 'stage':" in result.output
+
+
 class TestExecuteOpWithDeps:
 	def test_should_execute_operation_without_dependencies(self, mock_context):
 		env = InfraEnvironment.local
@@ -248,6 +408,19 @@ class TestExecuteOpWithDeps:
 
 		assert test_instance.executed
 
+	def test_should_await_async_handlers(self, mock_context):
+		executed = []
+
+		async def async_op(ctx):
+			executed.append(ctx)
+
+		env = InfraEnvironment.local
+		infra_operation(target_envs=[env])(async_op)
+
+		_execute_op_with_deps("async-op", mock_context, set(), set())
+
+		assert executed == [mock_context]
+
 	def test_should_raise_op_error_on_handler_execution_failure(self, mock_context):
 		def failing_handler(ctx):
 			raise ValueError("Handler failed")
@@ -267,7 +440,7 @@ class TestGetOrCreateInstance:
 			def __init__(self):
 				self.value = 42
 
-		instance = _get_or_create_instance(TestClass, {})
+		instance = get_or_create_instance(TestClass, {})
 
 		assert isinstance(instance, TestClass)
 		assert instance.value == 42
@@ -277,8 +450,8 @@ class TestGetOrCreateInstance:
 			pass
 
 		instance_cache = {}
-		instance1 = _get_or_create_instance(TestClass, instance_cache)
-		instance2 = _get_or_create_instance(TestClass, instance_cache)
+		instance1 = get_or_create_instance(TestClass, instance_cache)
+		instance2 = get_or_create_instance(TestClass, instance_cache)
 
 		assert instance1 is instance2
 
@@ -286,8 +459,8 @@ class TestGetOrCreateInstance:
 		class TestClass:
 			pass
 
-		instance1 = _get_or_create_instance(TestClass, {})
-		instance2 = _get_or_create_instance(TestClass, {})
+		instance1 = get_or_create_instance(TestClass, {})
+		instance2 = get_or_create_instance(TestClass, {})
 
 		assert instance1 is not instance2
 
@@ -297,7 +470,7 @@ class TestGetOrCreateInstance:
 				raise ValueError("Cannot instantiate")
 
 		with pytest.raises(OpError, match="Failed to auto-instantiate"):
-			_get_or_create_instance(TestClass, {})
+			get_or_create_instance(TestClass, {})
 
 	def test_should_raise_op_error_for_class_with_required_params(self):
 		class TestClass:
@@ -305,4 +478,4 @@ class TestGetOrCreateInstance:
 				self.param = required_param
 
 		with pytest.raises(OpError, match="parameterless __init__"):
-			_get_or_create_instance(TestClass, {})
+			get_or_create_instance(TestClass, {})
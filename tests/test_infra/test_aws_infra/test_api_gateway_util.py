@@ -0,0 +1,178 @@
+import hashlib
+import json
+import pytest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from infra_lib.infra.aws_infra import APIGatewayUtil, BotoClientFactory
+from infra_lib.infra.aws_infra.api_gateway_util import (
+	DEFINITION_HASH_STAGE_VARIABLE,
+	APIGatewayRoute,
+	APIGatewayRouteIndex,
+)
+from infra_lib.infra.enums import InfraEnvironment
+from ...fixtures import fake_creds
+
+GATEWAY_BODY = json.dumps({"swagger": "2.0", "paths": {}})
+GATEWAY_HASH = hashlib.sha256(GATEWAY_BODY.encode("utf-8")).hexdigest()
+
+
+class NotFoundException(Exception):
+	pass
+
+
+@pytest.fixture
+def mock_apigw_client() -> MagicMock:
+	client = MagicMock()
+	client.exceptions.NotFoundException = NotFoundException
+	client.meta.endpoint_url = "http://localhost:4566"
+	client.create_rest_api.return_value = {"id": "new-id"}
+	return client
+
+
+@pytest.fixture
+def apigw_util(fake_creds, mock_apigw_client, tmp_path: Path) -> APIGatewayUtil:
+	(tmp_path / "apigateway.json").write_text(GATEWAY_BODY)
+	factory = MagicMock(spec=BotoClientFactory)
+	factory.client.return_value = mock_apigw_client
+	return APIGatewayUtil(
+		creds=fake_creds,
+		aws_config_dir=tmp_path,
+		environment=InfraEnvironment.local,
+		client_factory=factory,
+	)
+
+
+def _listed_apis(client: MagicMock, items: list[dict]):
+	client.get_paginator.return_value.paginate.return_value = [{"items": items}]
+
+
+class TestAPIGatewayUtil:
+	def test_should_create_import_and_deploy_new_api(self, apigw_util, mock_apigw_client):
+		_listed_apis(mock_apigw_client, [])
+
+		rest_api_id = apigw_util.create_api_gateway("my-api")
+
+		assert rest_api_id == "new-id"
+		mock_apigw_client.create_rest_api.assert_called_once_with(
+			name="my-api", tags={"_custom_id_": "my-api"}
+		)
+		mock_apigw_client.put_rest_api.assert_called_once_with(
+			restApiId="new-id", mode="overwrite", body=GATEWAY_BODY
+		)
+		mock_apigw_client.create_deployment.assert_called_once_with(
+			restApiId="new-id",
+			stageName="local",
+			variables={DEFINITION_HASH_STAGE_VARIABLE: GATEWAY_HASH},
+		)
+		mock_apigw_client.update_stage.assert_not_called()
+
+	def test_should_skip_import_and_deploy_when_definition_is_unchanged(
+		self, apigw_util, mock_apigw_client
+	):
+		_listed_apis(mock_apigw_client, [{"id": "existing", "tags": {"_custom_id_": "my-api"}}])
+		mock_apigw_client.get_stage.return_value = {
+			"variables": {DEFINITION_HASH_STAGE_VARIABLE: GATEWAY_HASH}
+		}
+
+		rest_api_id = apigw_util.create_api_gateway("my-api")
+
+		assert rest_api_id == "existing"
+		mock_apigw_client.create_rest_api.assert_not_called()
+		mock_apigw_client.put_rest_api.assert_not_called()
+		mock_apigw_client.create_deployment.assert_not_called()
+
+	def test_should_redeploy_existing_api_and_record_hash_when_definition_changed(
+		self, apigw_util, mock_apigw_client
+	):
+		_listed_apis(mock_apigw_client, [{"id": "existing", "tags": {"_custom_id_": "my-api"}}])
+		mock_apigw_client.get_stage.return_value = {
+			"variables": {DEFINITION_HASH_STAGE_VARIABLE: "stale"}
+		}
+
+		apigw_util.create_api_gateway("my-api")
+
+		mock_apigw_client.create_rest_api.assert_not_called()
+		mock_apigw_client.put_rest_api.assert_called_once()
+		mock_apigw_client.update_stage.assert_called_once_with(
+			restApiId="existing",
+			stageName="local",
+			patchOperations=[
+				{
+					"op": "replace",
+					"path": f"/variables/{DEFINITION_HASH_STAGE_VARIABLE}",
+					"value": GATEWAY_HASH,
+				}
+			],
+		)
+
+	def test_should_deploy_existing_api_without_stage(self, apigw_util, mock_apigw_client):
+		_listed_apis(mock_apigw_client, [{"id": "existing", "tags": {"_custom_id_": "my-api"}}])
+		mock_apigw_client.get_stage.side_effect = NotFoundException
+
+		apigw_util.create_api_gateway("my-api")
+
+		mock_apigw_client.create_deployment.assert_called_once()
+		mock_apigw_client.update_stage.assert_not_called()
+
+
+def _lambda_uri(function_arn: str) -> str:
+	return (
+		f"arn:aws:apigateway:us-east-1:lambda:path/2015-03-31/functions/{function_arn}/invocations"
+	)
+
+
+class TestAPIGatewayRouteIndex:
+	def test_should_index_routes_by_exact_function_name_and_arn(self):
+		arn = "arn:aws:lambda:us-east-1:000000000000:function:orders"
+		index = APIGatewayRouteIndex.from_definition(
+			{
+				"paths": {
+					"/orders": {
+						"get": {"x-amazon-apigateway-integration": {"uri": _lambda_uri(arn)}},
+						"x-amazon-apigateway-any-method": {
+							"x-amazon-apigateway-integration": {"uri": _lambda_uri(arn)}
+						},
+						"parameters": [],
+					},
+					"/orders-admin": {
+						"get": {
+							"x-amazon-apigateway-integration": {"uri": _lambda_uri(arn + "-admin")}
+						}
+					},
+					"/mock": {"get": {"x-amazon-apigateway-integration": {"type": "mock"}}},
+				}
+			}
+		)
+
+		expected = [APIGatewayRoute("GET", "/orders"), APIGatewayRoute("ANY", "/orders")]
+		assert index.routes_for("orders") == expected
+		assert index.routes_for(arn) == expected
+		assert index.routes_for("order") == []
+
+	def test_should_reuse_parsed_index_until_file_changes(self, tmp_path: Path):
+		config_file = tmp_path / "apigateway.json"
+		config_file.write_text(json.dumps({"paths": {}}))
+
+		first = APIGatewayRouteIndex.load(config_file)
+		assert APIGatewayRouteIndex.load(config_file) is first
+
+		arn = "arn:aws:lambda:us-east-1:000000000000:function:fn"
+		config_file.write_text(
+			json.dumps(
+				{
+					"paths": {
+						"/fn": {
+							"get": {"x-amazon-apigateway-integration": {"uri": _lambda_uri(arn)}}
+						}
+					}
+				}
+			)
+		)
+
+		reloaded = APIGatewayRouteIndex.load(config_file)
+		assert reloaded is not first
+		assert reloaded.routes_for("fn") == [APIGatewayRoute("GET", "/fn")]
+
+	def test_should_return_empty_index_when_file_is_missing(self, tmp_path: Path):
+		assert APIGatewayRouteIndex.load(tmp_path / "missing.json").routes_for("fn") == []
@@ -0,0 +1,220 @@
+import asyncio
+import boto3
+import threading
+import time
+from types import SimpleNamespace
+import pytest
+from unittest.mock import MagicMock
+
+from infra_lib.infra.aws_infra import (
+	AsyncBotoClientFactory,
+	AwsService,
+	BotoClientFactory,
+	gather_limited,
+)
+
+
+class ConcurrencyProbe:
+	"""Sync callable recording how many calls overlap."""
+
+	def __init__(self, duration: float = 0.02):
+		self.duration = duration
+		self.active = 0
+		self.peak = 0
+		self._lock = threading.Lock()
+
+	def __call__(self, **kwargs):
+		with self._lock:
+			self.active += 1
+			self.peak = max(self.peak, self.active)
+		time.sleep(self.duration)
+		with self._lock:
+			self.active -= 1
+		return kwargs
+
+
+@pytest.fixture
+def mock_client() -> MagicMock:
+	return MagicMock()
+
+
+@pytest.fixture
+def async_factory(mock_client):
+	factory = MagicMock(spec=BotoClientFactory)
+	factory.client.return_value = mock_client
+	async_factory = AsyncBotoClientFactory(factory, max_concurrency=4)
+	yield async_factory
+	async_factory.close()
+
+
+class TestAsyncBotoClientFactory:
+	def test_should_await_client_calls_off_the_event_loop(self, async_factory, mock_client):
+		loop_thread = threading.get_ident()
+		mock_client.create_queue.side_effect = lambda **kwargs: threading.get_ident()
+
+		async def main():
+			return await async_factory.client(AwsService.SQS).create_queue(QueueName="q")
+
+		assert asyncio.run(main()) != loop_thread
+		mock_client.create_queue.assert_called_once_with(QueueName="q")
+
+	def test_should_bound_concurrent_calls(self, async_factory, mock_client):
+		probe = ConcurrencyProbe()
+		mock_client.create_queue.side_effect = probe
+
+		async def main():
+			sqs = async_factory.client(AwsService.SQS)
+			return await asyncio.gather(*(sqs.create_queue(QueueName=f"q{i}") for i in range(12)))
+
+		results = asyncio.run(main())
+
+		assert len(results) == 12
+		assert 1 < probe.peak <= 4
+
+	def test_should_pass_through_non_callable_attributes(self, async_factory, mock_client):
+		mock_client.exceptions = SimpleNamespace(
+			QueueDoesNotExist=type("QueueDoesNotExist", (Exception,), {})
+		)
+
+		sqs = async_factory.client(AwsService.SQS)
+
+		assert sqs.exceptions is mock_client.exceptions
+
+	def test_should_wrap_sync_utils(self, async_factory):
+		class Util:
+			def add(self, a, b):
+				return a + b
+
+		async def main():
+			return await async_factory.wrap(Util()).add(1, 2)
+
+		assert asyncio.run(main()) == 3
+
+	def test_should_give_each_worker_thread_its_own_resource(self, async_factory):
+		# Hold every call until four run at once, so each lands on its own thread.
+		barrier = threading.Barrier(4, timeout=5)
+
+		def new_resource(service):
+			resource = MagicMock()
+
+			def create_queue(**kwargs):
+				barrier.wait()
+				return threading.get_ident(), resource
+
+			resource.create_queue.side_effect = create_queue
+			return resource
+
+		async_factory._client_factory.new_resource.side_effect = new_resource
+
+		async def main():
+			sqs = async_factory.resource(AwsService.SQS)
+			return await asyncio.gather(*(sqs.create_queue(QueueName=f"q{i}") for i in range(4)))
+
+		results = asyncio.run(main())
+
+		resources_by_thread = dict(results)
+		assert len(resources_by_thread) == 4
+		assert len(set(map(id, resources_by_thread.values()))) == 4
+		async_factory._client_factory.resource.assert_not_called()
+
+	def test_should_build_wrapped_target_once_per_thread(self, async_factory):
+		class Util:
+			def owner(self):
+				return threading.get_ident(), id(self)
+
+		async def main():
+			util = async_factory.wrap_per_thread(Util)
+			return await asyncio.gather(*(util.owner() for _ in range(20)))
+
+		owners = asyncio.run(main())
+
+		targets_by_thread = {}
+		for thread_id, target_id in owners:
+			assert targets_by_thread.setdefault(thread_id, target_id) == target_id
+		assert len(set(targets_by_thread.values())) == len(targets_by_thread)
+
+	def test_should_start_thread_pool_lazily(self, mock_client):
+		async_factory = AsyncBotoClientFactory(MagicMock(spec=BotoClientFactory))
+		assert async_factory._executor is None
+
+		asyncio.run(async_factory.run(lambda: None))
+		assert async_factory._executor is not None
+
+		async_factory.close()
+		assert async_factory._executor is None
+
+	def test_should_only_build_per_thread_targets_on_worker_threads(self, async_factory):
+		loop_thread = threading.get_ident()
+		builder_threads = []
+
+		class Util:
+			def __init__(self):
+				builder_threads.append(threading.get_ident())
+
+			def ping(self):
+				return "pong"
+
+		async def main():
+			util = async_factory.wrap_per_thread(Util)
+			return await asyncio.gather(*(util.ping() for _ in range(8)))
+
+		assert asyncio.run(main()) == ["pong"] * 8
+		assert builder_threads and loop_thread not in builder_threads
+
+	def test_should_rebuild_returned_sub_resources_per_thread(self, async_factory):
+		session = boto3.session.Session(
+			aws_access_key_id="a", aws_secret_access_key="b", region_name="us-east-1"
+		)
+		roots = {}
+
+		def new_resource(service):
+			resource = session.resource(service.value)
+			roots[threading.get_ident()] = resource
+			return resource
+
+		async_factory._client_factory.new_resource.side_effect = new_resource
+		barrier = threading.Barrier(4, timeout=5)
+
+		def owner(obj):
+			barrier.wait()
+			return threading.get_ident(), obj.meta.client, obj.bucket_name, obj.key
+
+		async def main():
+			s3 = async_factory.resource(AwsService.S3)
+			obj = await s3.Object("bucket", "key")
+			return await asyncio.gather(*(obj.run_with_target(owner) for _ in range(4)))
+
+		results = asyncio.run(main())
+
+		assert len({thread_id for thread_id, *_ in results}) == 4
+		for thread_id, client, bucket_name, key in results:
+			assert client is roots[thread_id].meta.client
+			assert (bucket_name, key) == ("bucket", "key")
+
+	def test_should_work_across_event_loops(self, async_factory, mock_client):
+		mock_client.list_queues.return_value = {}
+		sqs = async_factory.client(AwsService.SQS)
+
+		asyncio.run(sqs.list_queues())
+		asyncio.run(sqs.list_queues())
+
+		assert mock_client.list_queues.call_count == 2
+
+
+class TestGatherLimited:
+	def test_should_limit_awaited_coroutines(self):
+		active = 0
+		peak = 0
+
+		async def task(i):
+			nonlocal active, peak
+			active += 1
+			peak = max(peak, active)
+			await asyncio.sleep(0.001)
+			active -= 1
+			return i
+
+		results = asyncio.run(gather_limited((task(i) for i in range(10)), limit=3))
+
+		assert results == list(range(10))
+		assert peak == 3
@@ -1,7 +1,13 @@
 import pytest
 from unittest.mock import MagicMock, patch
 
-from infra_lib.infra.aws_infra import CredentialsProvider, BotoClientFactory, AwsService
+from infra_lib.infra.aws_infra import (
+	AwsCallTelemetry,
+	AwsService,
+	BotoClientFactory,
+	CredentialsProvider,
+	RateLimit,
+)
 
 from ...fixtures import fake_creds
 
@@ -63,6 +69,19 @@ class TestBotoClientFactory:
 		assert resource1 is resource2
 		assert resource1 is mock_resource
 
+	def test_should_create_uncached_resource_on_every_new_resource_call(
+		self, fake_creds, mock_boto_session_cls
+	):
+		mock_session_cls, mock_session = mock_boto_session_cls
+		mock_session.resource.side_effect = lambda *args, **kwargs: MagicMock()
+
+		factory = BotoClientFactory(fake_creds)
+		resource1 = factory.new_resource(AwsService.S3)
+		resource2 = factory.new_resource(AwsService.S3)
+
+		assert resource1 is not resource2
+		assert factory.resource(AwsService.S3) not in (resource1, resource2)
+
 	def test_should_create_different_clients_for_different_services(
 		self, fake_creds, mock_boto_session_cls
 	):
@@ -113,3 +132,36 @@ class TestBotoClientFactory:
 		assert client_1 is mock_s3_client
 		assert resource_1 is mock_s3_client
 		assert resource_1 is not mock_s3_resource
+
+	def test_should_register_rate_limiter_only_for_limited_services(
+		self, fake_creds, mock_boto_session_cls
+	):
+		_, mock_session = mock_boto_session_cls
+		mock_session.client.side_effect = lambda *args, **kwargs: MagicMock()
+		factory = BotoClientFactory(
+			fake_creds,
+			rate_limits={AwsService.LAMBDA: RateLimit(rate_per_sec=10)},
+			telemetry=AwsCallTelemetry(),
+		)
+
+		def before_send_handler(client):
+			return next(
+				c.args[1]
+				for c in client.meta.events.register.call_args_list
+				if c.args[0] == "before-send"
+			)
+
+		lambda_handler = before_send_handler(factory.client(AwsService.LAMBDA))
+		s3_handler = before_send_handler(factory.client(AwsService.S3))
+
+		assert lambda_handler.__self__._bucket.limit == RateLimit(rate_per_sec=10)
+		assert s3_handler.__self__._bucket is None
+
+	def test_should_instrument_resource_clients(self, fake_creds, mock_boto_session_cls):
+		_, mock_session = mock_boto_session_cls
+		mock_resource = MagicMock()
+		mock_session.resource.return_value = mock_resource
+
+		BotoClientFactory(fake_creds).resource(AwsService.S3)
+
+		assert mock_resource.meta.client.meta.events.register.call_count == 3
@@ -43,3 +43,10 @@ class TestCredentialsProvider:
 	def test_should_raise_config_error_when_required_vars_are_missing(self):
 		with pytest.raises(ConfigError, match="Missing required AWS environment variables"):
 			CredentialsProvider.from_env()
+
+	@patch.dict("os.environ", {}, clear=True)
+	def test_should_load_credentials_from_given_mapping(self):
+		creds = CredentialsProvider.from_env(localstack_creds_fixture)
+
+		assert creds.access_key_id == localstack_creds_fixture["AWS_ACCESS_KEY_ID"]
+		assert creds.url == "http://localhost:4566"
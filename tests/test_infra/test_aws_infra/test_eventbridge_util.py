@@ -0,0 +1,257 @@
+import hashlib
+import pytest
+from pathlib import Path
+from unittest.mock import MagicMock
+from botocore.exceptions import ClientError
+
+from infra_lib.exceptions import InfraError
+from infra_lib.infra.aws_infra import AwsService, BotoClientFactory, EventBridgeUtil
+from infra_lib.infra.aws_infra.eventbridge_util import (
+	TEMPLATE_HASH_PARAMETER,
+	EventBridgeStackConfig,
+)
+from infra_lib.infra.enums import InfraEnvironment
+from ...fixtures import fake_creds
+
+TEMPLATE_BODY = '{"Resources": {}}'
+TEMPLATE_HASH = hashlib.sha256(TEMPLATE_BODY.encode("utf-8")).hexdigest()
+MISSING_STACK_ERROR = ClientError(
+	{"Error": {"Code": "ValidationError", "Message": "Stack with id events does not exist"}},
+	"DescribeStacks",
+)
+
+
+@pytest.fixture
+def mock_cfn_client() -> MagicMock:
+	return MagicMock()
+
+
+class ParameterNotFound(Exception):
+	pass
+
+
+@pytest.fixture
+def mock_ssm_client() -> MagicMock:
+	client = MagicMock()
+	client.exceptions.ParameterNotFound = ParameterNotFound
+	_applied_hash(client, TEMPLATE_HASH)
+	return client
+
+
+@pytest.fixture
+def eventbridge_util(
+	fake_creds, mock_cfn_client, mock_ssm_client, tmp_path: Path
+) -> EventBridgeUtil:
+	(tmp_path / "events.json").write_text(TEMPLATE_BODY)
+	factory = MagicMock(spec=BotoClientFactory)
+	factory.client.side_effect = lambda service: {
+		AwsService.CLOUD_FORMATION: mock_cfn_client,
+		AwsService.SSM: mock_ssm_client,
+	}[service]
+	return EventBridgeUtil(
+		creds=fake_creds,
+		aws_localstack_dir=tmp_path,
+		environment=InfraEnvironment.local,
+		client_factory=factory,
+	)
+
+
+@pytest.fixture
+def stack() -> EventBridgeStackConfig:
+	return EventBridgeStackConfig(template_name="events.json", name="events")
+
+
+def _stack(status: str) -> dict:
+	return {"Stacks": [{"StackStatus": status}]}
+
+
+def _applied_hash(ssm_client: MagicMock, template_hash: str):
+	ssm_client.get_parameter.return_value = {"Parameter": {"Value": template_hash}}
+
+
+class TestEventBridgeUtil:
+	def test_should_use_shared_client_factory(self, eventbridge_util, stack, mock_cfn_client):
+		mock_cfn_client.describe_stacks.return_value = _stack("CREATE_COMPLETE")
+
+		eventbridge_util.create_stack(stack)
+
+		eventbridge_util._client_factory.client.assert_called_with(AwsService.CLOUD_FORMATION)
+
+	def test_should_skip_missing_template(self, eventbridge_util, mock_cfn_client):
+		status = eventbridge_util.create_stack(EventBridgeStackConfig("missing.json", "events"))
+
+		assert status is None
+		mock_cfn_client.create_stack.assert_not_called()
+
+	def test_should_create_and_wait_for_new_stack(
+		self, eventbridge_util, stack, mock_cfn_client, mock_ssm_client
+	):
+		mock_cfn_client.describe_stacks.side_effect = [
+			MISSING_STACK_ERROR,
+			_stack("CREATE_COMPLETE"),
+		]
+
+		status = eventbridge_util.create_stack(stack)
+
+		assert status == "CREATE_COMPLETE"
+		mock_cfn_client.create_stack.assert_called_once_with(
+			StackName="events", TemplateBody=TEMPLATE_BODY
+		)
+		mock_ssm_client.put_parameter.assert_called_once_with(
+			Name=TEMPLATE_HASH_PARAMETER.format(stack_name="events"),
+			Value=TEMPLATE_HASH,
+			Type="String",
+			Overwrite=True,
+		)
+
+	def test_should_skip_update_when_template_hash_is_unchanged(
+		self, eventbridge_util, stack, mock_cfn_client
+	):
+		mock_cfn_client.describe_stacks.return_value = _stack("UPDATE_COMPLETE")
+
+		status = eventbridge_util.create_stack(stack)
+
+		assert status == "UPDATE_COMPLETE"
+		mock_cfn_client.create_stack.assert_not_called()
+		mock_cfn_client.create_change_set.assert_not_called()
+
+	def test_should_apply_template_without_recorded_hash(
+		self, eventbridge_util, stack, mock_cfn_client, mock_ssm_client
+	):
+		mock_ssm_client.get_parameter.side_effect = ParameterNotFound
+		mock_cfn_client.describe_stacks.return_value = _stack("UPDATE_COMPLETE")
+		mock_cfn_client.describe_change_set.return_value = {"Status": "CREATE_COMPLETE"}
+
+		eventbridge_util.create_stack(stack)
+
+		mock_cfn_client.execute_change_set.assert_called_once()
+
+	def test_should_wait_for_unchanged_stack_still_in_progress(
+		self, eventbridge_util, stack, mock_cfn_client
+	):
+		mock_cfn_client.describe_stacks.side_effect = [
+			_stack("UPDATE_IN_PROGRESS"),
+			_stack("UPDATE_COMPLETE"),
+		]
+
+		status = eventbridge_util.create_stack(stack)
+
+		assert status == "UPDATE_COMPLETE"
+		mock_cfn_client.create_change_set.assert_not_called()
+
+	def test_should_return_in_progress_status_of_unchanged_stack_without_waiting(
+		self, eventbridge_util, stack, mock_cfn_client
+	):
+		mock_cfn_client.describe_stacks.return_value = _stack("UPDATE_IN_PROGRESS")
+
+		status = eventbridge_util.create_stack(stack, wait=False)
+
+		assert status == "UPDATE_IN_PROGRESS"
+		mock_cfn_client.describe_stacks.assert_called_once()
+
+	def test_should_accept_unchanged_stack_whose_earlier_update_rolled_back(
+		self, eventbridge_util, stack, mock_cfn_client, mock_ssm_client
+	):
+		mock_cfn_client.describe_stacks.return_value = _stack("UPDATE_ROLLBACK_COMPLETE")
+
+		status = eventbridge_util.create_stack(stack)
+
+		assert status == "UPDATE_ROLLBACK_COMPLETE"
+		mock_cfn_client.create_change_set.assert_not_called()
+		mock_ssm_client.put_parameter.assert_not_called()
+
+	def test_should_raise_when_unchanged_stack_ends_failed(
+		self, eventbridge_util, stack, mock_cfn_client
+	):
+		mock_cfn_client.describe_stacks.return_value = _stack("UPDATE_ROLLBACK_FAILED")
+		mock_cfn_client.describe_stack_events.return_value = {"StackEvents": []}
+
+		with pytest.raises(InfraError, match="UPDATE_ROLLBACK_FAILED"):
+			eventbridge_util.create_stack(stack)
+
+	def test_should_raise_and_keep_previous_hash_when_submitted_update_rolls_back(
+		self, eventbridge_util, stack, mock_cfn_client, mock_ssm_client
+	):
+		_applied_hash(mock_ssm_client, "stale")
+		mock_cfn_client.describe_stacks.side_effect = [
+			_stack("UPDATE_COMPLETE"),
+			_stack("UPDATE_ROLLBACK_COMPLETE"),
+		]
+		mock_cfn_client.describe_change_set.return_value = {"Status": "CREATE_COMPLETE"}
+		mock_cfn_client.describe_stack_events.return_value = {"StackEvents": []}
+
+		with pytest.raises(InfraError, match="UPDATE_ROLLBACK_COMPLETE"):
+			eventbridge_util.create_stack(stack)
+
+		mock_ssm_client.put_parameter.assert_not_called()
+
+	def test_should_apply_changed_template_through_change_set(
+		self, eventbridge_util, stack, mock_cfn_client, mock_ssm_client
+	):
+		_applied_hash(mock_ssm_client, "stale")
+		mock_cfn_client.describe_stacks.side_effect = [
+			_stack("CREATE_COMPLETE"),
+			_stack("UPDATE_COMPLETE"),
+		]
+		mock_cfn_client.describe_change_set.return_value = {"Status": "CREATE_COMPLETE"}
+
+		status = eventbridge_util.create_stack(stack)
+
+		assert status == "UPDATE_COMPLETE"
+		change_set_name = mock_cfn_client.create_change_set.call_args.kwargs["ChangeSetName"]
+		assert mock_cfn_client.create_change_set.call_args.kwargs["ChangeSetType"] == "UPDATE"
+		assert "Tags" not in mock_cfn_client.create_change_set.call_args.kwargs
+		mock_cfn_client.execute_change_set.assert_called_once_with(
+			StackName="events", ChangeSetName=change_set_name
+		)
+		mock_ssm_client.put_parameter.assert_called_once()
+
+	def test_should_discard_change_set_without_changes_and_record_hash(
+		self, eventbridge_util, stack, mock_cfn_client, mock_ssm_client
+	):
+		_applied_hash(mock_ssm_client, "stale")
+		mock_cfn_client.describe_stacks.return_value = _stack("CREATE_COMPLETE")
+		mock_cfn_client.describe_change_set.return_value = {
+			"Status": "FAILED",
+			"StatusReason": "The submitted information didn't contain changes.",
+		}
+
+		status = eventbridge_util.create_stack(stack)
+
+		assert status == "CREATE_COMPLETE"
+		mock_cfn_client.delete_change_set.assert_called_once()
+		mock_cfn_client.execute_change_set.assert_not_called()
+		mock_ssm_client.put_parameter.assert_called_once_with(
+			Name=TEMPLATE_HASH_PARAMETER.format(stack_name="events"),
+			Value=TEMPLATE_HASH,
+			Type="String",
+			Overwrite=True,
+		)
+
+	def test_should_raise_with_failure_reasons_when_stack_rolls_back(
+		self, eventbridge_util, stack, mock_cfn_client
+	):
+		mock_cfn_client.describe_stacks.side_effect = [
+			MISSING_STACK_ERROR,
+			_stack("ROLLBACK_COMPLETE"),
+		]
+		mock_cfn_client.describe_stack_events.return_value = {
+			"StackEvents": [
+				{
+					"LogicalResourceId": "Rule",
+					"ResourceStatus": "CREATE_FAILED",
+					"ResourceStatusReason": "bad pattern",
+				}
+			]
+		}
+
+		with pytest.raises(InfraError, match="Rule: bad pattern"):
+			eventbridge_util.create_stack(stack)
+
+	def test_should_create_several_stacks_concurrently(self, eventbridge_util, mock_cfn_client):
+		mock_cfn_client.describe_stacks.return_value = _stack("CREATE_COMPLETE")
+		stacks = [EventBridgeStackConfig("events.json", f"events-{i}") for i in range(3)]
+
+		statuses = eventbridge_util.create_stacks(stacks)
+
+		assert statuses == {f"events-{i}": "CREATE_COMPLETE" for i in range(3)}
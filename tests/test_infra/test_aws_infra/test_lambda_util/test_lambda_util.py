@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 from unittest.mock import MagicMock, patch, mock_open
 from pathlib import Path
@@ -10,7 +11,15 @@ from infra_lib.infra.aws_infra.lambda_util import (
 	AWSLambdaParameters,
 )
 import infra_lib
+from infra_lib.exceptions import InfraError
+from infra_lib.infra.aws_infra.lambda_util.lambda_util import join_function_updates
+from infra_lib.infra.aws_infra.lambda_util.lambda_zip_builder import (
+	DotnetPublishProfile,
+	DotnetZipBuilder,
+	PythonZipBuilder,
+)
 from infra_lib.infra.aws_infra import CredentialsProvider, BotoClientFactory
+from infra_lib.infra.aws_infra.api_gateway_util import APIGatewayRouteIndex
 from infra_lib.infra.enums import InfraEnvironment
 
 from ....fixtures.aws_fixtures import fake_creds
@@ -25,6 +34,42 @@ class MockLambdaClient:
 	def update_function_code(self, **kwargs):
 		pass
 
+	def get_function_configuration(self, **kwargs):
+		pass
+
+	def update_function_configuration(self, **kwargs):
+		pass
+
+	def get_function_concurrency(self, **kwargs):
+		pass
+
+	def put_function_concurrency(self, **kwargs):
+		pass
+
+	def delete_function_concurrency(self, **kwargs):
+		pass
+
+	def publish_version(self, **kwargs):
+		pass
+
+	def get_alias(self, **kwargs):
+		pass
+
+	def create_alias(self, **kwargs):
+		pass
+
+	def update_alias(self, **kwargs):
+		pass
+
+	def get_provisioned_concurrency_config(self, **kwargs):
+		pass
+
+	def put_provisioned_concurrency_config(self, **kwargs):
+		pass
+
+	def delete_provisioned_concurrency_config(self, **kwargs):
+		pass
+
 	def add_permission(self, **kwargs):
 		pass
 
@@ -39,6 +84,9 @@ class MockLambdaClient:
 class MockLambdaExceptions:
 	ResourceConflictException = type("ResourceConflictException", (Exception,), {})
 	ResourceNotFoundException = type("ResourceNotFoundException", (Exception,), {})
+	ProvisionedConcurrencyConfigNotFoundException = type(
+		"ProvisionedConcurrencyConfigNotFoundException", (Exception,), {}
+	)
 
 
 class MockSTSUtil:
@@ -54,6 +102,9 @@ class MockAPIGatewayUtil:
 	def gateway_config_file(self) -> Dict:
 		return {}
 
+	def route_index(self) -> APIGatewayRouteIndex:
+		return APIGatewayRouteIndex({})
+
 	def build_url(self, api_id: str, resource_path: str) -> str:
 		return ""
 
@@ -117,6 +168,12 @@ def mock_lambda_params(tmp_path: Path) -> MagicMock:
 	params.arch = AWSLambdaArchitecture.x86_64
 	params.filtered_env_vars = {"VAR1": "VALUE1"}
 	params.custom_lambda_builder = None
+	params.exclude_patterns = []
+	params.reserved_concurrency = None
+	params.provisioned_concurrency = None
+	params.snap_start = False
+	params.alias_name = "live"
+	params.publishes_versions = False
 	return params
 
 
@@ -152,7 +209,8 @@ class TestLambdaUtil:
 		mock_lambda_params: MagicMock,
 		mock_lambda_builder: MagicMock,
 	):
-		mock_builder_class = MagicMock(return_value=mock_lambda_builder)
+		mock_builder_class = MagicMock()
+		mock_builder_class.from_lambda_params.return_value = mock_lambda_builder
 		mock_default_builders.get.return_value = mock_builder_class
 		mock_lambda_params.custom_lambda_builder = None
 		mock_lambda_params.runtime = "python3.9"
@@ -162,7 +220,7 @@ class TestLambdaUtil:
 		)
 
 		mock_default_builders.get.assert_called_with("python3.9")
-		mock_builder_class.assert_called_once()
+		mock_builder_class.from_lambda_params.assert_called_once_with(mock_lambda_params)
 		mock_lambda_builder.build.assert_called_once()
 		assert zip_path == mock_lambda_builder.build.return_value
 
@@ -189,6 +247,20 @@ class TestLambdaUtil:
 		)
 		assert zip_path == mock_lambda_builder.build.return_value
 
+	def test_should_give_builders_the_context_environment(
+		self, lambda_util: LambdaUtil, mock_lambda_params: MagicMock
+	):
+		environ = {"PATH": "/usr/bin", "AWS_PROFILE": "stage"}
+		lambda_util._environ = environ
+		custom_builder = PythonZipBuilder()
+		mock_lambda_params.custom_lambda_builder = custom_builder
+
+		assert lambda_util._lambda_builder(mock_lambda_params).environ == environ
+		assert custom_builder.environ is None
+
+		mock_lambda_params.custom_lambda_builder = None
+		assert lambda_util._lambda_builder(mock_lambda_params).environ == environ
+
 	@patch("shutil.rmtree")
 	@patch("pathlib.Path.mkdir")
 	@patch("infra_lib.infra.aws_infra.lambda_util.lambda_util.DEFAULT_BUILDER_BY_RUNTIME", {})
@@ -227,6 +299,7 @@ class TestLambdaUtil:
 			Environment={"Variables": mock_lambda_params.filtered_env_vars},
 			MemorySize=mock_lambda_params.memory_size,
 			Timeout=mock_lambda_params.timeout_secs,
+			Architectures=["x86_64"],
 		)
 
 	@patch("builtins.open", new_callable=mock_open, read_data=b"test-zip-bytes")
@@ -249,8 +322,9 @@ class TestLambdaUtil:
 		self, mock_file: MagicMock, lambda_util: LambdaUtil, mock_lambda_params: MagicMock
 	):
 		mock_lambda_client = lambda_util._lambda_client
-		mock_waiter = MagicMock()
-		mock_lambda_client.get_waiter.return_value = mock_waiter
+		mock_lambda_client.get_function_configuration.return_value = {
+			"LastUpdateStatus": "Successful"
+		}
 		fake_zip_path = "/fake/lambda.zip"
 
 		lambda_util._update_lambda_code(
@@ -262,11 +336,10 @@ class TestLambdaUtil:
 			FunctionName=mock_lambda_params.function_name,
 			ZipFile=b"new-zip-bytes",
 		)
-		mock_lambda_client.get_waiter.assert_called_once_with("function_updated")
-		mock_waiter.wait.assert_called_once_with(
-			FunctionName=mock_lambda_params.function_name,
-			WaiterConfig={"Delay": 5, "MaxAttempts": 12},
+		mock_lambda_client.get_function_configuration.assert_called_once_with(
+			FunctionName=mock_lambda_params.function_name
 		)
+		mock_lambda_client.get_waiter.assert_not_called()
 
 	def test_should_add_apigateway_permission_correctly(self, lambda_util: LambdaUtil):
 		mock_lambda_client = lambda_util._lambda_client
@@ -286,8 +359,20 @@ class TestLambdaUtil:
 			SourceArn=expected_source_arn,
 		)
 
+	def test_should_add_apigateway_permissions_concurrently(self, lambda_util: LambdaUtil):
+		mock_lambda_client = lambda_util._lambda_client
+
+		asyncio.run(lambda_util.add_apigateway_permissions_async(["fn-a", "fn-b", "fn-c"]))
+
+		assert sorted(
+			c.kwargs["FunctionName"] for c in mock_lambda_client.add_permission.call_args_list
+		) == ["fn-a", "fn-b", "fn-c"]
+		assert {
+			c.kwargs["StatementId"] for c in mock_lambda_client.add_permission.call_args_list
+		} == {"apigateway-access"}
+
 	def test_should_log_api_gateway_path_when_found(
-		self, lambda_util: LambdaUtil, mock_apigw_util_class: MagicMock
+		self, mock_apigw_util_class: MagicMock, lambda_util: LambdaUtil
 	):
 		lambda_name = "my-test-lambda"
 		api_id = "my-api-id"
@@ -295,17 +380,19 @@ class TestLambdaUtil:
 		expected_url = f"http://local-test.com{resource_path}"
 
 		mock_apigw_util = mock_apigw_util_class
-		mock_apigw_util.gateway_config_file.return_value = {
-			"paths": {
-				resource_path: {
-					"get": {
-						"x-amazon-apigateway-integration": {
-							"uri": f"arn:aws:apigateway:us-east-1:lambda:path/2015-03-31/functions/arn:aws:lambda:us-east-1:123456789012:function:{lambda_name}/invocations"
+		mock_apigw_util.route_index.return_value = APIGatewayRouteIndex.from_definition(
+			{
+				"paths": {
+					resource_path: {
+						"get": {
+							"x-amazon-apigateway-integration": {
+								"uri": f"arn:aws:apigateway:us-east-1:lambda:path/2015-03-31/functions/arn:aws:lambda:us-east-1:123456789012:function:{lambda_name}/invocations"
+							}
 						}
 					}
 				}
 			}
-		}
+		)
 		mock_apigw_util.build_url.return_value = expected_url
 
 		with patch.object(
@@ -313,10 +400,351 @@ class TestLambdaUtil:
 		) as mock_logger_info:
 			lambda_util._log_lambda_paths_from_apigateway(lambda_name, api_id)
 
-		mock_apigw_util.gateway_config_file.assert_called_once()
+		mock_apigw_util.route_index.assert_called_once()
 		mock_apigw_util.build_url.assert_called_once_with(
 			api_id=api_id, resource_path=resource_path
 		)
 
 		mock_logger_info.assert_any_call(f"Mapped Lambda '{lambda_name}' to GET {resource_path}")
 		mock_logger_info.assert_any_call(f"API endpoint: {expected_url}")
+
+	def test_should_log_every_route_mapped_to_lambda(
+		self, mock_apigw_util_class: MagicMock, lambda_util: LambdaUtil
+	):
+		uri = "arn:aws:apigateway:us-east-1:lambda:path/2015-03-31/functions/arn:aws:lambda:us-east-1:123456789012:function:{}/invocations"
+		mock_apigw_util_class.route_index.return_value = APIGatewayRouteIndex.from_definition(
+			{
+				"paths": {
+					"/a": {"get": {"x-amazon-apigateway-integration": {"uri": uri.format("fn")}}},
+					"/b": {"post": {"x-amazon-apigateway-integration": {"uri": uri.format("fn")}}},
+					"/c": {
+						"get": {"x-amazon-apigateway-integration": {"uri": uri.format("fn-v2")}}
+					},
+				}
+			}
+		)
+
+		with patch.object(
+			infra_lib.infra.aws_infra.lambda_util.lambda_util.logger, "info"
+		) as mock_logger_info:
+			lambda_util._log_lambda_paths_from_apigateway("fn", "api")
+
+		logged = [c.args[0] for c in mock_logger_info.call_args_list]
+		assert "Mapped Lambda 'fn' to GET /a" in logged
+		assert "Mapped Lambda 'fn' to POST /b" in logged
+		assert not any("/c" in message for message in logged)
+
+
+class TestLambdaUtilEnsure:
+	ZIP_BYTES = b"zip-bytes"
+	ZIP_SHA256 = "S5pKxZ88OqMicyYN9s9L81jRxG+EFRJqo1tjgNCruPc="
+
+	@pytest.fixture
+	def ensure_util(
+		self, mock_apigw_util_class, lambda_util: LambdaUtil, mock_lambda_builder, tmp_path
+	) -> LambdaUtil:
+		zip_path = tmp_path / "lambda.zip"
+		zip_path.write_bytes(self.ZIP_BYTES)
+		lambda_util._build_lambda = MagicMock(return_value=zip_path)
+		return lambda_util
+
+	def _current_config(self, mock_lambda_params, **overrides) -> Dict:
+		config = {
+			"MemorySize": mock_lambda_params.memory_size,
+			"Timeout": mock_lambda_params.timeout_secs,
+			"Handler": mock_lambda_params.handler,
+			"Runtime": mock_lambda_params.runtime,
+			"Environment": {"Variables": dict(mock_lambda_params.filtered_env_vars)},
+			"Architectures": ["x86_64"],
+			"CodeSha256": self.ZIP_SHA256,
+		}
+		config.update(overrides)
+		return config
+
+	def test_should_create_function_when_missing(self, ensure_util, mock_lambda_params):
+		client = ensure_util._lambda_client
+		client.get_function_configuration.side_effect = client.exceptions.ResourceNotFoundException
+
+		ensure_util.ensure_lambda(mock_lambda_params)
+
+		client.create_function.assert_called_once()
+		client.update_function_configuration.assert_not_called()
+		client.update_function_code.assert_not_called()
+
+	def test_should_skip_updates_when_function_is_up_to_date(self, ensure_util, mock_lambda_params):
+		client = ensure_util._lambda_client
+		client.get_function_configuration.return_value = self._current_config(mock_lambda_params)
+
+		ensure_util.ensure_lambda(mock_lambda_params)
+
+		client.update_function_configuration.assert_not_called()
+		client.update_function_code.assert_not_called()
+		client.get_function_configuration.assert_called_once()
+
+	def test_should_update_only_changed_configuration(self, ensure_util, mock_lambda_params):
+		client = ensure_util._lambda_client
+		client.get_function_configuration.return_value = self._current_config(
+			mock_lambda_params, MemorySize=128, Environment={"Variables": {"OLD": "1"}}
+		)
+
+		ensure_util.ensure_lambda(mock_lambda_params)
+
+		client.update_function_configuration.assert_called_once_with(
+			FunctionName="test-lambda",
+			MemorySize=256,
+			Environment={"Variables": {"VAR1": "VALUE1"}},
+		)
+		client.update_function_code.assert_not_called()
+		assert client.get_function_configuration.call_count == 2
+
+	def test_should_wait_between_configuration_and_code_updates(
+		self, ensure_util, mock_lambda_params
+	):
+		client = ensure_util._lambda_client
+		client.get_function_configuration.return_value = self._current_config(
+			mock_lambda_params, Timeout=30, CodeSha256="stale"
+		)
+
+		ensure_util.ensure_lambda(mock_lambda_params)
+
+		client.update_function_code.assert_called_once_with(
+			FunctionName="test-lambda", ZipFile=self.ZIP_BYTES, Architectures=["x86_64"]
+		)
+		assert client.get_function_configuration.call_count == 3
+
+	def test_should_upload_code_when_architecture_changes(self, ensure_util, mock_lambda_params):
+		client = ensure_util._lambda_client
+		client.get_function_configuration.return_value = self._current_config(
+			mock_lambda_params, Architectures=["arm64"]
+		)
+
+		ensure_util.ensure_lambda(mock_lambda_params)
+
+		client.update_function_configuration.assert_not_called()
+		client.update_function_code.assert_called_once()
+		assert client.get_function_configuration.call_count == 2
+
+
+class TestLambdaUtilCustomRuntime:
+	@patch("builtins.open", new_callable=mock_open, read_data=b"zip")
+	def test_should_create_native_aot_function_on_custom_runtime(
+		self, mock_file: MagicMock, lambda_util: LambdaUtil, mock_lambda_params: MagicMock
+	):
+		mock_lambda_params.runtime = "dotnet8"
+		mock_lambda_params.custom_lambda_builder = DotnetZipBuilder(DotnetPublishProfile.native_aot)
+
+		lambda_util._create_lambda("/fake/lambda.zip", "role", mock_lambda_params)
+
+		kwargs = lambda_util._lambda_client.create_function.call_args.kwargs
+		assert kwargs["Runtime"] == "provided.al2023"
+		assert kwargs["Handler"] == "bootstrap"
+
+	def test_should_keep_managed_runtime_for_ready_to_run(
+		self, lambda_util: LambdaUtil, mock_lambda_params: MagicMock
+	):
+		mock_lambda_params.runtime = "dotnet8"
+		mock_lambda_params.custom_lambda_builder = DotnetZipBuilder(
+			DotnetPublishProfile.ready_to_run
+		)
+
+		changes = lambda_util._configuration_changes(
+			{"Runtime": "provided.al2023", "Handler": "bootstrap"}, mock_lambda_params
+		)
+
+		assert changes["Runtime"] == "dotnet8"
+		assert changes["Handler"] == "My.Lambda::Handler"
+
+
+class TestLambdaUtilConcurrency:
+	@pytest.fixture
+	def client(self, lambda_util: LambdaUtil) -> MagicMock:
+		client = lambda_util._lambda_client
+		client.get_function_configuration.return_value = {"LastUpdateStatus": "Successful"}
+		client.get_function_concurrency.return_value = {}
+		client.publish_version.return_value = {"Version": "3"}
+		return client
+
+	def test_should_only_apply_reserved_concurrency_without_published_versions(
+		self, lambda_util: LambdaUtil, client: MagicMock, mock_lambda_params: MagicMock
+	):
+		mock_lambda_params.reserved_concurrency = 10
+
+		lambda_util._reconcile_concurrency(mock_lambda_params)
+
+		client.put_function_concurrency.assert_called_once_with(
+			FunctionName="test-lambda", ReservedConcurrentExecutions=10
+		)
+		client.publish_version.assert_not_called()
+
+	def test_should_remove_reserved_concurrency_when_unset(
+		self, lambda_util: LambdaUtil, client: MagicMock, mock_lambda_params: MagicMock
+	):
+		client.get_function_concurrency.return_value = {"ReservedConcurrentExecutions": 5}
+
+		lambda_util._reconcile_concurrency(mock_lambda_params)
+
+		client.delete_function_concurrency.assert_called_once_with(FunctionName="test-lambda")
+
+	def test_should_remove_provisioned_concurrency_when_no_longer_publishing(
+		self, lambda_util: LambdaUtil, client: MagicMock, mock_lambda_params: MagicMock
+	):
+		client.get_alias.return_value = {"FunctionVersion": "3"}
+		client.get_provisioned_concurrency_config.return_value = {
+			"RequestedProvisionedConcurrentExecutions": 2
+		}
+
+		lambda_util._reconcile_concurrency(mock_lambda_params)
+
+		client.delete_provisioned_concurrency_config.assert_called_once_with(
+			FunctionName="test-lambda", Qualifier="live"
+		)
+		client.publish_version.assert_not_called()
+
+	def test_should_skip_provisioned_concurrency_without_alias(
+		self, lambda_util: LambdaUtil, client: MagicMock, mock_lambda_params: MagicMock
+	):
+		client.get_alias.side_effect = client.exceptions.ResourceNotFoundException
+
+		lambda_util._reconcile_concurrency(mock_lambda_params)
+
+		client.get_provisioned_concurrency_config.assert_not_called()
+		client.delete_provisioned_concurrency_config.assert_not_called()
+
+	def test_should_reject_snap_start_with_provisioned_concurrency(self, tmp_path):
+		with pytest.raises(ValueError, match="SnapStart cannot be combined"):
+			AWSLambdaParameters(
+				function_name="fn",
+				memory_size=128,
+				timeout_secs=3,
+				project_root=tmp_path,
+				handler="handler.handler",
+				api_id=None,
+				environment=InfraEnvironment.local,
+				runtime="java21",
+				arch=AWSLambdaArchitecture.x86_64,
+				env_vars={},
+				provisioned_concurrency=2,
+				snap_start=True,
+			)
+
+	def test_should_publish_version_create_alias_and_provision_concurrency(
+		self, lambda_util: LambdaUtil, client: MagicMock, mock_lambda_params: MagicMock
+	):
+		mock_lambda_params.provisioned_concurrency = 2
+		mock_lambda_params.publishes_versions = True
+		client.get_alias.side_effect = client.exceptions.ResourceNotFoundException
+		client.get_provisioned_concurrency_config.side_effect = (
+			client.exceptions.ProvisionedConcurrencyConfigNotFoundException
+		)
+
+		lambda_util._reconcile_concurrency(mock_lambda_params)
+
+		client.create_alias.assert_called_once_with(
+			FunctionName="test-lambda", Name="live", FunctionVersion="3"
+		)
+		client.put_provisioned_concurrency_config.assert_called_once_with(
+			FunctionName="test-lambda", Qualifier="live", ProvisionedConcurrentExecutions=2
+		)
+
+	def test_should_leave_alias_and_concurrency_alone_when_already_applied(
+		self, lambda_util: LambdaUtil, client: MagicMock, mock_lambda_params: MagicMock
+	):
+		mock_lambda_params.provisioned_concurrency = 2
+		mock_lambda_params.publishes_versions = True
+		client.get_alias.return_value = {"FunctionVersion": "3"}
+		client.get_provisioned_concurrency_config.return_value = {
+			"RequestedProvisionedConcurrentExecutions": 2
+		}
+
+		lambda_util._reconcile_concurrency(mock_lambda_params)
+
+		client.create_alias.assert_not_called()
+		client.update_alias.assert_not_called()
+		client.put_provisioned_concurrency_config.assert_not_called()
+
+	def test_should_move_alias_to_new_version(
+		self, lambda_util: LambdaUtil, client: MagicMock, mock_lambda_params: MagicMock
+	):
+		mock_lambda_params.snap_start = True
+		mock_lambda_params.publishes_versions = True
+		client.get_alias.return_value = {"FunctionVersion": "2"}
+		client.get_provisioned_concurrency_config.side_effect = (
+			client.exceptions.ProvisionedConcurrencyConfigNotFoundException
+		)
+
+		lambda_util._reconcile_concurrency(mock_lambda_params)
+
+		client.update_alias.assert_called_once_with(
+			FunctionName="test-lambda", Name="live", FunctionVersion="3"
+		)
+		client.delete_provisioned_concurrency_config.assert_not_called()
+
+	def test_should_enable_snap_start_through_configuration_update(
+		self, lambda_util: LambdaUtil, mock_lambda_params: MagicMock
+	):
+		mock_lambda_params.snap_start = True
+
+		changes = lambda_util._configuration_changes(
+			{
+				"MemorySize": 256,
+				"Timeout": 60,
+				"Handler": "My.Lambda::Handler",
+				"Runtime": "python3.9",
+				"Environment": {"Variables": {"VAR1": "VALUE1"}},
+			},
+			mock_lambda_params,
+		)
+
+		assert changes == {"SnapStart": {"ApplyOn": "PublishedVersions"}}
+
+
+class TestLambdaUtilUpdateWait:
+	@pytest.fixture(autouse=True)
+	def no_sleep(self):
+		with patch("infra_lib.utils.polling.time.sleep"):
+			yield
+
+	def test_should_poll_until_update_is_no_longer_in_progress(self, lambda_util: LambdaUtil):
+		client = lambda_util._lambda_client
+		client.get_function_configuration.side_effect = [
+			{"LastUpdateStatus": "InProgress"},
+			{"LastUpdateStatus": "InProgress"},
+			{"LastUpdateStatus": "Successful", "FunctionName": "fn"},
+		]
+
+		config = lambda_util.wait_for_function_updated("fn")
+
+		assert config["FunctionName"] == "fn"
+		assert client.get_function_configuration.call_count == 3
+
+	def test_should_raise_when_update_failed(self, lambda_util: LambdaUtil):
+		lambda_util._lambda_client.get_function_configuration.return_value = {
+			"LastUpdateStatus": "Failed",
+			"LastUpdateStatusReason": "bad zip",
+		}
+
+		with pytest.raises(InfraError, match="bad zip"):
+			lambda_util.wait_for_function_updated("fn")
+
+	def test_should_wait_for_many_functions_together(self, lambda_util: LambdaUtil):
+		lambda_util._lambda_client.get_function_configuration.side_effect = lambda FunctionName: {
+			"FunctionName": FunctionName,
+			"LastUpdateStatus": "Successful",
+		}
+
+		results = lambda_util.wait_for_functions_updated([f"fn-{i}" for i in range(20)])
+
+		assert sorted(results) == sorted(f"fn-{i}" for i in range(20))
+		assert results["fn-7"]["FunctionName"] == "fn-7"
+
+	@patch("builtins.open", new_callable=mock_open, read_data=b"zip")
+	def test_should_return_future_when_not_waiting(
+		self, mock_file: MagicMock, lambda_util: LambdaUtil
+	):
+		lambda_util._lambda_client.get_function_configuration.return_value = {
+			"LastUpdateStatus": "Successful"
+		}
+
+		future = lambda_util._update_lambda_code("/fake/lambda.zip", "fn", wait=False)
+
+		assert join_function_updates({"fn": future}) == {"fn": {"LastUpdateStatus": "Successful"}}
@@ -0,0 +1,503 @@
+import errno
+import hashlib
+import os
+import pytest
+from pathlib import Path
+import sys
+from unittest.mock import MagicMock, patch
+import zipfile
+
+from infra_lib.infra.aws_infra.lambda_util import AWSLambdaArchitecture
+from infra_lib.infra.aws_infra.lambda_util.lambda_zip_builder.file_stager import FileStager
+from infra_lib.infra.aws_infra.lambda_util.lambda_zip_builder import (
+	DotnetPublishProfile,
+	DotnetZipBuilder,
+	LambdaIgnoreRules,
+	PythonPackagePolicy,
+	PythonZipBuilder,
+)
+
+DOTNET_MODULE = "infra_lib.infra.aws_infra.lambda_util.lambda_zip_builder.dotnet_lambda_zip_builder"
+PYTHON_MODULE = "infra_lib.infra.aws_infra.lambda_util.lambda_zip_builder.python_lambda_zip_builder"
+
+
+@pytest.fixture
+def dotnet_project(tmp_path: Path) -> Path:
+	project_root = tmp_path / "MyLambda"
+	project_root.mkdir()
+	(project_root / "MyLambda.csproj").write_text("<Project />")
+	return project_root
+
+
+@pytest.fixture
+def mock_run_command():
+	with patch(f"{DOTNET_MODULE}.run_command") as mock_run:
+		yield mock_run
+
+
+def _fake_publish(files: dict):
+	"""Side effect writing `files` into the `-o` directory of a `dotnet publish` command."""
+
+	def publish(cmd: str, **kwargs):
+		args = cmd.split()
+		publish_dir = Path(args[args.index("-o") + 1])
+		for name, content in files.items():
+			(publish_dir / name).parent.mkdir(parents=True, exist_ok=True)
+			(publish_dir / name).write_text(content)
+
+	return publish
+
+
+class TestDotnetZipBuilder:
+	@pytest.mark.parametrize(
+		"profile, arch, expected_args",
+		[
+			(
+				DotnetPublishProfile.framework,
+				AWSLambdaArchitecture.x86_64,
+				"-r linux-x64 --self-contained false",
+			),
+			(
+				DotnetPublishProfile.ready_to_run,
+				AWSLambdaArchitecture.arm64,
+				"-r linux-arm64 --self-contained false -p:PublishReadyToRun=true",
+			),
+			(
+				DotnetPublishProfile.self_contained_trimmed,
+				AWSLambdaArchitecture.x86_64,
+				"-r linux-x64 --self-contained true -p:PublishTrimmed=true",
+			),
+			(
+				DotnetPublishProfile.native_aot,
+				AWSLambdaArchitecture.arm64,
+				"-r linux-arm64 --self-contained true -p:PublishAot=true -p:StripSymbols=true",
+			),
+		],
+	)
+	def test_should_publish_with_profile_and_runtime_identifier(
+		self, profile, arch, expected_args, dotnet_project, mock_run_command, tmp_path
+	):
+		build_dir = tmp_path / "build"
+		build_dir.mkdir()
+		mock_run_command.side_effect = _fake_publish({"MyLambda": ""})
+
+		DotnetZipBuilder(profile).build(dotnet_project, build_dir, tmp_path / "out", arch)
+
+		assert mock_run_command.call_args.args[0].endswith(expected_args)
+
+	def test_should_rename_app_host_to_bootstrap_for_custom_runtime(
+		self, dotnet_project, mock_run_command, tmp_path
+	):
+		build_dir = tmp_path / "build"
+		build_dir.mkdir()
+		mock_run_command.side_effect = _fake_publish({"MyLambda": "exe"})
+
+		DotnetZipBuilder(DotnetPublishProfile.native_aot).build(
+			dotnet_project, build_dir, tmp_path / "out", AWSLambdaArchitecture.x86_64
+		)
+
+		assert (build_dir / "bootstrap").read_text() == "exe"
+		assert not (build_dir / "MyLambda").exists()
+
+	def test_should_raise_when_custom_runtime_output_has_no_executable(
+		self, dotnet_project, mock_run_command, tmp_path
+	):
+		build_dir = tmp_path / "build"
+		build_dir.mkdir()
+
+		with pytest.raises(FileNotFoundError, match="bootstrap"):
+			DotnetZipBuilder(DotnetPublishProfile.self_contained_trimmed).build(
+				dotnet_project, build_dir, tmp_path / "out", AWSLambdaArchitecture.x86_64
+			)
+
+	def test_should_target_custom_runtime_only_for_self_contained_profiles(self):
+		assert DotnetZipBuilder().target_runtime("dotnet8") == "dotnet8"
+		assert (
+			DotnetZipBuilder(DotnetPublishProfile.native_aot).target_runtime("dotnet8")
+			== "provided.al2023"
+		)
+
+	def test_should_skip_restore_while_restore_inputs_are_unchanged(
+		self, dotnet_project, mock_run_command, tmp_path
+	):
+		builder = DotnetZipBuilder()
+		build_dir = tmp_path / "build"
+		(dotnet_project / "obj").mkdir()
+		(dotnet_project / "obj" / "project.assets.json").write_text("{}")
+
+		builder.build(dotnet_project, build_dir, tmp_path / "out", AWSLambdaArchitecture.x86_64)
+		builder.build(dotnet_project, build_dir, tmp_path / "out", AWSLambdaArchitecture.x86_64)
+		(dotnet_project / "MyLambda.csproj").write_text("<Project><ItemGroup /></Project>")
+		builder.build(dotnet_project, build_dir, tmp_path / "out", AWSLambdaArchitecture.x86_64)
+
+		commands = [c.args[0] for c in mock_run_command.call_args_list]
+		assert ["--no-restore" in cmd for cmd in commands] == [False, True, False]
+
+	def test_should_restore_when_referenced_project_or_ancestor_props_change(
+		self, dotnet_project, mock_run_command, tmp_path
+	):
+		shared = tmp_path / "Shared"
+		shared.mkdir()
+		(shared / "Shared.csproj").write_text("<Project />")
+		(dotnet_project / "MyLambda.csproj").write_text(
+			'<Project><ItemGroup><ProjectReference Include="..\\Shared\\Shared.csproj" />'
+			"</ItemGroup></Project>"
+		)
+		(dotnet_project / "obj").mkdir()
+		(dotnet_project / "obj" / "project.assets.json").write_text("{}")
+		builder = DotnetZipBuilder()
+
+		def build():
+			builder.build(
+				dotnet_project, tmp_path / "build", tmp_path / "out", AWSLambdaArchitecture.x86_64
+			)
+
+		build()
+		build()
+		(shared / "Shared.csproj").write_text("<Project><ItemGroup /></Project>")
+		build()
+		(tmp_path / "Directory.Packages.props").write_text("<Project />")
+		build()
+		(shared / "packages.lock.json").write_text("{}")
+		build()
+
+		commands = [c.args[0] for c in mock_run_command.call_args_list]
+		assert ["--no-restore" in cmd for cmd in commands] == [False, True, False, False, False]
+
+	def test_should_use_persistent_nuget_package_cache(
+		self, dotnet_project, mock_run_command, tmp_path
+	):
+		DotnetZipBuilder(cache_dir=tmp_path / "cache").build(
+			dotnet_project, tmp_path / "build", tmp_path / "out", AWSLambdaArchitecture.x86_64
+		)
+
+		env_vars = mock_run_command.call_args.kwargs["env_vars"]
+		assert env_vars["NUGET_PACKAGES"] == str(tmp_path / "cache" / "nuget-packages")
+
+	def test_should_publish_with_builder_environment(
+		self, dotnet_project, mock_run_command, tmp_path, monkeypatch
+	):
+		monkeypatch.setenv("PROCESS_ONLY", "1")
+		builder = DotnetZipBuilder(cache_dir=tmp_path / "cache")
+		builder.environ = {"PATH": os.environ["PATH"], "AWS_PROFILE": "stage"}
+
+		builder.build(
+			dotnet_project, tmp_path / "build", tmp_path / "out", AWSLambdaArchitecture.x86_64
+		)
+
+		assert mock_run_command.call_args.kwargs["env_vars"] == {
+			"PATH": os.environ["PATH"],
+			"AWS_PROFILE": "stage",
+			"NUGET_PACKAGES": str(tmp_path / "cache" / "nuget-packages"),
+		}
+
+	def test_should_sync_only_changed_files_and_remove_stale_ones(
+		self, dotnet_project, mock_run_command, tmp_path
+	):
+		builder = DotnetZipBuilder()
+		build_dir = tmp_path / "build"
+		mock_run_command.side_effect = _fake_publish({"a.dll": "a", "old.dll": "old"})
+		builder.build(dotnet_project, build_dir, tmp_path / "out", AWSLambdaArchitecture.x86_64)
+
+		mock_run_command.side_effect = _fake_publish({"a.dll": "a2", "sub/b.dll": "b"})
+		builder.build(dotnet_project, build_dir, tmp_path / "out", AWSLambdaArchitecture.x86_64)
+
+		assert sorted(str(p.relative_to(build_dir)) for p in build_dir.rglob("*.dll")) == [
+			"a.dll",
+			"sub/b.dll",
+		]
+		assert (build_dir / "a.dll").read_text() == "a2"
+
+	def test_should_sync_changed_file_with_same_size_and_mtime(
+		self, dotnet_project, mock_run_command, tmp_path
+	):
+		def publish(content: str):
+			def side_effect(cmd: str, **kwargs):
+				_fake_publish({"a.dll": content})(cmd)
+				args = cmd.split()
+				os.utime(Path(args[args.index("-o") + 1]) / "a.dll", (1_000_000, 1_000_000))
+
+			return side_effect
+
+		builder = DotnetZipBuilder()
+		build_dir = tmp_path / "build"
+		mock_run_command.side_effect = publish("v1")
+		builder.build(dotnet_project, build_dir, tmp_path / "out", AWSLambdaArchitecture.x86_64)
+
+		mock_run_command.side_effect = publish("v2")
+		builder.build(dotnet_project, build_dir, tmp_path / "out", AWSLambdaArchitecture.x86_64)
+
+		assert (build_dir / "a.dll").read_text() == "v2"
+
+	def test_should_build_chosen_project_file(self, dotnet_project, mock_run_command, tmp_path):
+		(dotnet_project / "Other.csproj").write_text("<Project />")
+
+		DotnetZipBuilder(project_file="Other.csproj").build(
+			dotnet_project, tmp_path / "build", tmp_path / "out", AWSLambdaArchitecture.x86_64
+		)
+
+		assert str(dotnet_project / "Other.csproj") in mock_run_command.call_args.args[0]
+
+	def test_should_raise_when_project_file_is_ambiguous(
+		self, dotnet_project, mock_run_command, tmp_path
+	):
+		(dotnet_project / "Other.csproj").write_text("<Project />")
+
+		with pytest.raises(ValueError, match="project_file"):
+			DotnetZipBuilder().build(
+				dotnet_project, tmp_path / "build", tmp_path / "out", AWSLambdaArchitecture.x86_64
+			)
+
+
+@pytest.fixture
+def python_project(tmp_path: Path) -> Path:
+	project_root = tmp_path / "my_lambda"
+	files = {
+		"handler.py": "def handler(event, context):\n    return event\n",
+		"pkg/__init__.py": "",
+		"pkg/api.pyi": "def f() -> int: ...\n",
+		"pkg/py.typed": "",
+		"pkg/README.md": "# docs\n",
+		"pkg/__pycache__/api.cpython-36.pyc": "stale",
+		"tests/test_handler.py": "def test(): pass\n",
+		"docs/index.rst": "Docs\n",
+		"lib-1.0.dist-info/METADATA": "Name: lib\n",
+		"lib-1.0.dist-info/RECORD": "pkg/__init__.py,,\nlib-1.0.dist-info/METADATA,,\n",
+		"pkg/tests/test_api.py": "def test(): pass\n",
+		"pkg/docs/index.rst": "Docs\n",
+		"app/docs/__init__.py": "",
+	}
+	for name, content in files.items():
+		(project_root / name).parent.mkdir(parents=True, exist_ok=True)
+		(project_root / name).write_text(content)
+	return project_root
+
+
+class TestPythonZipBuilder:
+	LOCAL_VERSION = f"{sys.version_info.major}.{sys.version_info.minor}"
+
+	def _zip_names(self, zip_path: Path) -> set:
+		with zipfile.ZipFile(zip_path) as zipf:
+			return set(zipf.namelist())
+
+	def test_should_strip_dead_weight_and_compile_for_target_runtime(
+		self, python_project, tmp_path
+	):
+		builder = PythonZipBuilder(python_version=self.LOCAL_VERSION)
+
+		zip_path = builder.build(
+			python_project, tmp_path / "build", tmp_path / "out", AWSLambdaArchitecture.x86_64
+		)
+
+		names = self._zip_names(zip_path)
+		tag = sys.implementation.cache_tag
+		assert f"__pycache__/handler.{tag}.pyc" in names
+		assert "lib-1.0.dist-info/METADATA" in names
+		for stripped in (
+			"pkg/api.pyi",
+			"pkg/py.typed",
+			"pkg/README.md",
+			"pkg/__pycache__/api.cpython-36.pyc",
+			"pkg/tests/test_api.py",
+			"pkg/docs/index.rst",
+			"lib-1.0.dist-info/RECORD",
+		):
+			assert stripped not in names
+
+	def test_should_never_strip_project_sources(self, python_project, tmp_path):
+		builder = PythonZipBuilder(python_version=self.LOCAL_VERSION)
+
+		zip_path = builder.build(
+			python_project, tmp_path / "build", tmp_path / "out", AWSLambdaArchitecture.x86_64
+		)
+
+		names = self._zip_names(zip_path)
+		assert {"app/docs/__init__.py", "tests/test_handler.py", "docs/index.rst"} <= names
+
+	def test_should_produce_identical_zip_for_unchanged_sources(self, python_project, tmp_path):
+		builder = PythonZipBuilder(python_version=self.LOCAL_VERSION)
+		(python_project / "bootstrap").write_text("#!/bin/sh\n")
+		(python_project / "bootstrap").chmod(0o755)
+
+		def build(name: str):
+			zip_path = builder.build(
+				python_project,
+				tmp_path / name,
+				tmp_path / f"out-{name}",
+				AWSLambdaArchitecture.x86_64,
+			)
+			return hashlib.sha256(zip_path.read_bytes()).hexdigest(), zip_path
+
+		first_hash, first_zip = build("first")
+		for path in python_project.rglob("*"):
+			os.utime(path, (1_000_000_000, 1_000_000_000))
+		second_hash, _ = build("second")
+
+		assert first_hash == second_hash
+		with zipfile.ZipFile(first_zip) as zipf:
+			assert zipf.getinfo("bootstrap").external_attr >> 16 & 0o777 == 0o755
+			assert zipf.getinfo("handler.py").external_attr >> 16 & 0o777 == 0o644
+
+	def test_should_keep_everything_when_policy_disables_stripping(self, python_project, tmp_path):
+		policy = PythonPackagePolicy(
+			compile_bytecode=False,
+			strip_tests=False,
+			strip_docs=False,
+			strip_type_stubs=False,
+			slim_dist_info=False,
+		)
+
+		zip_path = PythonZipBuilder(policy=policy).build(
+			python_project, tmp_path / "build", tmp_path / "out", AWSLambdaArchitecture.x86_64
+		)
+
+		names = self._zip_names(zip_path)
+		assert {"pkg/api.pyi", "tests/test_handler.py", "lib-1.0.dist-info/RECORD"} <= names
+		assert not any(name.endswith(".pyc") for name in names)
+
+	def test_should_skip_bytecode_when_target_interpreter_is_missing(
+		self, python_project, tmp_path
+	):
+		with patch("shutil.which", return_value=None):
+			zip_path = PythonZipBuilder(python_version="2.0").build(
+				python_project, tmp_path / "build", tmp_path / "out", AWSLambdaArchitecture.x86_64
+			)
+
+		assert not any(name.endswith(".pyc") for name in self._zip_names(zip_path))
+
+	def test_should_skip_bytecode_when_target_version_is_unknown(self, python_project, tmp_path):
+		zip_path = PythonZipBuilder().build(
+			python_project, tmp_path / "build", tmp_path / "out", AWSLambdaArchitecture.x86_64
+		)
+
+		assert not any(name.endswith(".pyc") for name in self._zip_names(zip_path))
+
+	def test_should_ship_files_that_fail_to_compile_as_source(
+		self, python_project, tmp_path, caplog
+	):
+		(python_project / "legacy.py").write_text('print "x"\n')
+
+		with caplog.at_level("WARNING"):
+			zip_path = PythonZipBuilder(python_version=self.LOCAL_VERSION).build(
+				python_project, tmp_path / "build", tmp_path / "out", AWSLambdaArchitecture.x86_64
+			)
+
+		names = self._zip_names(zip_path)
+		tag = sys.implementation.cache_tag
+		assert "legacy.py" in names
+		assert f"__pycache__/handler.{tag}.pyc" in names
+		assert "failed to compile: legacy.py" in caplog.text
+
+	def test_should_run_build_commands_with_builder_environment(self, python_project, tmp_path):
+		(python_project / "requirements.txt").write_text("requests\n")
+		builder = PythonZipBuilder(python_version=self.LOCAL_VERSION)
+		builder.environ = {"PATH": os.environ["PATH"], "PIP_INDEX_URL": "https://stage"}
+
+		with patch(f"{PYTHON_MODULE}.run_command", return_value=0) as mock_run_command:
+			builder.build(
+				python_project, tmp_path / "build", tmp_path / "out", AWSLambdaArchitecture.x86_64
+			)
+
+		commands = [c.args[0] for c in mock_run_command.call_args_list]
+		assert commands[0].startswith("pip install") and "compileall" in commands[1]
+		for call in mock_run_command.call_args_list:
+			assert call.kwargs["env_vars"] == builder.environ
+
+	def test_should_derive_python_version_from_runtime(self):
+		params = MagicMock(runtime="python3.12", exclude_patterns=["data/"])
+
+		builder = PythonZipBuilder.from_lambda_params(params)
+
+		assert builder.python_version == "3.12"
+		assert builder.exclude_patterns == ["data/"]
+
+	def test_should_apply_lambdaignore_and_parameter_excludes(self, python_project, tmp_path):
+		(python_project / ".lambdaignore").write_text(
+			"# local data\n*.csv\n!keep.csv\n/build.log\n"
+		)
+		for name in (".venv/lib/site.py", "data/a.csv", "keep.csv", "build.log", "pkg/build.log"):
+			(python_project / name).parent.mkdir(parents=True, exist_ok=True)
+			(python_project / name).write_text("x")
+		policy = PythonPackagePolicy(compile_bytecode=False)
+
+		zip_path = PythonZipBuilder(policy=policy, exclude_patterns=["pkg/"]).build(
+			python_project, tmp_path / "build", tmp_path / "out", AWSLambdaArchitecture.x86_64
+		)
+
+		names = self._zip_names(zip_path)
+		assert "keep.csv" in names
+		assert "handler.py" in names
+		for excluded in (".venv/lib/site.py", "data/a.csv", "build.log", "pkg/build.log"):
+			assert excluded not in names
+		assert not (tmp_path / "build" / ".venv").exists()
+
+
+class TestLambdaIgnoreRules:
+	@pytest.mark.parametrize(
+		"patterns, path, is_dir, expected",
+		[
+			(["*.log"], "a/b/app.log", False, True),
+			(["/app.log"], "a/app.log", False, False),
+			(["a/*.log"], "a/app.log", False, True),
+			(["logs/"], "logs", False, False),
+			(["logs/"], "src/logs/x.txt", False, True),
+			(["**/fixtures/**"], "tests/fixtures/data.json", False, True),
+			(["*.log", "!keep.log"], "keep.log", False, False),
+			(["data/", "!data/keep.txt"], "data/keep.txt", False, True),
+			(["file[0-9].txt"], "file7.txt", False, True),
+			(["# comment", ""], "# comment", False, False),
+		],
+	)
+	def test_should_match_gitignore_semantics(self, patterns, path, is_dir, expected):
+		assert LambdaIgnoreRules(patterns).is_excluded(path, is_dir=is_dir) is expected
+
+
+class TestFileStager:
+	@pytest.fixture
+	def source_files(self, tmp_path: Path) -> list:
+		files = []
+		for name in ("a.py", "b.py"):
+			path = tmp_path / "src" / name
+			path.parent.mkdir(exist_ok=True)
+			path.write_text(name)
+			files.append(path)
+		(tmp_path / "dst").mkdir()
+		return files
+
+	def test_should_hardlink_when_reflinks_are_disabled(self, source_files, tmp_path):
+		stager = FileStager(allow_reflinks=False)
+
+		method = stager.stage(source_files[0], tmp_path / "dst" / "a.py")
+
+		assert method == "hardlink"
+		assert os.stat(source_files[0]).st_ino == os.stat(tmp_path / "dst" / "a.py").st_ino
+
+	def test_should_fall_back_to_copy_and_stop_retrying_unsupported_links(
+		self, source_files, tmp_path
+	):
+		stager = FileStager(allow_reflinks=False)
+
+		with patch("os.link", side_effect=OSError(errno.EXDEV, "cross-device")) as mock_link:
+			for source in source_files:
+				stager.stage(source, tmp_path / "dst" / source.name)
+
+		mock_link.assert_called_once()
+		assert stager.counts == {"copy": 2}
+		assert (tmp_path / "dst" / "b.py").read_text() == "b.py"
+		assert os.stat(source_files[1]).st_ino != os.stat(tmp_path / "dst" / "b.py").st_ino
+
+	def test_should_raise_real_io_errors(self, source_files, tmp_path):
+		stager = FileStager(allow_reflinks=False)
+
+		with patch("os.link", side_effect=OSError(errno.EIO, "io error")):
+			with pytest.raises(OSError):
+				stager.stage(source_files[0], tmp_path / "dst" / "a.py")
+
+	def test_should_replace_existing_target_without_touching_source(self, source_files, tmp_path):
+		target = tmp_path / "dst" / "a.py"
+		FileStager(allow_reflinks=False).stage(source_files[0], target)
+
+		FileStager(allow_reflinks=False).stage(source_files[1], target)
+
+		assert target.read_text() == "b.py"
+		assert source_files[0].read_text() == "a.py"
@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 from unittest.mock import MagicMock, patch
 from dataclasses import dataclass
@@ -76,6 +77,21 @@ class TestQueuesUtil:
 		)
 		assert mock_sqs.create_queue.call_count == 2
 
+	def test_should_create_queues_concurrently_with_async_variant(
+		self, queues_util: QueuesUtil, mock_client_factory
+	):
+		factory, mock_sqs, _ = mock_client_factory
+		factory.client.side_effect = factory.resource.side_effect
+		queue_configs = [AWSQueueConfig(name=f"q{i}.fifo", visibility_timeout=30) for i in range(5)]
+
+		asyncio.run(queues_util.create_queues_async(queue_configs))
+
+		factory.client.assert_called_with(AwsService.SQS)
+		assert sorted(c.kwargs["QueueName"] for c in mock_sqs.create_queue.call_args_list) == [
+			f"q{i}.fifo" for i in range(5)
+		]
+		queues_util._async_client_factory.close()
+
 	def test_should_attach_lambda_with_defaults_and_no_batch_window(
 		self, queues_util: QueuesUtil, mock_client_factory, mock_sts_util_class: MagicMock
 	):
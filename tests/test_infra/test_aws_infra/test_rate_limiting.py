@@ -0,0 +1,123 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from infra_lib.infra.aws_infra.rate_limiting import (
+	AwsCallTelemetry,
+	ClientInstrumentation,
+	RateLimit,
+	TokenBucket,
+)
+
+
+class FakeClock:
+	def __init__(self):
+		self.now = 0.0
+
+	def __call__(self) -> float:
+		return self.now
+
+	def sleep(self, secs: float):
+		self.now += secs
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+	return FakeClock()
+
+
+def _request(attempt: int):
+	return SimpleNamespace(context={"retries": {"attempt": attempt}})
+
+
+class TestTokenBucket:
+	def test_should_allow_burst_without_waiting(self, clock):
+		bucket = TokenBucket(RateLimit(rate_per_sec=2, burst=3), clock=clock, sleep=clock.sleep)
+
+		assert [bucket.acquire() for _ in range(3)] == [0, 0, 0]
+
+	def test_should_pace_requests_at_sustained_rate_once_burst_is_spent(self, clock):
+		bucket = TokenBucket(RateLimit(rate_per_sec=2, burst=1), clock=clock, sleep=clock.sleep)
+
+		waits = [bucket.acquire() for _ in range(3)]
+
+		assert waits == [0, 0.5, 0.5]
+		assert clock.now == 1.0
+
+	def test_should_refill_while_idle_up_to_burst(self, clock):
+		bucket = TokenBucket(RateLimit(rate_per_sec=1, burst=2), clock=clock, sleep=clock.sleep)
+		bucket.acquire()
+		bucket.acquire()
+
+		clock.now += 10
+
+		assert [bucket.acquire() for _ in range(3)] == [0, 0, 1.0]
+
+	def test_should_reject_invalid_limits(self):
+		with pytest.raises(ValueError, match="rate_per_sec"):
+			RateLimit(rate_per_sec=0)
+		with pytest.raises(ValueError, match="burst"):
+			RateLimit(rate_per_sec=1, burst=0)
+
+
+class TestClientInstrumentation:
+	def test_should_register_handlers_on_client_events(self):
+		client = MagicMock()
+		instrumentation = ClientInstrumentation("lambda", None, AwsCallTelemetry())
+
+		instrumentation.register(client)
+
+		registered = {c.args[0] for c in client.meta.events.register.call_args_list}
+		assert registered == {"request-created", "before-send", "needs-retry"}
+
+	def test_should_count_throttles_and_measure_retry_sleep(self, clock):
+		telemetry = AwsCallTelemetry()
+		instrumentation = ClientInstrumentation("sqs", None, telemetry, clock=clock)
+		throttled = (MagicMock(), {"Error": {"Code": "ThrottlingException"}})
+
+		instrumentation.on_request_created(_request(1))
+		instrumentation.on_needs_retry(response=throttled)
+		clock.now += 0.4
+		instrumentation.on_request_created(_request(2))
+		instrumentation.on_needs_retry(response=(MagicMock(), {}))
+
+		stats = telemetry.snapshot()["sqs"]
+		assert stats.throttled == 1
+		assert stats.retries == 1
+		assert stats.retry_sleep_secs == pytest.approx(0.4)
+
+	def test_should_not_count_first_attempt_of_next_call_as_retry(self, clock):
+		telemetry = AwsCallTelemetry()
+		instrumentation = ClientInstrumentation("sqs", None, telemetry, clock=clock)
+
+		instrumentation.on_needs_retry(response=(MagicMock(), {}))
+		clock.now += 5
+		instrumentation.on_request_created(_request(1))
+
+		assert telemetry.snapshot() == {}
+
+	def test_should_record_rate_limit_waits_before_send(self, clock):
+		telemetry = AwsCallTelemetry()
+		bucket = TokenBucket(RateLimit(rate_per_sec=4), clock=clock, sleep=clock.sleep)
+		instrumentation = ClientInstrumentation("lambda", bucket, telemetry, clock=clock)
+
+		for _ in range(3):
+			assert instrumentation.on_before_send(request=MagicMock()) is None
+
+		assert telemetry.snapshot()["lambda"].rate_limited_secs == pytest.approx(0.5)
+
+
+class TestAwsCallTelemetry:
+	def test_should_report_only_activity_since_baseline(self):
+		telemetry = AwsCallTelemetry()
+		telemetry.record_throttle("s3")
+		telemetry.record_throttle("sqs")
+		baseline = telemetry.snapshot()
+
+		telemetry.record_throttle("s3")
+		telemetry.record_retry("s3", 0.25)
+
+		since = telemetry.since(baseline)
+		assert list(since) == ["s3"]
+		assert (since["s3"].throttled, since["s3"].retries) == (1, 1)
+		assert since["s3"].retry_sleep_secs == 0.25
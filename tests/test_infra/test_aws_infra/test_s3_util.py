@@ -0,0 +1,172 @@
+import io
+import pytest
+from unittest.mock import MagicMock
+from botocore.exceptions import ClientError
+
+from infra_lib.exceptions import InfraError
+from infra_lib.infra.aws_infra import BotoClientFactory, S3Util
+from infra_lib.infra.aws_infra.s3_util import MIN_MULTIPART_CHUNK_SIZE, _ChunkReader
+from ...fixtures import fake_creds
+
+
+@pytest.fixture
+def mock_s3_client() -> MagicMock:
+	return MagicMock()
+
+
+@pytest.fixture
+def s3_util(fake_creds, mock_s3_client) -> S3Util:
+	factory = MagicMock(spec=BotoClientFactory)
+	mock_resource = MagicMock()
+	mock_resource.meta.client = mock_s3_client
+	factory.resource.return_value = mock_resource
+	return S3Util(creds=fake_creds, client_factory=factory)
+
+
+class TestChunkReader:
+	def test_should_read_full_sizes_across_chunk_boundaries(self):
+		reader = _ChunkReader([b"abc", bytearray(b"de"), memoryview(b"fghij")])
+
+		assert reader.read(4) == b"abcd"
+		assert reader.read(4) == b"efgh"
+		assert reader.read(4) == b"ij"
+		assert reader.read(4) == b""
+
+	def test_should_read_everything_when_size_is_negative(self):
+		reader = _ChunkReader(iter([b"ab", b"", b"cd"]))
+
+		assert reader.read() == b"abcd"
+
+
+class TestS3UtilStreaming:
+	def test_should_upload_generator_as_non_seekable_stream(self, s3_util, mock_s3_client):
+		chunks = (bytes([i]) * 10 for i in range(3))
+
+		s3_util.upload_stream("bucket", "key", chunks)
+
+		kwargs = mock_s3_client.upload_fileobj.call_args.kwargs
+		assert kwargs["Bucket"] == "bucket"
+		assert kwargs["Key"] == "key"
+		assert kwargs["Fileobj"].read() == b"\x00" * 10 + b"\x01" * 10 + b"\x02" * 10
+		assert kwargs["Config"].max_in_memory_upload_chunks == 4
+
+	def test_should_pass_file_objects_through_unchanged(self, s3_util, mock_s3_client):
+		fileobj = io.BytesIO(b"payload")
+
+		s3_util.upload_stream("bucket", "key", fileobj)
+
+		assert mock_s3_client.upload_fileobj.call_args.kwargs["Fileobj"] is fileobj
+
+	def test_should_upload_memoryview_without_materializing_bytes(self, s3_util, mock_s3_client):
+		buffer = bytearray(b"zip-bytes")
+
+		s3_util.upload_bytes("bucket", "lambda.zip", memoryview(buffer))
+
+		fileobj = mock_s3_client.upload_fileobj.call_args.kwargs["Fileobj"]
+		assert isinstance(fileobj, _ChunkReader)
+		assert fileobj.read() == b"zip-bytes"
+
+	def test_should_reject_chunk_size_below_s3_minimum(self, s3_util):
+		with pytest.raises(ValueError, match="chunk_size"):
+			s3_util.upload_stream("bucket", "key", b"data", chunk_size=MIN_MULTIPART_CHUNK_SIZE - 1)
+
+	def test_should_download_stream_in_chunks_and_close_body(self, s3_util, mock_s3_client):
+		body = MagicMock()
+		body.iter_chunks.return_value = iter([b"ab", b"cd"])
+		mock_s3_client.get_object.return_value = {"Body": body}
+
+		chunks = list(s3_util.download_stream("bucket", "key", chunk_size=2))
+
+		assert chunks == [b"ab", b"cd"]
+		mock_s3_client.get_object.assert_called_once_with(Bucket="bucket", Key="key")
+		body.iter_chunks.assert_called_once_with(chunk_size=2)
+		body.close.assert_called_once()
+
+
+def _paginator_for(pages_by_operation: dict) -> MagicMock:
+	def get_paginator(operation_name):
+		paginator = MagicMock()
+		paginator.paginate.return_value = pages_by_operation[operation_name]
+		return paginator
+
+	return MagicMock(side_effect=get_paginator)
+
+
+class TestS3UtilTeardown:
+	def test_should_delete_objects_in_batches_of_1000(self, s3_util, mock_s3_client):
+		mock_s3_client.get_bucket_versioning.return_value = {}
+		mock_s3_client.get_paginator = _paginator_for(
+			{
+				"list_objects_v2": [
+					{"Contents": [{"Key": f"a/{i}"} for i in range(1000)]},
+					{"Contents": [{"Key": f"b/{i}"} for i in range(500)]},
+				]
+			}
+		)
+		mock_s3_client.delete_objects.return_value = {}
+		progress = []
+
+		deleted = s3_util.empty_bucket("bucket", max_workers=2, on_progress=progress.append)
+
+		assert deleted == 1500
+		batch_sizes = sorted(
+			len(c.kwargs["Delete"]["Objects"]) for c in mock_s3_client.delete_objects.call_args_list
+		)
+		assert batch_sizes == [500, 1000]
+		assert progress[-1] == 1500
+
+	def test_should_delete_versions_and_delete_markers_when_versioned(
+		self, s3_util, mock_s3_client
+	):
+		mock_s3_client.get_bucket_versioning.return_value = {"Status": "Enabled"}
+		mock_s3_client.get_paginator = _paginator_for(
+			{
+				"list_object_versions": [
+					{
+						"Versions": [{"Key": "k", "VersionId": "v1"}],
+						"DeleteMarkers": [{"Key": "k", "VersionId": "v2"}],
+					}
+				]
+			}
+		)
+		mock_s3_client.delete_objects.return_value = {}
+
+		s3_util.empty_bucket("bucket")
+
+		mock_s3_client.delete_objects.assert_called_once_with(
+			Bucket="bucket",
+			Delete={
+				"Objects": [{"Key": "k", "VersionId": "v1"}, {"Key": "k", "VersionId": "v2"}],
+				"Quiet": True,
+			},
+		)
+
+	def test_should_raise_when_delete_objects_reports_errors(self, s3_util, mock_s3_client):
+		mock_s3_client.get_bucket_versioning.return_value = {}
+		mock_s3_client.get_paginator = _paginator_for(
+			{"list_objects_v2": [{"Contents": [{"Key": "locked"}]}]}
+		)
+		mock_s3_client.delete_objects.return_value = {
+			"Errors": [{"Key": "locked", "Code": "AccessDenied", "Message": "denied"}]
+		}
+
+		with pytest.raises(InfraError, match="Failed to delete 1 objects"):
+			s3_util.empty_bucket("bucket")
+
+	def test_should_empty_then_delete_bucket(self, s3_util, mock_s3_client):
+		mock_s3_client.get_bucket_versioning.return_value = {}
+		mock_s3_client.get_paginator = _paginator_for({"list_objects_v2": [{}]})
+
+		s3_util.delete_bucket("bucket")
+
+		mock_s3_client.delete_objects.assert_not_called()
+		mock_s3_client.delete_bucket.assert_called_once_with(Bucket="bucket")
+
+	def test_should_skip_delete_when_bucket_is_missing(self, s3_util, mock_s3_client):
+		mock_s3_client.head_bucket.side_effect = ClientError(
+			{"Error": {"Code": "404", "Message": "Not Found"}}, "HeadBucket"
+		)
+
+		s3_util.delete_bucket("missing")
+
+		mock_s3_client.delete_bucket.assert_not_called()
@@ -0,0 +1,107 @@
+import pytest
+from unittest.mock import MagicMock
+
+from infra_lib.exceptions import InfraError
+from infra_lib.infra.aws_infra.secrets_cache import SecretsCache
+
+
+class FakeClock:
+	def __init__(self):
+		self.now = 0.0
+
+	def __call__(self) -> float:
+		return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+	return FakeClock()
+
+
+@pytest.fixture
+def mock_client() -> MagicMock:
+	client = MagicMock()
+	client.get_secret_value.side_effect = lambda SecretId: {"SecretString": f"{SecretId}-value"}
+	client.batch_get_secret_value.side_effect = lambda SecretIdList: {
+		"SecretValues": [{"Name": name, "SecretString": f"{name}-value"} for name in SecretIdList]
+	}
+	return client
+
+
+@pytest.fixture
+def cache(mock_client, clock) -> SecretsCache:
+	return SecretsCache(client_provider=lambda: mock_client, ttl_secs=10, clock=clock)
+
+
+class TestSecretsCache:
+	def test_should_fetch_once_while_entry_is_fresh(self, cache, mock_client, clock):
+		assert cache.get("db") == "db-value"
+		clock.now = 9
+		assert cache.get("db") == "db-value"
+
+		mock_client.get_secret_value.assert_called_once_with(SecretId="db")
+
+	def test_should_refetch_after_ttl_expires(self, cache, mock_client, clock):
+		cache.get("db")
+		clock.now = 10
+		cache.get("db")
+
+		assert mock_client.get_secret_value.call_count == 2
+
+	def test_should_batch_fetch_only_cache_misses(self, cache, mock_client):
+		cache.get("a")
+
+		values = cache.get_many(["a", "b", "c"])
+
+		assert values == {"a": "a-value", "b": "b-value", "c": "c-value"}
+		mock_client.batch_get_secret_value.assert_called_once_with(SecretIdList=["b", "c"])
+
+	def test_should_split_batches_of_twenty(self, cache, mock_client):
+		cache.get_many([f"s{i}" for i in range(45)])
+
+		batch_sizes = [
+			len(c.kwargs["SecretIdList"]) for c in mock_client.batch_get_secret_value.call_args_list
+		]
+		assert batch_sizes == [20, 20, 5]
+
+	def test_should_evict_least_recently_used_entries(self, mock_client, clock):
+		cache = SecretsCache(client_provider=lambda: mock_client, max_entries=2, clock=clock)
+		cache.get("a")
+		cache.get("b")
+		cache.get("a")
+		cache.get("c")
+
+		cache.get("a")
+		cache.get("b")
+
+		assert [c.kwargs["SecretId"] for c in mock_client.get_secret_value.call_args_list] == [
+			"a",
+			"b",
+			"c",
+			"b",
+		]
+
+	def test_should_refetch_after_invalidation(self, cache, mock_client):
+		cache.get("db")
+		cache.invalidate("db")
+		cache.get("db")
+
+		assert mock_client.get_secret_value.call_count == 2
+
+	def test_should_refresh_all_cached_entries(self, cache, mock_client):
+		cache.get("a")
+		cache.get("b")
+
+		cache.refresh()
+
+		mock_client.batch_get_secret_value.assert_called_once_with(SecretIdList=["a", "b"])
+
+	def test_should_raise_when_batch_reports_errors(self, cache, mock_client):
+		mock_client.batch_get_secret_value.side_effect = None
+		mock_client.batch_get_secret_value.return_value = {
+			"SecretValues": [],
+			"Errors": [{"SecretId": "x", "ErrorCode": "ResourceNotFoundException"}],
+		}
+
+		with pytest.raises(InfraError, match="Failed to fetch 1 secrets"):
+			cache.get_many(["x"])
@@ -1,10 +1,13 @@
+import asyncio
 import pytest
 from pathlib import Path
 from typing import Tuple
 from unittest.mock import MagicMock, patch
 import json
 
+from infra_lib.exceptions import InfraError
 from infra_lib.infra.aws_infra import BotoClientFactory, SecretsManagerUtil
+from infra_lib.infra.aws_infra.secrets_util import SecretSyncAction
 from ...fixtures import fake_creds
 
 
@@ -88,6 +91,187 @@ class TestSecretsManagerUtil:
 		)
 
 
+@pytest.fixture
+def upsert_client() -> MagicMock:
+	client = MagicMock()
+	client.exceptions.ResourceExistsException = MockResourceExistsException
+	client.batch_get_secret_value.return_value = {"SecretValues": []}
+	return client
+
+
+@pytest.fixture
+def upsert_secrets_util(fake_creds, upsert_client, tmp_path: Path) -> SecretsManagerUtil:
+	factory = MagicMock(spec=BotoClientFactory)
+	factory.client.return_value = upsert_client
+	return SecretsManagerUtil(creds=fake_creds, client_factory=factory, aws_config_dir=tmp_path)
+
+
+def _existing_secrets(client: MagicMock, values: dict):
+	client.get_paginator.return_value.paginate.return_value = [
+		{"SecretList": [{"Name": name} for name in values]}
+	]
+	client.batch_get_secret_value.return_value = {
+		"SecretValues": [
+			{"Name": name, "SecretString": json.dumps(value)} for name, value in values.items()
+		]
+	}
+
+
+class TestSecretsManagerUtilUpsert:
+	def test_should_only_write_new_and_changed_secrets(
+		self, upsert_secrets_util: SecretsManagerUtil, upsert_client: MagicMock
+	):
+		_existing_secrets(upsert_client, {"same": "v1", "changed": "old"})
+
+		actions = upsert_secrets_util.upsert_secrets({"same": "v1", "changed": "new", "added": "v"})
+
+		assert actions == {
+			"same": SecretSyncAction.unchanged,
+			"changed": SecretSyncAction.updated,
+			"added": SecretSyncAction.created,
+		}
+		upsert_client.get_paginator.assert_called_once_with("list_secrets")
+		upsert_client.put_secret_value.assert_called_once_with(
+			SecretId="changed", SecretString=json.dumps("new")
+		)
+		upsert_client.create_secret.assert_called_once_with(
+			Name="added", SecretString=json.dumps("v")
+		)
+		upsert_client.batch_get_secret_value.assert_called_once_with(
+			SecretIdList=["same", "changed"]
+		)
+
+	def test_should_compare_against_fetched_values_without_tagging(
+		self, upsert_secrets_util: SecretsManagerUtil, upsert_client: MagicMock
+	):
+		_existing_secrets(upsert_client, {"db": {"k": "v"}, "unrelated": "x"})
+
+		actions = upsert_secrets_util.upsert_secrets({"db": {"k": "v"}})
+
+		assert actions == {"db": SecretSyncAction.unchanged}
+		upsert_client.batch_get_secret_value.assert_called_once_with(SecretIdList=["db"])
+		upsert_client.put_secret_value.assert_not_called()
+		upsert_client.tag_resource.assert_not_called()
+
+	def test_should_update_secret_without_string_value(
+		self, upsert_secrets_util: SecretsManagerUtil, upsert_client: MagicMock
+	):
+		upsert_client.get_paginator.return_value.paginate.return_value = [
+			{"SecretList": [{"Name": "binary"}]}
+		]
+		upsert_client.batch_get_secret_value.return_value = {
+			"SecretValues": [{"Name": "binary", "SecretBinary": b"v"}]
+		}
+
+		actions = upsert_secrets_util.upsert_secrets({"binary": "v"})
+
+		assert actions == {"binary": SecretSyncAction.updated}
+
+	def test_should_raise_when_current_value_cannot_be_read(
+		self, upsert_secrets_util: SecretsManagerUtil, upsert_client: MagicMock
+	):
+		_existing_secrets(upsert_client, {"db": "v"})
+		upsert_client.batch_get_secret_value.return_value = {
+			"SecretValues": [],
+			"Errors": [{"SecretId": "db", "ErrorCode": "AccessDeniedException", "Message": "no"}],
+		}
+
+		with pytest.raises(InfraError, match="db: AccessDeniedException"):
+			upsert_secrets_util.upsert_secrets({"db": "v"})
+
+		upsert_client.put_secret_value.assert_not_called()
+
+	def test_should_recreate_secret_deleted_since_listing(
+		self, upsert_secrets_util: SecretsManagerUtil, upsert_client: MagicMock
+	):
+		_existing_secrets(upsert_client, {"db": "v"})
+		upsert_client.batch_get_secret_value.return_value = {
+			"SecretValues": [],
+			"Errors": [{"SecretId": "db", "ErrorCode": "ResourceNotFoundException"}],
+		}
+
+		actions = upsert_secrets_util.upsert_secrets({"db": "v"})
+
+		assert actions == {"db": SecretSyncAction.created}
+		upsert_client.create_secret.assert_called_once_with(Name="db", SecretString=json.dumps("v"))
+
+	def test_should_upsert_secrets_with_async_variant(
+		self, upsert_secrets_util: SecretsManagerUtil, upsert_client: MagicMock
+	):
+		_existing_secrets(upsert_client, {"same": "v1", "changed": "old"})
+
+		actions = asyncio.run(
+			upsert_secrets_util.upsert_secrets_async({"same": "v1", "changed": "new", "added": "v"})
+		)
+
+		assert actions == {
+			"same": SecretSyncAction.unchanged,
+			"changed": SecretSyncAction.updated,
+			"added": SecretSyncAction.created,
+		}
+		upsert_client.put_secret_value.assert_called_once_with(
+			SecretId="changed", SecretString=json.dumps("new")
+		)
+
+	def test_should_update_when_secret_is_created_concurrently(
+		self, upsert_secrets_util: SecretsManagerUtil, upsert_client: MagicMock
+	):
+		_existing_secrets(upsert_client, {})
+		upsert_client.create_secret.side_effect = MockResourceExistsException
+
+		actions = upsert_secrets_util.upsert_secrets({"racy": "v"})
+
+		assert actions == {"racy": SecretSyncAction.updated}
+		upsert_client.put_secret_value.assert_called_once_with(
+			SecretId="racy", SecretString=json.dumps("v")
+		)
+
+	def test_should_upsert_from_secrets_file_when_enabled(
+		self, upsert_secrets_util: SecretsManagerUtil, upsert_client: MagicMock, tmp_path: Path
+	):
+		_existing_secrets(upsert_client, {})
+		(tmp_path / "secrets.json").write_text(json.dumps({"s": "v"}))
+
+		actions = upsert_secrets_util.create_secrets(upsert=True)
+
+		assert actions == {"s": SecretSyncAction.created}
+
+
+class TestSecretsManagerUtilRead:
+	def test_should_serve_repeated_reads_from_cache(
+		self, upsert_secrets_util: SecretsManagerUtil, upsert_client: MagicMock
+	):
+		upsert_client.get_secret_value.return_value = {"SecretString": json.dumps({"k": "v"})}
+
+		first = upsert_secrets_util.get_secret("db", as_json=True)
+		second = upsert_secrets_util.get_secret("db", as_json=True)
+
+		assert first == second == {"k": "v"}
+		upsert_client.get_secret_value.assert_called_once_with(SecretId="db")
+
+	def test_should_bypass_cache_when_requested(
+		self, upsert_secrets_util: SecretsManagerUtil, upsert_client: MagicMock
+	):
+		upsert_client.get_secret_value.return_value = {"SecretString": "v"}
+
+		upsert_secrets_util.get_secret("db")
+		upsert_secrets_util.get_secret("db", use_cache=False)
+
+		assert upsert_client.get_secret_value.call_count == 2
+
+	def test_should_invalidate_cached_value_after_upsert_update(
+		self, upsert_secrets_util: SecretsManagerUtil, upsert_client: MagicMock
+	):
+		upsert_client.get_secret_value.return_value = {"SecretString": json.dumps("old")}
+		upsert_secrets_util.get_secret("db")
+		_existing_secrets(upsert_client, {"db": "old"})
+
+		upsert_secrets_util.upsert_secrets({"db": "new"})
+		upsert_secrets_util.get_secret("db")
+
+		assert upsert_client.get_secret_value.call_count == 2
+
+
 class MockBotoException(Exception):
 	pass
 
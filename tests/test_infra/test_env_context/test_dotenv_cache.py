@@ -0,0 +1,88 @@
+import os
+import pytest
+from unittest.mock import patch
+
+from infra_lib.infra.env_context import dotenv_cache
+from infra_lib.infra.env_context.dotenv_cache import (
+	clear_dotenv_cache,
+	merge_dotenv_files,
+	read_dotenv,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+	clear_dotenv_cache()
+	yield
+	clear_dotenv_cache()
+
+
+@pytest.fixture
+def parse_spy():
+	with patch.object(dotenv_cache, "dotenv_values", wraps=dotenv_cache.dotenv_values) as spy:
+		yield spy
+
+
+class TestReadDotenv:
+	def test_should_parse_unchanged_file_once(self, tmp_path, parse_spy):
+		env_file = tmp_path / ".env"
+		env_file.write_text("A=1\nB\n")
+
+		first = read_dotenv(env_file)
+		second = read_dotenv(str(env_file))
+
+		assert dict(first) == {"A": "1", "B": None}
+		assert first is second
+		assert parse_spy.call_count == 1
+
+	def test_should_reparse_when_file_changes(self, tmp_path, parse_spy):
+		env_file = tmp_path / ".env"
+		env_file.write_text("A=1\n")
+		read_dotenv(env_file)
+
+		env_file.write_text("A=2\n")
+		stat = env_file.stat()
+		os.utime(env_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+		assert read_dotenv(env_file)["A"] == "2"
+		assert parse_spy.call_count == 2
+
+	def test_should_return_read_only_mapping(self, tmp_path):
+		env_file = tmp_path / ".env"
+		env_file.write_text("A=1\n")
+
+		with pytest.raises(TypeError):
+			read_dotenv(env_file)["A"] = "changed"
+
+	def test_should_not_cache_files_expanding_environment_variables(self, tmp_path):
+		env_file = tmp_path / ".env"
+		env_file.write_text("URL=http://${HOST}:4566\n")
+
+		with patch.dict("os.environ", {"HOST": "localstack"}):
+			assert read_dotenv(env_file)["URL"] == "http://localstack:4566"
+		with patch.dict("os.environ", {"HOST": "localhost"}):
+			assert read_dotenv(env_file)["URL"] == "http://localhost:4566"
+
+	def test_should_raise_for_missing_file(self, tmp_path):
+		with pytest.raises(FileNotFoundError):
+			read_dotenv(tmp_path / "missing.env")
+
+
+class TestMergeDotenvFiles:
+	def test_should_merge_in_order_skipping_missing_files_and_empty_keys(self, tmp_path):
+		base = tmp_path / ".env"
+		override = tmp_path / ".env.override"
+		base.write_text("SHARED=base\nBASE_ONLY=1\nNO_VALUE\n")
+		override.write_text("SHARED=override\n")
+
+		merged = merge_dotenv_files([base, tmp_path / "missing.env", override])
+
+		assert merged == {"SHARED": "override", "BASE_ONLY": "1"}
+
+	def test_should_return_mutable_copy(self, tmp_path):
+		env_file = tmp_path / ".env"
+		env_file.write_text("A=1\n")
+
+		merge_dotenv_files([env_file])["A"] = "changed"
+
+		assert read_dotenv(env_file)["A"] == "1"
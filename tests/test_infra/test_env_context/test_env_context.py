@@ -3,7 +3,14 @@ import pytest
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
-from infra_lib import EnvironmentContext, InfraEnvironment
+from infra_lib import (
+	AWSEnvironmentContext,
+	DeferredEnvValue,
+	EnvironmentContext,
+	InfraEnvironment,
+	SecretRef,
+)
+from infra_lib.exceptions import ConfigError
 from ...fixtures import target_env_var_fixture
 
 
@@ -294,6 +301,38 @@ class TestEnvironmentContextLoadWithExtraVars:
 		]
 
 
+class TestEnvironmentContextGeneratedEnvFile:
+	def test_should_only_rewrite_generated_env_file_when_content_changes(
+		self, context, environment_dir, mock_environ
+	):
+		context.load(extra_vars={"VAR1": "value1"})
+
+		assert context.update_generated_env_file() is True
+		env_file = environment_dir / ".infra.generated.env"
+		os.utime(env_file, ns=(0, 0))
+
+		assert context.update_generated_env_file() is False
+		assert env_file.stat().st_mtime_ns == 0
+
+		context.load(extra_vars={"VAR1": "changed"})
+		assert context.update_generated_env_file() is True
+		assert 'VAR1="changed"' in env_file.read_text().splitlines()
+
+	def test_should_replace_generated_env_file_without_leaving_temp_files(
+		self, context, environment_dir, mock_environ
+	):
+		env_file = environment_dir / ".infra.generated.env"
+		env_file.write_text("STALE=1\n")
+		env_file.chmod(0o640)
+		context.load()
+
+		context.update_generated_env_file()
+
+		assert "STALE" not in env_file.read_text()
+		assert env_file.stat().st_mode & 0o777 == 0o640
+		assert [path.name for path in environment_dir.iterdir()] == [".infra.generated.env"]
+
+
 class TestEnvironmentContextLoadPrecedence:
 	def test_should_respect_precedence_order_extra_over_dotenv_over_os(
 		self, context, dotenv_path, mock_environ
@@ -360,3 +399,187 @@ class TestEnvironmentContextMultipleLoads:
 		trackable_context.load()
 
 		assert trackable_context.pre_load_call_count == 3
+
+
+class IsolatedEnvironmentContext(ConcreteEnvironmentContext):
+	isolated = True
+
+
+class TestEnvironmentContextIsolated:
+	def test_should_not_mutate_os_environ_on_load(self, project_root, environment_dir):
+		with patch("os.environ", {"OS_VAR": "os_value"}):
+			context = IsolatedEnvironmentContext(
+				project_root, environment_dir, InfraEnvironment.local
+			)
+			context.load(extra_vars={"VAR1": "value1"})
+
+			assert os.environ == {"OS_VAR": "os_value"}
+			assert context.host_env_vars["VAR1"] == "value1"
+			assert context.host_env_vars["OS_VAR"] == "os_value"
+			assert context.environ is context.host_env_vars
+
+	def test_should_keep_concurrent_contexts_separate(self, project_root, tmp_path, mock_environ):
+		contexts = {}
+		for env in (InfraEnvironment.local, InfraEnvironment.stage):
+			env_dir = tmp_path / "infra" / "environments" / env.value
+			env_dir.mkdir(parents=True, exist_ok=True)
+			(env_dir / ".env").write_text(f"SHARED={env.value}\n")
+			contexts[env] = IsolatedEnvironmentContext(project_root, env_dir, env)
+			contexts[env].load()
+
+		assert contexts[InfraEnvironment.local].environ["SHARED"] == "local"
+		assert contexts[InfraEnvironment.stage].environ["SHARED"] == "stage"
+		assert "SHARED" not in os.environ
+
+	def test_should_expose_read_only_views_without_copying(self, project_root, environment_dir):
+		context = IsolatedEnvironmentContext(project_root, environment_dir, InfraEnvironment.local)
+		context.load(extra_vars={"VAR1": "value1"})
+
+		with pytest.raises(TypeError):
+			context.host_env_vars["VAR1"] = "changed"
+		with pytest.raises(TypeError):
+			context.container_env_vars["VAR1"] = "changed"
+		assert context.host_env_vars is context.host_env_vars
+
+	def test_should_read_os_environ_when_not_isolated(self, context, mock_environ):
+		context.load(extra_vars={"VAR1": "value1"})
+
+		assert context.environ is os.environ
+		assert os.environ["VAR1"] == "value1"
+
+
+class SecretBackedContext(ConcreteEnvironmentContext):
+	def __init__(self, *args, extra_env_vars=None, **kwargs):
+		super().__init__(*args, **kwargs)
+		self.extra_env_vars = extra_env_vars or {}
+		self.secret_requests = []
+
+	def get_extra_env_vars(self):
+		return self.extra_env_vars
+
+	def resolve_secrets(self, names):
+		self.secret_requests.append(names)
+		return {name: f"{name}-value" for name in names}
+
+
+@pytest.fixture
+def secret_context(project_root, environment_dir, mock_infra_env) -> SecretBackedContext:
+	return SecretBackedContext(
+		project_root,
+		environment_dir,
+		mock_infra_env,
+		extra_env_vars={
+			"DB_PASSWORD": SecretRef("db"),
+			"API_KEY": SecretRef("api"),
+			"DB_ALIAS": SecretRef("db"),
+			"PLAIN": "plain",
+		},
+	)
+
+
+class TestEnvironmentContextLazyValues:
+	def test_should_not_resolve_lazy_values_on_load(self, secret_context, mock_environ):
+		secret_context.load()
+
+		assert secret_context.secret_requests == []
+		assert secret_context.get("PLAIN") == "plain"
+		assert "DB_PASSWORD" not in os.environ
+
+	def test_should_resolve_on_first_get_and_memoize_across_loads(
+		self, secret_context, mock_environ
+	):
+		secret_context.load()
+
+		assert secret_context.get("DB_PASSWORD") == "db-value"
+		assert secret_context.get("DB_PASSWORD") == "db-value"
+		secret_context.load()
+		assert secret_context.get("DB_PASSWORD") == "db-value"
+
+		assert secret_context.secret_requests == [["db"]]
+		assert os.environ["DB_PASSWORD"] == "db-value"
+
+	def test_should_batch_resolve_when_materializing_env(self, secret_context, mock_environ):
+		secret_context.load()
+
+		env_vars = secret_context.container_env_vars
+
+		assert secret_context.secret_requests == [["db", "api"]]
+		assert env_vars["DB_PASSWORD"] == env_vars["DB_ALIAS"] == "db-value"
+		assert env_vars["API_KEY"] == "api-value"
+
+	def test_should_write_resolved_values_to_generated_env_file(self, secret_context, mock_environ):
+		secret_context.load()
+
+		env_file = secret_context.write_generated_env_file()
+
+		assert 'API_KEY="api-value"' in env_file.read_text().splitlines()
+
+	def test_should_let_load_extra_vars_override_lazy_values(self, secret_context, mock_environ):
+		secret_context.load(extra_vars={"API_KEY": "override"})
+
+		assert secret_context.container_env_vars["API_KEY"] == "override"
+		assert secret_context.secret_requests == [["db"]]
+
+	def test_should_extract_json_keys_and_run_deferred_values(
+		self, project_root, environment_dir, mock_infra_env, mock_environ
+	):
+		factory = MagicMock(return_value="computed")
+		context = SecretBackedContext(
+			project_root,
+			environment_dir,
+			mock_infra_env,
+			extra_env_vars={
+				"USER": SecretRef("creds", json_key="user"),
+				"LATE": DeferredEnvValue(factory),
+			},
+		)
+		context.resolve_secrets = lambda names: {"creds": '{"user": "admin"}'}
+		context.load()
+
+		factory.assert_not_called()
+		assert context.get("USER") == "admin"
+		assert context.get("LATE") == "computed"
+
+	def test_should_raise_when_context_cannot_resolve_secrets(self, context, mock_environ):
+		context.get_extra_env_vars = lambda: {"DB_PASSWORD": SecretRef("db")}
+		context.load()
+
+		with pytest.raises(ConfigError, match="cannot resolve secrets: db"):
+			context.get("DB_PASSWORD")
+
+
+class TestAWSEnvironmentContextSecrets:
+	def test_should_batch_fetch_secret_refs_from_secrets_manager(
+		self, project_root, environment_dir, mock_environ
+	):
+		class AwsContext(AWSEnvironmentContext):
+			isolated = True
+
+			def env(self):
+				return InfraEnvironment.local
+
+			def get_extra_env_vars(self):
+				return {"A": SecretRef("a"), "B": SecretRef("b")}
+
+		environment_dir.joinpath(".env").write_text(
+			"AWS_ACCESS_KEY_ID=key\nAWS_SECRET_ACCESS_KEY=secret\n"
+			"AWS_ENDPOINT_URL=http://localstack:4566\nAWS_DEFAULT_REGION=us-east-1\n"
+		)
+		context = AwsContext(project_root, environment_dir)
+		context.load()
+
+		with patch(
+			"infra_lib.infra.aws_infra.boto_client_factory.BotoClientFactory"
+		) as factory_cls:
+			client = factory_cls.return_value.client.return_value
+			client.batch_get_secret_value.return_value = {
+				"SecretValues": [
+					{"Name": "a", "SecretString": "1"},
+					{"Name": "b", "SecretString": "2"},
+				]
+			}
+			env_vars = context.container_env_vars
+
+		assert (env_vars["A"], env_vars["B"]) == ("1", "2")
+		assert factory_cls.call_args.args[0].url == "http://localhost:4566"
+		client.batch_get_secret_value.assert_called_once_with(SecretIdList=["a", "b"])
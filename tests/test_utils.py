@@ -1,9 +1,13 @@
+from collections import ChainMap
+import os
 import subprocess
+from types import MappingProxyType
 from pathlib import Path
 import pytest
 from unittest.mock import patch, MagicMock
 from infra_lib.utils import run_command
 from infra_lib.utils.docker_compose import DockerCompose, ComposeSettings
+from infra_lib.utils.polling import poll_until
 from infra_lib import InfraEnvironment, EnvironmentContext
 
 
@@ -54,6 +58,12 @@ def test_run_command_no_output():
 		)
 
 
+def test_run_command_accepts_read_only_layered_env():
+	env_vars = MappingProxyType(ChainMap({"LAYERED": "yes"}, {"PATH": os.environ["PATH"]}))
+
+	assert run_command('test "$LAYERED" = yes', show_output=False, env_vars=env_vars) == 0
+
+
 def test_docker_compose_down_runs_single_command(tmp_path: Path):
 	compose_file = tmp_path / "docker-compose.yml"
 	compose_file.write_text("services: {}\n")
@@ -119,4 +129,69 @@ def test_docker_compose_supports_multiple_compose_files(tmp_path: Path):
 			f"docker compose -p infra -f {compose_file} -f {override_file} --profile local --profile local-frigate up -d",
 			env_vars=env_context.host_env_vars,
 		)
-		env_context.write_generated_env_file.assert_called_once_with()
+		env_context.update_generated_env_file.assert_called_once_with()
+
+
+def test_docker_compose_up_skips_unchanged_environment_when_requested(tmp_path: Path):
+	compose_file = tmp_path / "docker-compose.yml"
+	compose_file.write_text("services: {}\n")
+	env_context = MagicMock(spec=EnvironmentContext)
+	env_context.update_generated_env_file.return_value = False
+	settings = ComposeSettings(
+		environment=InfraEnvironment.local, compose_file=compose_file, custom_profiles=[]
+	)
+	compose = DockerCompose(settings, env_context)
+
+	with patch("infra_lib.utils.docker_compose.run_command") as mock_run_command:
+		compose.up(skip_if_unchanged=True)
+		mock_run_command.assert_not_called()
+
+		compose.up()
+		mock_run_command.assert_called_once()
+
+
+def test_poll_until_returns_first_accepted_result_without_sleeping():
+	sleep = MagicMock()
+
+	result = poll_until(
+		probe=lambda: "done", is_done=lambda r: r == "done", timeout_secs=1, sleep=sleep
+	)
+
+	assert result == "done"
+	sleep.assert_not_called()
+
+
+def test_poll_until_backs_off_exponentially():
+	results = iter(["pending", "pending", "pending", "done"])
+	sleep = MagicMock()
+
+	poll_until(
+		probe=lambda: next(results),
+		is_done=lambda r: r == "done",
+		timeout_secs=60,
+		initial_delay=1,
+		max_delay=3,
+		sleep=sleep,
+	)
+
+	delays = [c.args[0] for c in sleep.call_args_list]
+	assert len(delays) == 3
+	assert 0.9 <= delays[0] <= 1.1
+	assert 1.8 <= delays[1] <= 2.2
+	assert 2.7 <= delays[2] <= 3.3
+
+
+def test_poll_until_raises_timeout_error():
+	now = [0.0]
+
+	def sleep(delay):
+		now[0] += delay
+
+	with pytest.raises(TimeoutError):
+		poll_until(
+			probe=lambda: "pending",
+			is_done=lambda r: False,
+			timeout_secs=5,
+			sleep=sleep,
+			clock=lambda: now[0],
+		)